@@ -30,8 +30,8 @@ setuptools.setup(
     namespace_packages=['google', 'google.datacatalog_connectors'],
     package_dir={'': 'src'},
     include_package_data=True,
-    install_requires=('pandas>=1.1.4,<1.2.0',
-                      'google-datacatalog-connectors-commons>=0.6.0'),
+    install_requires=('pandas>=1.1.4,<1.2.0', 'grpcio',
+                      'google-datacatalog-connectors-commons>=0.7.0'),
     setup_requires=('pytest-runner',),
 
     tests_require=(
@@ -0,0 +1,278 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import math
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+from google.datacatalog_connectors import commons
+from google.datacatalog_connectors.commons import cleanup
+from google.datacatalog_connectors.commons import ingest
+from google.datacatalog_connectors.commons import state
+from google.datacatalog_connectors.commons_test import fake_datacatalog
+from google.datacatalog_connectors.commons_test.benchmark import \
+    synthetic_metadata_generator
+
+
+class IngestionBenchmark:
+    """Runs the ingestion and cleanup flows on synthetic metadata, against
+    a FakeDataCatalogServer, and measures their performance.
+
+    Each phase reports the entries processed per second, the RPCs sent per
+    entry, the p50 and p99 latency of the RPCs as seen by the client, and
+    the peak RSS of the process during the phase, which includes the fake
+    server. The peak RSS can only be reset between phases on Linux, so it
+    is None elsewhere, and the peak RSS of the whole process is reported
+    once per run.
+    """
+
+    INGEST = 'ingest'
+    CLEANUP = 'cleanup'
+
+    # Metrics compared with a baseline, and whether higher values are
+    # better.
+    __REGRESSION_METRICS = (('entries_per_second', True),
+                            ('rpcs_per_entry', False), ('latency_p99_ms',
+                                                        False))
+
+    # Writing 5 resets the peak RSS (VmHWM) of the process, since Linux 4.0.
+    __CLEAR_REFS_PATH = '/proc/self/clear_refs'
+    __STATUS_PATH = '/proc/self/status'
+
+    def __init__(self,
+                 server_options=None,
+                 ingest_config=None,
+                 project_id='benchmark-project',
+                 location_id='us-central1',
+                 entry_group_id='benchmark'):
+        """
+        :param server_options: dict with FakeDataCatalogServer constructor
+            arguments, e.g. latency_seconds.
+        :param ingest_config: The ingest_metadata config, e.g. max_workers.
+        """
+        self.__server_options = server_options or {}
+        self.__ingest_config = ingest_config
+        self.__project_id = project_id
+        self.__location_id = location_id
+        self.__entry_group_id = entry_group_id
+
+    def run(self,
+            entries_count,
+            columns_count=10,
+            tags_per_entry=1.0,
+            obsolete_entries_ratio=0.1):
+        """Ingests synthetic Entries, then cleans up a ratio of them.
+
+        :param entries_count: Number of ingested Entries.
+        :param columns_count: Number of columns of each Entry.
+        :param tags_per_entry: Average number of Tags per Entry.
+        :param obsolete_entries_ratio: Ratio of the Entries deleted by the
+            cleanup phase.
+        :return: A dict with the run parameters and the metrics of each
+            phase.
+        """
+        generator = synthetic_metadata_generator.SyntheticMetadataGenerator(
+            self.__project_id, self.__location_id, self.__entry_group_id,
+            columns_count, tags_per_entry)
+        tag_templates = generator.create_tag_templates()
+        assembled_entries = generator.create_assembled_entries(entries_count)
+        kept_entries = assembled_entries[:entries_count -
+                                         int(entries_count *
+                                             obsolete_entries_ratio)]
+
+        # Each run starts from an empty catalog, so the resources known to
+        # exist on the previous runs are forgotten.
+        state.KnownResourcesRegistry.shared().clear()
+
+        with fake_datacatalog.FakeDataCatalogServer(
+                **self.__server_options) as server:
+            latencies = []
+            latencies_lock = threading.Lock()
+            client_provider = commons.DataCatalogClientProvider(
+                client_factory=lambda: _LatencyRecordingClient(
+                    server.create_client(), latencies, latencies_lock))
+
+            ingestor = ingest.DataCatalogMetadataIngestor(
+                self.__project_id,
+                self.__location_id,
+                self.__entry_group_id,
+                client_provider=client_provider)
+            ingest_metrics = self.__measure(server, latencies, entries_count,
+                                            ingestor.ingest_metadata,
+                                            assembled_entries, tag_templates,
+                                            self.__ingest_config)
+
+            cleaner = cleanup.DataCatalogMetadataCleaner(
+                self.__project_id,
+                self.__location_id,
+                self.__entry_group_id,
+                client_provider=client_provider)
+            cleanup_metrics = self.__measure(
+                server, latencies, entries_count,
+                cleaner.delete_obsolete_metadata, kept_entries,
+                'system={}'.format(generator.SYSTEM))
+
+        return {
+            'entries_count': entries_count,
+            'columns_count': columns_count,
+            'tags_per_entry': tags_per_entry,
+            'obsolete_entries_ratio': obsolete_entries_ratio,
+            self.INGEST: ingest_metrics,
+            self.CLEANUP: cleanup_metrics,
+            'peak_rss_mb': self.__get_process_peak_rss_mb(),
+        }
+
+    @classmethod
+    def find_regressions(cls, results, baseline_results, tolerance=0.1):
+        """Compares the results of runs with the same parameters.
+
+        :param results: A list of dicts returned by run.
+        :param baseline_results: A list of dicts returned by run, e.g.
+            stored by a previous release.
+        :param tolerance: Ratio by which a metric may get worse.
+        :return: A list of strings describing the regressions.
+        """
+        baseline_runs = {
+            cls.__get_run_key(baseline_result): baseline_result
+            for baseline_result in baseline_results
+        }
+
+        regressions = []
+        for result in results:
+            baseline_result = baseline_runs.get(cls.__get_run_key(result))
+            if not baseline_result:
+                continue
+
+            for phase in (cls.INGEST, cls.CLEANUP):
+                for metric, higher_is_better in cls.__REGRESSION_METRICS:
+                    value = result[phase][metric]
+                    baseline_value = baseline_result[phase][metric]
+                    if higher_is_better:
+                        regressed = value < baseline_value * (1 - tolerance)
+                    else:
+                        regressed = value > baseline_value * (1 + tolerance)
+
+                    if regressed:
+                        regressions.append(
+                            '{} {} entries {}: {} (baseline: {})'.format(
+                                phase, result['entries_count'], metric, value,
+                                baseline_value))
+        return regressions
+
+    @classmethod
+    def __get_run_key(cls, result):
+        return (result['entries_count'], result['columns_count'],
+                result['tags_per_entry'], result['obsolete_entries_ratio'])
+
+    @classmethod
+    def __measure(cls, server, latencies, entries_count, function, *args):
+        server.reset_request_counts()
+        del latencies[:]
+        peak_rss_reset = cls.__reset_peak_rss()
+
+        started_at = time.perf_counter()
+        function(*args)
+        duration_seconds = time.perf_counter() - started_at
+
+        rpc_counts = server.get_request_counts()
+        rpc_count = sum(rpc_counts.values())
+        sorted_latencies = sorted(latencies)
+
+        metrics = {
+            'duration_seconds': round(duration_seconds, 3),
+            'entries_per_second': round(entries_count / duration_seconds, 1),
+            'rpc_count': rpc_count,
+            'rpcs_per_entry': round(rpc_count / max(entries_count, 1), 3),
+            'rpc_counts': rpc_counts,
+            'latency_p50_ms': cls.__get_percentile_ms(sorted_latencies, 50),
+            'latency_p99_ms': cls.__get_percentile_ms(sorted_latencies, 99),
+            'peak_rss_mb': cls.__get_peak_rss_mb() if peak_rss_reset else None,
+        }
+        logging.info('Benchmark phase completed: %s', metrics)
+        return metrics
+
+    @classmethod
+    def __get_percentile_ms(cls, sorted_values, percentile):
+        if not sorted_values:
+            return None
+
+        # Nearest-rank percentile.
+        rank = math.ceil(percentile / 100 * len(sorted_values))
+        return round(sorted_values[max(rank, 1) - 1] * 1000, 3)
+
+    @classmethod
+    def __reset_peak_rss(cls):
+        try:
+            with open(cls.__CLEAR_REFS_PATH, 'w') as clear_refs_file:
+                clear_refs_file.write('5')
+            return True
+        except OSError:
+            return False
+
+    @classmethod
+    def __get_peak_rss_mb(cls):
+        with open(cls.__STATUS_PATH) as status_file:
+            for line in status_file:
+                # e.g. VmHWM:    123456 kB
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+
+    @classmethod
+    def __get_process_peak_rss_mb(cls):
+        if not resource:
+            return None
+
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Reported in bytes on macOS and in kilobytes elsewhere.
+        if sys.platform == 'darwin':
+            max_rss /= 1024
+        return round(max_rss / 1024, 1)
+
+
+class _LatencyRecordingClient:
+    """Wraps a Data Catalog client and records how long its calls take.
+
+    Every page of the list and search results is timed, as the facade
+    requests each page through the client.
+    """
+
+    def __init__(self, client, latencies, latencies_lock):
+        self.__client = client
+        self.__latencies = latencies
+        self.__latencies_lock = latencies_lock
+
+    def __getattr__(self, name):
+        attribute = getattr(self.__client, name)
+        if not callable(attribute):
+            return attribute
+
+        def timed_call(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                latency = time.perf_counter() - started_at
+                with self.__latencies_lock:
+                    self.__latencies.append(latency)
+
+        return timed_call
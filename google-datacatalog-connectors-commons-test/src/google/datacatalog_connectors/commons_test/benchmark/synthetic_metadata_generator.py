@@ -0,0 +1,133 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors.commons import prepare
+
+
+class SyntheticMetadataGenerator:
+    """Generates synthetic Entries, Tags and Tag Templates of configurable
+    size, to benchmark the ingestion and cleanup flows.
+    """
+
+    SYSTEM = 'benchmark'
+
+    __COLUMN_TYPES = ('STRING', 'INT64', 'TIMESTAMP', 'BOOL')
+    __STRING_TYPE = datacatalog.FieldType.PrimitiveType.STRING
+    __TAG_FIELD_ID = 'value'
+
+    def __init__(self,
+                 project_id,
+                 location_id,
+                 entry_group_id,
+                 columns_count=10,
+                 tags_per_entry=1.0):
+        """
+        :param columns_count: Number of columns of each Entry schema.
+        :param tags_per_entry: Average number of Tags per Entry, which are
+            spread evenly when it is not an integer, e.g. 0.5 tags half of
+            the Entries.
+        """
+        self.__project_id = project_id
+        self.__location_id = location_id
+        self.__entry_group_name = \
+            datacatalog.DataCatalogClient.entry_group_path(
+                project_id, location_id, entry_group_id)
+        self.__columns_count = columns_count
+        self.__tags_per_entry = tags_per_entry
+
+    def create_tag_templates(self):
+        """Creates one Tag Template per Tag of the most tagged Entries.
+
+        :return: A dict with the Tag Templates by id.
+        """
+        tag_templates = {}
+        for index in range(math.ceil(self.__tags_per_entry)):
+            tag_template = datacatalog.TagTemplate()
+            tag_template.display_name = 'Benchmark Template {}'.format(index)
+
+            field = datacatalog.TagTemplateField()
+            field.display_name = 'Value'
+            field.type.primitive_type = self.__STRING_TYPE
+            tag_template.fields[self.__TAG_FIELD_ID] = field
+
+            tag_templates[self.__get_tag_template_id(index)] = tag_template
+        return tag_templates
+
+    def create_assembled_entries(self, entries_count):
+        """Creates the assembled Entries, along with their Tags.
+
+        :param entries_count: Number of Entries.
+        :return: A list of AssembledEntryData objects.
+        """
+        return [
+            prepare.AssembledEntryData(self.__get_entry_id(index),
+                                       self.__create_entry(index),
+                                       self.__create_tags(index))
+            for index in range(entries_count)
+        ]
+
+    def __create_entry(self, index):
+        entry = datacatalog.Entry()
+        # The connectors set the full name, which is what the cleaner
+        # compares with the search results.
+        entry.name = '{}/entries/{}'.format(self.__entry_group_name,
+                                            self.__get_entry_id(index))
+        entry.user_specified_system = self.SYSTEM
+        entry.user_specified_type = 'table'
+        entry.display_name = 'Benchmark Table {}'.format(index)
+        entry.description = 'Synthetic table {}'.format(index)
+        entry.linked_resource = '//benchmark/tables/{}'.format(index)
+
+        for column_index in range(self.__columns_count):
+            entry.schema.columns.append(
+                datacatalog.ColumnSchema(
+                    column='column_{}'.format(column_index),
+                    type=self.__COLUMN_TYPES[column_index %
+                                             len(self.__COLUMN_TYPES)],
+                    description='Synthetic column {}'.format(column_index)))
+        return entry
+
+    def __create_tags(self, index):
+        # Entry n gets floor((n + 1) * density) - floor(n * density) Tags,
+        # which averages to the density over consecutive Entries.
+        tags_count = math.floor((index + 1) * self.__tags_per_entry) - \
+            math.floor(index * self.__tags_per_entry)
+
+        tags = []
+        for tag_index in range(tags_count):
+            tag = datacatalog.Tag()
+            tag.template = datacatalog.DataCatalogClient.tag_template_path(
+                self.__project_id, self.__location_id,
+                self.__get_tag_template_id(tag_index))
+
+            field = datacatalog.TagField()
+            field.string_value = 'Synthetic value {}'.format(index)
+            tag.fields[self.__TAG_FIELD_ID] = field
+
+            tags.append(tag)
+        return tags
+
+    @classmethod
+    def __get_entry_id(cls, index):
+        return 'benchmark_table_{}'.format(index)
+
+    @classmethod
+    def __get_tag_template_id(cls, index):
+        return 'benchmark_template_{}'.format(index)
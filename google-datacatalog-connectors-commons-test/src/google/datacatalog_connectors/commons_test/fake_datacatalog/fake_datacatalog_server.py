@@ -0,0 +1,311 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+from concurrent import futures
+import functools
+import random
+import threading
+import time
+
+import grpc
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors import commons
+from google.datacatalog_connectors.commons_test.fake_datacatalog import \
+    fake_datacatalog_servicer
+
+
+class FakeDataCatalogServer:
+    """An in-process gRPC server that stands in for Data Catalog, so the
+    commons library can be exercised and load tested without sending
+    requests to the API.
+
+    The requests are served by a FakeDataCatalogServicer. Latency, errors
+    and the per-minute request quotas can be configured to emulate the
+    behavior of the API under load.
+
+    Usage:
+        with FakeDataCatalogServer(latency_seconds=0.01) as server:
+            facade = commons.DataCatalogFacade(
+                'project-id', client_provider=server.create_client_provider())
+    """
+
+    # Served under the API version of the datacatalog.DataCatalogClient.
+    SERVICE_NAME = '{}.DataCatalog'.format(
+        datacatalog.GetEntryRequest.pb().DESCRIPTOR.file.package)
+
+    READ = 'read'
+    WRITE = 'write'
+    SEARCH = 'search'
+
+    # The gRPC methods served, with the servicer method, the request type
+    # and the quota they consume.
+    __METHODS = {
+        'CreateEntryGroup':
+            ('create_entry_group', datacatalog.CreateEntryGroupRequest, WRITE),
+        'GetEntryGroup':
+            ('get_entry_group', datacatalog.GetEntryGroupRequest, READ),
+        'DeleteEntryGroup':
+            ('delete_entry_group', datacatalog.DeleteEntryGroupRequest, WRITE),
+        'CreateEntry': ('create_entry', datacatalog.CreateEntryRequest, WRITE),
+        'GetEntry': ('get_entry', datacatalog.GetEntryRequest, READ),
+        'LookupEntry': ('lookup_entry', datacatalog.LookupEntryRequest, READ),
+        'UpdateEntry': ('update_entry', datacatalog.UpdateEntryRequest, WRITE),
+        'ListEntries': ('list_entries', datacatalog.ListEntriesRequest, READ),
+        'DeleteEntry': ('delete_entry', datacatalog.DeleteEntryRequest, WRITE),
+        'CreateTagTemplate': ('create_tag_template',
+                              datacatalog.CreateTagTemplateRequest, WRITE),
+        'GetTagTemplate':
+            ('get_tag_template', datacatalog.GetTagTemplateRequest, READ),
+        'DeleteTagTemplate': ('delete_tag_template',
+                              datacatalog.DeleteTagTemplateRequest, WRITE),
+        'CreateTag': ('create_tag', datacatalog.CreateTagRequest, WRITE),
+        'UpdateTag': ('update_tag', datacatalog.UpdateTagRequest, WRITE),
+        'DeleteTag': ('delete_tag', datacatalog.DeleteTagRequest, WRITE),
+        'ListTags': ('list_tags', datacatalog.ListTagsRequest, READ),
+        'SearchCatalog':
+            ('search_catalog', datacatalog.SearchCatalogRequest, SEARCH),
+    }
+
+    __QUOTA_WINDOW_SECONDS = 60
+
+    # Large pages of Entries with wide schemas exceed the default 4 MB.
+    __CHANNEL_OPTIONS = [('grpc.max_send_message_length', -1),
+                         ('grpc.max_receive_message_length', -1)]
+    # Channels to the same address would share a connection otherwise.
+    __CLIENT_CHANNEL_OPTIONS = __CHANNEL_OPTIONS + [
+        ('grpc.use_local_subchannel_pool', 1)
+    ]
+
+    def __init__(self,
+                 latency_seconds=0,
+                 method_latency_seconds=None,
+                 reads_per_minute=None,
+                 writes_per_minute=None,
+                 searches_per_minute=None,
+                 max_workers=32,
+                 seed=None,
+                 clock=None,
+                 sleep=None):
+        """
+        :param latency_seconds: Time spent serving each request.
+        :param method_latency_seconds: dict with the latency of specific
+            methods, by servicer method name, e.g. get_entry.
+        :param reads_per_minute: Read requests served per minute, the
+            other ones fail with RESOURCE_EXHAUSTED. Unlimited if not set.
+        :param writes_per_minute: Same as reads_per_minute, for writes.
+        :param searches_per_minute: Same as reads_per_minute, for searches.
+        :param max_workers: Number of requests served concurrently.
+        :param seed: Seed of the random error injection.
+        :param clock: Function returning the current time in seconds,
+            defaults to time.monotonic.
+        :param sleep: Function used to wait, defaults to time.sleep.
+        """
+        self.__servicer = fake_datacatalog_servicer.FakeDataCatalogServicer()
+        self.__latency_seconds = latency_seconds
+        self.__method_latency_seconds = method_latency_seconds or {}
+        self.__quotas = {
+            self.READ: reads_per_minute,
+            self.WRITE: writes_per_minute,
+            self.SEARCH: searches_per_minute,
+        }
+        self.__max_workers = max_workers
+        self.__random = random.Random(seed)
+        self.__clock = clock or time.monotonic
+        self.__sleep = sleep or time.sleep
+
+        self.__lock = threading.Lock()
+        self.__request_counts = collections.Counter()
+        self.__peers = set()
+        self.__injected_errors = collections.defaultdict(collections.deque)
+        self.__error_rates = {}
+        self.__quota_window_start = None
+        self.__quota_usage = collections.Counter()
+
+        self.__server = None
+        self.__address = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def address(self):
+        return self.__address
+
+    @property
+    def servicer(self):
+        return self.__servicer
+
+    def start(self):
+        """Starts serving on a free local port.
+
+        :return: The server address.
+        """
+        handlers = {
+            grpc_method:
+                grpc.unary_unary_rpc_method_handler(
+                    functools.partial(self.__handle, servicer_method, quota),
+                    request_deserializer=request_class.deserialize,
+                    response_serializer=self.__serialize)
+            for grpc_method, (servicer_method, request_class,
+                              quota) in self.__METHODS.items()
+        }
+
+        self.__server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=self.__max_workers),
+            options=self.__CHANNEL_OPTIONS)
+        self.__server.add_generic_rpc_handlers(
+            (grpc.method_handlers_generic_handler(self.SERVICE_NAME,
+                                                  handlers),))
+        port = self.__server.add_insecure_port('localhost:0')
+        self.__server.start()
+
+        self.__address = 'localhost:{}'.format(port)
+        return self.__address
+
+    def stop(self, grace=None):
+        """Stops serving.
+
+        :param grace: Time given to the requests in progress to complete.
+        """
+        if self.__server:
+            self.__server.stop(grace).wait()
+            self.__server = None
+
+    def create_client(self):
+        """Creates a Data Catalog client connected to the server.
+
+        :return: A DataCatalogClient object.
+        """
+        channel = grpc.insecure_channel(self.__address,
+                                        options=self.__CLIENT_CHANNEL_OPTIONS)
+        transport_class = datacatalog.DataCatalogClient.get_transport_class(
+            'grpc')
+        return datacatalog.DataCatalogClient(transport=transport_class(
+            channel=channel))
+
+    def create_client_provider(self, pool_size=1):
+        """Creates a client provider, so facades, ingestors and cleaners
+        send their requests to the server.
+
+        :param pool_size: Number of clients, and hence of connections.
+        :return: A commons.DataCatalogClientProvider object.
+        """
+        return commons.DataCatalogClientProvider(
+            pool_size, client_factory=self.create_client)
+
+    def inject_error(self, method_name, status_code, count=1):
+        """Fails the next requests of a method.
+
+        :param method_name: The servicer method name, e.g. create_entry.
+        :param status_code: A grpc.StatusCode, e.g. RESOURCE_EXHAUSTED,
+            PERMISSION_DENIED or ALREADY_EXISTS.
+        :param count: Number of requests to fail.
+        """
+        with self.__lock:
+            self.__injected_errors[method_name].extend([status_code] * count)
+
+    def set_error_rate(self, method_name, status_code, rate):
+        """Fails a ratio of the requests of a method, randomly.
+
+        :param method_name: The servicer method name, e.g. create_entry.
+        :param status_code: A grpc.StatusCode.
+        :param rate: Ratio of failed requests, between 0 and 1. Disables
+            the random errors of the method if set to 0.
+        """
+        with self.__lock:
+            if rate:
+                self.__error_rates[method_name] = (status_code, rate)
+            else:
+                self.__error_rates.pop(method_name, None)
+
+    def get_request_counts(self):
+        """Gets the number of requests received, including the failed ones.
+
+        :return: A dict with the count of requests by servicer method name.
+        """
+        with self.__lock:
+            return dict(self.__request_counts)
+
+    def get_peers_count(self):
+        """Gets the number of distinct connections the requests came from.
+
+        :return: The number of peers.
+        """
+        with self.__lock:
+            return len(self.__peers)
+
+    def reset_request_counts(self):
+        with self.__lock:
+            self.__request_counts.clear()
+            self.__peers.clear()
+
+    def __handle(self, method_name, quota, request, context):
+        with self.__lock:
+            self.__request_counts[method_name] += 1
+            self.__peers.add(context.peer())
+            status_code = self.__get_injected_error(method_name)
+            if not status_code and not self.__consume_quota(quota):
+                status_code = grpc.StatusCode.RESOURCE_EXHAUSTED
+
+        latency_seconds = self.__method_latency_seconds.get(
+            method_name, self.__latency_seconds)
+        if latency_seconds:
+            self.__sleep(latency_seconds)
+
+        if status_code:
+            context.abort(status_code,
+                          'Fake error injected into {}'.format(method_name))
+
+        try:
+            return getattr(self.__servicer, method_name)(request)
+        except fake_datacatalog_servicer.FakeDataCatalogError as e:
+            context.abort(e.status_code, str(e))
+
+    def __get_injected_error(self, method_name):
+        injected_errors = self.__injected_errors.get(method_name)
+        if injected_errors:
+            return injected_errors.popleft()
+
+        error_rate = self.__error_rates.get(method_name)
+        if error_rate and self.__random.random() < error_rate[1]:
+            return error_rate[0]
+
+    def __consume_quota(self, quota):
+        now = self.__clock()
+        if self.__quota_window_start is None or \
+                now - self.__quota_window_start >= self.__QUOTA_WINDOW_SECONDS:
+            self.__quota_window_start = now
+            self.__quota_usage.clear()
+
+        limit = self.__quotas[quota]
+        if limit is not None and self.__quota_usage[quota] >= limit:
+            return False
+
+        self.__quota_usage[quota] += 1
+        return True
+
+    @classmethod
+    def __serialize(cls, response):
+        # The delete methods return google.protobuf.Empty.
+        if response is None:
+            return b''
+        return type(response).serialize(response)
@@ -0,0 +1,325 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import itertools
+import re
+import threading
+
+import grpc
+from google.cloud import datacatalog
+
+
+class FakeDataCatalogError(Exception):
+    """Raised by FakeDataCatalogServicer to fail a request."""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FakeDataCatalogServicer:
+    """Keeps Entry Groups, Entries, Tag Templates and Tags in memory, and
+    implements the Data Catalog methods used by DataCatalogFacade on top of
+    them.
+
+    Like the API, missing resources are reported as PERMISSION_DENIED. The
+    search supports a subset of the Data Catalog search syntax: terms are
+    ANDed, the type= and system= qualifiers are matched exactly, and the
+    other terms are matched against the Entry names.
+    """
+
+    __SEARCH_TERM_PATTERN = re.compile(r'^(?:(?P<key>\w+)[=:])?(?P<value>.+)$')
+    __TAG_TEMPLATE_TYPE = 'tag_template'
+
+    def __init__(self):
+        self.__lock = threading.RLock()
+        self.__entry_groups = collections.OrderedDict()
+        # Entries indexed by name, grouped by Entry Group name.
+        self.__entries = collections.OrderedDict()
+        self.__tag_templates = collections.OrderedDict()
+        # Tags indexed by name, grouped by Entry name.
+        self.__tags = collections.OrderedDict()
+        self.__tag_ids = itertools.count(1)
+        # The listings and searches are computed once and their pages are
+        # sliced from the cached results, until the next write.
+        self.__listings_cache = {}
+
+    @property
+    def entries_count(self):
+        with self.__lock:
+            return sum(len(entries) for entries in self.__entries.values())
+
+    @property
+    def tags_count(self):
+        with self.__lock:
+            return sum(len(tags) for tags in self.__tags.values())
+
+    def create_entry_group(self, request):
+        name = '{}/entryGroups/{}'.format(request.parent,
+                                          request.entry_group_id)
+        with self.__lock:
+            if name in self.__entry_groups:
+                self.__raise_already_exists(name)
+
+            entry_group = datacatalog.EntryGroup(request.entry_group)
+            entry_group.name = name
+            self.__entry_groups[name] = entry_group
+            self.__entries[name] = collections.OrderedDict()
+            self.__record_write()
+            return entry_group
+
+    def get_entry_group(self, request):
+        with self.__lock:
+            return self.__get_resource(self.__entry_groups, request.name)
+
+    def delete_entry_group(self, request):
+        with self.__lock:
+            self.__get_resource(self.__entry_groups, request.name)
+            if self.__entries[request.name] and not request.force:
+                raise FakeDataCatalogError(
+                    grpc.StatusCode.FAILED_PRECONDITION,
+                    'Entry Group is not empty: {}'.format(request.name))
+
+            for entry_name in self.__entries.pop(request.name):
+                self.__tags.pop(entry_name, None)
+            del self.__entry_groups[request.name]
+            self.__record_write()
+
+    def create_entry(self, request):
+        name = '{}/entries/{}'.format(request.parent, request.entry_id)
+        with self.__lock:
+            entries = self.__get_resource(self.__entries, request.parent)
+            if name in entries:
+                self.__raise_already_exists(name)
+
+            entry = datacatalog.Entry(request.entry)
+            entry.name = name
+            entries[name] = entry
+            self.__record_write()
+            return entry
+
+    def get_entry(self, request):
+        with self.__lock:
+            return self.__get_resource(self.__get_entries(request.name),
+                                       request.name)
+
+    def lookup_entry(self, request):
+        with self.__lock:
+            for entries in self.__entries.values():
+                for entry in entries.values():
+                    if entry.linked_resource == request.linked_resource:
+                        return entry
+
+        raise FakeDataCatalogError(
+            grpc.StatusCode.PERMISSION_DENIED,
+            'Entry not found: {}'.format(request.linked_resource))
+
+    def update_entry(self, request):
+        name = request.entry.name
+        with self.__lock:
+            entry = self.__get_resource(self.__get_entries(name), name)
+
+            update_paths = list(request.update_mask.paths)
+            if not update_paths:
+                entry = datacatalog.Entry(request.entry)
+            for path in update_paths:
+                setattr(entry, path, getattr(request.entry, path))
+
+            self.__get_entries(name)[name] = entry
+            self.__record_write()
+            return entry
+
+    def list_entries(self, request):
+        with self.__lock:
+            entries = self.__get_resource(self.__entries, request.parent)
+            entries_page, next_page_token = self.__get_page(
+                ('list_entries', request.parent), entries.values, request)
+
+        return datacatalog.ListEntriesResponse(entries=entries_page,
+                                               next_page_token=next_page_token)
+
+    def delete_entry(self, request):
+        with self.__lock:
+            entries = self.__get_entries(request.name)
+            self.__get_resource(entries, request.name)
+            del entries[request.name]
+            self.__tags.pop(request.name, None)
+            self.__record_write()
+
+    def create_tag_template(self, request):
+        name = '{}/tagTemplates/{}'.format(request.parent,
+                                           request.tag_template_id)
+        with self.__lock:
+            if name in self.__tag_templates:
+                self.__raise_already_exists(name)
+
+            tag_template = datacatalog.TagTemplate(request.tag_template)
+            tag_template.name = name
+            self.__tag_templates[name] = tag_template
+            self.__record_write()
+            return tag_template
+
+    def get_tag_template(self, request):
+        with self.__lock:
+            return self.__get_resource(self.__tag_templates, request.name)
+
+    def delete_tag_template(self, request):
+        with self.__lock:
+            self.__get_resource(self.__tag_templates, request.name)
+            del self.__tag_templates[request.name]
+            self.__record_write()
+
+    def create_tag(self, request):
+        with self.__lock:
+            self.__get_resource(self.__get_entries(request.parent),
+                                request.parent)
+            tags = self.__tags.setdefault(request.parent,
+                                          collections.OrderedDict())
+            for tag in tags.values():
+                if tag.template == request.tag.template and \
+                        tag.column == request.tag.column:
+                    self.__raise_already_exists(tag.name)
+
+            tag = datacatalog.Tag(request.tag)
+            tag.name = '{}/tags/{}'.format(request.parent,
+                                           next(self.__tag_ids))
+            tags[tag.name] = tag
+            self.__record_write()
+            return tag
+
+    def update_tag(self, request):
+        name = request.tag.name
+        with self.__lock:
+            tags = self.__get_tags(name)
+            tag = self.__get_resource(tags, name)
+
+            update_paths = list(request.update_mask.paths)
+            if not update_paths:
+                tag = datacatalog.Tag(request.tag)
+            for path in update_paths:
+                setattr(tag, path, getattr(request.tag, path))
+
+            tags[name] = tag
+            self.__record_write()
+            return tag
+
+    def delete_tag(self, request):
+        with self.__lock:
+            tags = self.__get_tags(request.name)
+            self.__get_resource(tags, request.name)
+            del tags[request.name]
+            self.__record_write()
+
+    def list_tags(self, request):
+        with self.__lock:
+            self.__get_resource(self.__get_entries(request.parent),
+                                request.parent)
+            tags = self.__tags.get(request.parent, {})
+            tags_page, next_page_token = self.__get_page(
+                ('list_tags', request.parent), lambda: tags.values(), request)
+
+        return datacatalog.ListTagsResponse(tags=tags_page,
+                                            next_page_token=next_page_token)
+
+    def search_catalog(self, request):
+        project_ids = tuple(request.scope.include_project_ids)
+        with self.__lock:
+            results_page, next_page_token = self.__get_page(
+                ('search_catalog', project_ids, request.query),
+                lambda: self.__search(project_ids, request.query), request)
+
+        return datacatalog.SearchCatalogResponse(
+            results=results_page, next_page_token=next_page_token)
+
+    def __search(self, project_ids, query):
+        filters = []
+        for term in query.split():
+            match = self.__SEARCH_TERM_PATTERN.match(term)
+            filters.append((match.group('key'), match.group('value').lower()))
+
+        is_tag_template_search = ('type', self.__TAG_TEMPLATE_TYPE) in filters
+        if is_tag_template_search:
+            for tag_template in self.__tag_templates.values():
+                if self.__is_in_scope(tag_template.name, project_ids):
+                    yield datacatalog.SearchCatalogResult(
+                        search_result_type=datacatalog.SearchResultType.
+                        TAG_TEMPLATE,
+                        relative_resource_name=tag_template.name)
+            return
+
+        for entries in self.__entries.values():
+            for entry in entries.values():
+                if self.__is_in_scope(entry.name, project_ids) and \
+                        self.__entry_matches(entry, filters):
+                    yield datacatalog.SearchCatalogResult(
+                        search_result_type=datacatalog.SearchResultType.ENTRY,
+                        search_result_subtype='entry.{}'.format(
+                            entry.user_specified_type),
+                        relative_resource_name=entry.name,
+                        linked_resource=entry.linked_resource)
+
+    @classmethod
+    def __is_in_scope(cls, name, project_ids):
+        return not project_ids or name.split('/')[1] in project_ids
+
+    @classmethod
+    def __entry_matches(cls, entry, filters):
+        for key, value in filters:
+            if key == 'type':
+                matches = entry.user_specified_type.lower() == value
+            elif key == 'system':
+                matches = entry.user_specified_system.lower() == value
+            else:
+                matches = value in entry.name.lower()
+
+            if not matches:
+                return False
+        return True
+
+    def __get_page(self, listing_key, list_function, request):
+        listing = self.__listings_cache.get(listing_key)
+        if listing is None:
+            listing = list(list_function())
+            self.__listings_cache[listing_key] = listing
+
+        start = int(request.page_token) if request.page_token else 0
+        end = start + (request.page_size or len(listing) or 1)
+        next_page_token = str(end) if end < len(listing) else ''
+        return listing[start:end], next_page_token
+
+    def __get_entries(self, name):
+        return self.__entries.get(name.split('/entries/')[0], {})
+
+    def __get_tags(self, name):
+        return self.__tags.get(name.split('/tags/')[0], {})
+
+    @classmethod
+    def __get_resource(cls, resources, name):
+        resource = resources.get(name)
+        if resource is None:
+            raise FakeDataCatalogError(
+                grpc.StatusCode.PERMISSION_DENIED,
+                'Resource not found or permission denied: {}'.format(name))
+        return resource
+
+    @classmethod
+    def __raise_already_exists(cls, name):
+        raise FakeDataCatalogError(grpc.StatusCode.ALREADY_EXISTS,
+                                   'Resource already exists: {}'.format(name))
+
+    def __record_write(self):
+        self.__listings_cache.clear()
@@ -0,0 +1,119 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+
+import mock
+
+from google.datacatalog_connectors.commons_test import benchmark
+
+
+class IngestionBenchmarkTestCase(unittest.TestCase):
+
+    def test_run_should_measure_ingest_and_cleanup(self):
+        result = benchmark.IngestionBenchmark(ingest_config={
+            'max_workers': 2
+        }).run(10,
+               columns_count=2,
+               tags_per_entry=1,
+               obsolete_entries_ratio=0.2)
+
+        ingest_metrics = result[benchmark.IngestionBenchmark.INGEST]
+        cleanup_metrics = result[benchmark.IngestionBenchmark.CLEANUP]
+
+        self.assertEqual(10, result['entries_count'])
+        self.assertEqual(10, ingest_metrics['rpc_counts']['create_entry'])
+        self.assertEqual(10, ingest_metrics['rpc_counts']['create_tag'])
+        self.assertEqual(2, cleanup_metrics['rpc_counts']['delete_entry'])
+        self.assertGreater(ingest_metrics['entries_per_second'], 0)
+        self.assertGreater(ingest_metrics['rpcs_per_entry'], 3)
+        self.assertLessEqual(ingest_metrics['latency_p50_ms'],
+                             ingest_metrics['latency_p99_ms'])
+        self.assertGreater(result['peak_rss_mb'], 0)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'),
+                         'The peak RSS can only be reset on Linux')
+    def test_run_should_measure_peak_rss_of_each_phase(self):
+        result = benchmark.IngestionBenchmark().run(10)
+
+        ingest_metrics = result[benchmark.IngestionBenchmark.INGEST]
+        cleanup_metrics = result[benchmark.IngestionBenchmark.CLEANUP]
+
+        self.assertGreater(ingest_metrics['peak_rss_mb'], 0)
+        self.assertGreater(cleanup_metrics['peak_rss_mb'], 0)
+
+    @mock.patch(
+        'google.datacatalog_connectors.commons_test.benchmark.'
+        'ingestion_benchmark.IngestionBenchmark.'
+        '_IngestionBenchmark__CLEAR_REFS_PATH', '/nonexistent/clear_refs')
+    def test_run_without_peak_rss_reset_should_not_measure_phases(self):
+        result = benchmark.IngestionBenchmark().run(2)
+
+        self.assertIsNone(
+            result[benchmark.IngestionBenchmark.INGEST]['peak_rss_mb'])
+        self.assertIsNone(
+            result[benchmark.IngestionBenchmark.CLEANUP]['peak_rss_mb'])
+        self.assertGreater(result['peak_rss_mb'], 0)
+
+    def test_run_twice_should_start_from_empty_catalog(self):
+        ingestion_benchmark = benchmark.IngestionBenchmark()
+
+        ingestion_benchmark.run(2)
+        result = ingestion_benchmark.run(2)
+
+        self.assertEqual(
+            2, result[benchmark.IngestionBenchmark.INGEST]['rpc_counts']
+            ['create_entry'])
+
+    def test_find_regressions_should_compare_matching_runs(self):
+        baseline_results = [
+            self.__create_result(1000, 100, 3.0, 5.0),
+            self.__create_result(10000, 100, 3.0, 5.0)
+        ]
+        results = [
+            self.__create_result(1000, 95, 3.0, 5.0),
+            self.__create_result(10000, 50, 4.0, 5.0),
+            self.__create_result(100000, 1, 9.0, 99.0)
+        ]
+
+        regressions = benchmark.IngestionBenchmark.find_regressions(
+            results, baseline_results, tolerance=0.1)
+
+        self.assertEqual([
+            'ingest 10000 entries entries_per_second: 50 (baseline: 100)',
+            'ingest 10000 entries rpcs_per_entry: 4.0 (baseline: 3.0)'
+        ], regressions)
+
+    @classmethod
+    def __create_result(cls, entries_count, entries_per_second, rpcs_per_entry,
+                        latency_p99_ms):
+        return {
+            'entries_count': entries_count,
+            'columns_count': 10,
+            'tags_per_entry': 1.0,
+            'obsolete_entries_ratio': 0.1,
+            benchmark.IngestionBenchmark.INGEST: {
+                'entries_per_second': entries_per_second,
+                'rpcs_per_entry': rpcs_per_entry,
+                'latency_p99_ms': latency_p99_ms
+            },
+            benchmark.IngestionBenchmark.CLEANUP: {
+                'entries_per_second': 1000,
+                'rpcs_per_entry': 0.1,
+                'latency_p99_ms': 5.0
+            }
+        }
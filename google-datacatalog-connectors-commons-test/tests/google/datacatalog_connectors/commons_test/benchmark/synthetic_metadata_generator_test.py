@@ -0,0 +1,61 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from google.datacatalog_connectors.commons_test import benchmark
+
+
+class SyntheticMetadataGeneratorTestCase(unittest.TestCase):
+
+    def test_create_assembled_entries_should_set_columns_and_tags(self):
+        generator = benchmark.SyntheticMetadataGenerator('project-id',
+                                                         'location-id',
+                                                         'entry_group_id',
+                                                         columns_count=3,
+                                                         tags_per_entry=1.5)
+
+        assembled_entries = generator.create_assembled_entries(4)
+
+        self.assertEqual(4, len(assembled_entries))
+        self.assertEqual('benchmark_table_0', assembled_entries[0].entry_id)
+        self.assertEqual(
+            'projects/project-id/locations/location-id/'
+            'entryGroups/entry_group_id/entries/benchmark_table_0',
+            assembled_entries[0].entry.name)
+        self.assertEqual(3, len(assembled_entries[0].entry.schema.columns))
+        self.assertEqual([1, 2, 1, 2], [
+            len(assembled_entry.tags) for assembled_entry in assembled_entries
+        ])
+        self.assertEqual(
+            'projects/project-id/locations/location-id/'
+            'tagTemplates/benchmark_template_1',
+            assembled_entries[1].tags[1].template)
+
+    def test_create_tag_templates_should_cover_most_tagged_entries(self):
+        generator = benchmark.SyntheticMetadataGenerator('project-id',
+                                                         'location-id',
+                                                         'entry_group_id',
+                                                         tags_per_entry=0.5)
+
+        tag_templates = generator.create_tag_templates()
+
+        self.assertEqual(['benchmark_template_0'], list(tag_templates))
+        self.assertIn('value', tag_templates['benchmark_template_0'].fields)
+        self.assertEqual([0, 1], [
+            len(assembled_entry.tags)
+            for assembled_entry in generator.create_assembled_entries(2)
+        ])
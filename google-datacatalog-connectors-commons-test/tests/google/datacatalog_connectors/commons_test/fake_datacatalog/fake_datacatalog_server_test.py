@@ -0,0 +1,169 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import grpc
+import mock
+from google.api_core import exceptions
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors import commons
+from google.datacatalog_connectors.commons_test import fake_datacatalog
+
+
+class FakeDataCatalogServerTestCase(unittest.TestCase):
+    __ENTRY_GROUP_NAME = \
+        'projects/project-id/locations/location-id/entryGroups/entry_group_id'
+
+    def setUp(self):
+        self.__sleep = mock.MagicMock()
+        self.__clock = mock.MagicMock(return_value=0)
+        self.__server = fake_datacatalog.FakeDataCatalogServer(
+            latency_seconds=0.5,
+            method_latency_seconds={'get_entry': 1},
+            writes_per_minute=3,
+            seed=1,
+            clock=self.__clock,
+            sleep=self.__sleep)
+        self.__server.start()
+        self.addCleanup(self.__server.stop)
+
+        self.__facade = commons.DataCatalogFacade(
+            'project-id',
+            client_provider=self.__server.create_client_provider())
+        self.__facade.create_entry_group('location-id', 'entry_group_id')
+
+    def test_facade_requests_should_be_served(self):
+        self.__facade.upsert_entry(
+            self.__ENTRY_GROUP_NAME, 'entry_1',
+            datacatalog.Entry(user_specified_system='system',
+                              user_specified_type='table'))
+
+        self.assertTrue(self.__server.address.startswith('localhost:'))
+        self.assertEqual(1, self.__server.servicer.entries_count)
+        self.assertEqual(
+            ['{}/entries/entry_1'.format(self.__ENTRY_GROUP_NAME)],
+            self.__facade.search_catalog_relative_resource_name(
+                'system=system'))
+        self.assertEqual(
+            {
+                'create_entry_group': 1,
+                'get_entry': 1,
+                'create_entry': 1,
+                'search_catalog': 1
+            }, self.__server.get_request_counts())
+
+        self.__server.reset_request_counts()
+        self.assertEqual({}, self.__server.get_request_counts())
+
+    def test_pooled_clients_should_use_own_connections(self):
+        facade = commons.DataCatalogFacade(
+            'project-id',
+            client_provider=self.__server.create_client_provider(3))
+        self.__server.reset_request_counts()
+
+        for _ in range(3):
+            facade.search_catalog('system=system')
+
+        self.assertEqual(3, self.__server.get_peers_count())
+
+        self.__server.reset_request_counts()
+        self.assertEqual(0, self.__server.get_peers_count())
+
+    def test_requests_should_wait_for_latency(self):
+        self.assertRaises(exceptions.PermissionDenied, self.__facade.get_entry,
+                          '{}/entries/entry_1'.format(self.__ENTRY_GROUP_NAME))
+
+        self.assertEqual([mock.call(0.5), mock.call(1)],
+                         self.__sleep.call_args_list)
+
+    def test_inject_error_should_fail_next_requests(self):
+        self.__server.inject_error('create_entry',
+                                   grpc.StatusCode.PERMISSION_DENIED)
+
+        self.assertRaises(exceptions.PermissionDenied,
+                          self.__facade.create_entry, self.__ENTRY_GROUP_NAME,
+                          'entry_1', datacatalog.Entry())
+        self.__facade.create_entry(self.__ENTRY_GROUP_NAME, 'entry_1',
+                                   datacatalog.Entry())
+
+        self.assertEqual(1, self.__server.servicer.entries_count)
+
+    def test_retry_policy_should_be_the_only_retry_layer(self):
+        entry_name = '{}/entries/entry_1'.format(self.__ENTRY_GROUP_NAME)
+        self.__facade.create_entry(self.__ENTRY_GROUP_NAME, 'entry_1',
+                                   datacatalog.Entry())
+        self.__server.reset_request_counts()
+        self.__server.inject_error('get_entry', grpc.StatusCode.UNAVAILABLE, 4)
+
+        retry_policy = commons.utils.RetryPolicy(max_attempts=1)
+        self.__facade.set_retry_policy(retry_policy)
+        self.assertRaises(exceptions.ServiceUnavailable,
+                          self.__facade.get_entry, entry_name)
+        self.assertEqual({'get_entry': 1}, self.__server.get_request_counts())
+
+        retry_policy = commons.utils.RetryPolicy(max_attempts=4,
+                                                 sleep=mock.MagicMock())
+        self.__facade.set_retry_policy(retry_policy)
+        self.__facade.get_entry(entry_name)
+        self.assertEqual({'get_entry': 5}, self.__server.get_request_counts())
+        self.assertEqual(3, retry_policy.stats()['retry_count'])
+
+    def test_set_error_rate_should_fail_requests_randomly(self):
+        self.__server.set_error_rate('list_tags',
+                                     grpc.StatusCode.RESOURCE_EXHAUSTED, 0.5)
+
+        failed_requests_count = 0
+        for _ in range(20):
+            try:
+                self.__facade.list_tags(self.__ENTRY_GROUP_NAME)
+            except exceptions.ResourceExhausted:
+                failed_requests_count += 1
+            except exceptions.PermissionDenied:
+                pass
+
+        self.__server.set_error_rate('list_tags',
+                                     grpc.StatusCode.RESOURCE_EXHAUSTED, 0)
+        self.assertRaises(exceptions.PermissionDenied, self.__facade.list_tags,
+                          self.__ENTRY_GROUP_NAME)
+        self.assertTrue(0 < failed_requests_count < 20)
+
+    def test_quota_should_reject_requests_until_next_minute(self):
+        self.__facade.create_entry(self.__ENTRY_GROUP_NAME, 'entry_1',
+                                   datacatalog.Entry())
+        self.__facade.create_entry(self.__ENTRY_GROUP_NAME, 'entry_2',
+                                   datacatalog.Entry())
+
+        self.assertRaises(exceptions.ResourceExhausted,
+                          self.__facade.create_entry, self.__ENTRY_GROUP_NAME,
+                          'entry_3', datacatalog.Entry())
+
+        self.__clock.return_value = 60
+        self.__facade.create_entry(self.__ENTRY_GROUP_NAME, 'entry_3',
+                                   datacatalog.Entry())
+
+        self.assertEqual(3, self.__server.servicer.entries_count)
+
+    def test_context_manager_should_start_and_stop_server(self):
+        with fake_datacatalog.FakeDataCatalogServer() as server:
+            client = server.create_client()
+            entry_group = client.create_entry_group(
+                parent='projects/project-id/locations/location-id',
+                entry_group_id='entry_group_id',
+                entry_group=datacatalog.EntryGroup())
+
+        self.assertEqual(self.__ENTRY_GROUP_NAME, entry_group.name)
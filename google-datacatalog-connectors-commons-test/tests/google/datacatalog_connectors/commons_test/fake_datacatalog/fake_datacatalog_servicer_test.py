@@ -0,0 +1,271 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import grpc
+from google.cloud import datacatalog
+from google.protobuf import field_mask_pb2
+
+from google.datacatalog_connectors.commons_test import fake_datacatalog
+
+
+class FakeDataCatalogServicerTestCase(unittest.TestCase):
+    __LOCATION_NAME = 'projects/project-id/locations/location-id'
+    __ENTRY_GROUP_NAME = '{}/entryGroups/entry_group_id'.format(
+        __LOCATION_NAME)
+
+    def setUp(self):
+        self.__servicer = fake_datacatalog.FakeDataCatalogServicer()
+        self.__servicer.create_entry_group(
+            datacatalog.CreateEntryGroupRequest(
+                parent=self.__LOCATION_NAME, entry_group_id='entry_group_id'))
+
+    def test_create_entry_group_existing_should_raise_already_exists(self):
+        self.__assert_raises_status(
+            grpc.StatusCode.ALREADY_EXISTS, self.__servicer.create_entry_group,
+            datacatalog.CreateEntryGroupRequest(
+                parent=self.__LOCATION_NAME, entry_group_id='entry_group_id'))
+
+    def test_get_entry_group_should_return_it(self):
+        entry_group = self.__servicer.get_entry_group(
+            datacatalog.GetEntryGroupRequest(name=self.__ENTRY_GROUP_NAME))
+
+        self.assertEqual(self.__ENTRY_GROUP_NAME, entry_group.name)
+
+    def test_create_entry_should_set_name(self):
+        entry = self.__create_entry('entry_1')
+
+        self.assertEqual('{}/entries/entry_1'.format(self.__ENTRY_GROUP_NAME),
+                         entry.name)
+        self.assertEqual(1, self.__servicer.entries_count)
+
+    def test_create_entry_existing_should_raise_already_exists(self):
+        self.__create_entry('entry_1')
+
+        self.__assert_raises_status(grpc.StatusCode.ALREADY_EXISTS,
+                                    self.__create_entry, 'entry_1')
+
+    def test_create_entry_nonexistent_entry_group_should_raise(self):
+        self.__assert_raises_status(
+            grpc.StatusCode.PERMISSION_DENIED, self.__servicer.create_entry,
+            datacatalog.CreateEntryRequest(
+                parent='{}/entryGroups/other'.format(self.__LOCATION_NAME),
+                entry_id='entry_1'))
+
+    def test_get_entry_nonexistent_should_raise_permission_denied(self):
+        self.__assert_raises_status(
+            grpc.StatusCode.PERMISSION_DENIED, self.__servicer.get_entry,
+            datacatalog.GetEntryRequest(
+                name='{}/entries/entry_1'.format(self.__ENTRY_GROUP_NAME)))
+
+    def test_lookup_entry_should_find_linked_resource(self):
+        entry = self.__create_entry('entry_1')
+
+        self.assertEqual(
+            entry,
+            self.__servicer.lookup_entry(
+                datacatalog.LookupEntryRequest(
+                    linked_resource='//resource/entry_1')))
+        self.__assert_raises_status(
+            grpc.StatusCode.PERMISSION_DENIED, self.__servicer.lookup_entry,
+            datacatalog.LookupEntryRequest(linked_resource='//unknown'))
+
+    def test_update_entry_with_mask_should_update_masked_fields(self):
+        entry = self.__create_entry('entry_1')
+        entry_update = datacatalog.Entry(name=entry.name,
+                                         description='new description',
+                                         display_name='new display name')
+
+        updated_entry = self.__servicer.update_entry(
+            datacatalog.UpdateEntryRequest(
+                entry=entry_update,
+                update_mask=field_mask_pb2.FieldMask(paths=['description'])))
+
+        self.assertEqual('new description', updated_entry.description)
+        self.assertEqual('entry_1', updated_entry.display_name)
+
+    def test_update_entry_without_mask_should_replace_entry(self):
+        entry = self.__create_entry('entry_1')
+
+        updated_entry = self.__servicer.update_entry(
+            datacatalog.UpdateEntryRequest(entry=datacatalog.Entry(
+                name=entry.name, description='new description')))
+
+        self.assertEqual('new description', updated_entry.description)
+        self.assertEqual('', updated_entry.display_name)
+
+    def test_list_entries_should_page_results(self):
+        for entry_id in ('entry_1', 'entry_2', 'entry_3'):
+            self.__create_entry(entry_id)
+
+        first_page = self.__servicer.list_entries(
+            datacatalog.ListEntriesRequest(parent=self.__ENTRY_GROUP_NAME,
+                                           page_size=2))
+        last_page = self.__servicer.list_entries(
+            datacatalog.ListEntriesRequest(
+                parent=self.__ENTRY_GROUP_NAME,
+                page_size=2,
+                page_token=first_page.next_page_token))
+
+        self.assertEqual(2, len(first_page.entries))
+        self.assertEqual(['entry_3'],
+                         [entry.display_name for entry in last_page.entries])
+        self.assertEqual('', last_page.next_page_token)
+
+    def test_delete_entry_should_delete_its_tags(self):
+        entry = self.__create_entry('entry_1')
+        self.__create_tag(entry.name, 'template')
+
+        self.__servicer.delete_entry(
+            datacatalog.DeleteEntryRequest(name=entry.name))
+
+        self.assertEqual(0, self.__servicer.entries_count)
+        self.assertEqual(0, self.__servicer.tags_count)
+
+    def test_delete_entry_group_not_empty_should_raise(self):
+        self.__create_entry('entry_1')
+
+        self.__assert_raises_status(
+            grpc.StatusCode.FAILED_PRECONDITION,
+            self.__servicer.delete_entry_group,
+            datacatalog.DeleteEntryGroupRequest(name=self.__ENTRY_GROUP_NAME))
+
+    def test_delete_entry_group_force_should_delete_entries(self):
+        self.__create_tag(self.__create_entry('entry_1').name, 'template')
+
+        self.__servicer.delete_entry_group(
+            datacatalog.DeleteEntryGroupRequest(name=self.__ENTRY_GROUP_NAME,
+                                                force=True))
+
+        self.assertEqual(0, self.__servicer.entries_count)
+        self.assertEqual(0, self.__servicer.tags_count)
+
+    def test_tag_template_methods_should_manage_tag_templates(self):
+        tag_template = self.__servicer.create_tag_template(
+            datacatalog.CreateTagTemplateRequest(
+                parent=self.__LOCATION_NAME,
+                tag_template_id='template',
+                tag_template=datacatalog.TagTemplate(display_name='Template')))
+        request = datacatalog.GetTagTemplateRequest(name=tag_template.name)
+
+        self.assertEqual(
+            'Template',
+            self.__servicer.get_tag_template(request).display_name)
+        self.__assert_raises_status(
+            grpc.StatusCode.ALREADY_EXISTS,
+            self.__servicer.create_tag_template,
+            datacatalog.CreateTagTemplateRequest(parent=self.__LOCATION_NAME,
+                                                 tag_template_id='template'))
+
+        self.__servicer.delete_tag_template(
+            datacatalog.DeleteTagTemplateRequest(name=tag_template.name))
+
+        self.__assert_raises_status(grpc.StatusCode.PERMISSION_DENIED,
+                                    self.__servicer.get_tag_template, request)
+
+    def test_tag_methods_should_manage_tags(self):
+        entry = self.__create_entry('entry_1')
+        tag = self.__create_tag(entry.name, 'template')
+
+        self.__assert_raises_status(grpc.StatusCode.ALREADY_EXISTS,
+                                    self.__create_tag, entry.name, 'template')
+
+        tag.fields['string-field'].string_value = 'new value'
+        self.__servicer.update_tag(
+            datacatalog.UpdateTagRequest(
+                tag=tag,
+                update_mask=field_mask_pb2.FieldMask(paths=['fields'])))
+        tags = self.__servicer.list_tags(
+            datacatalog.ListTagsRequest(parent=entry.name)).tags
+
+        self.assertEqual('new value',
+                         tags[0].fields['string-field'].string_value)
+
+        self.__servicer.update_tag(
+            datacatalog.UpdateTagRequest(tag=datacatalog.Tag(
+                name=tag.name, template='template', column='column')))
+        self.assertEqual(
+            'column',
+            self.__servicer.list_tags(
+                datacatalog.ListTagsRequest(parent=entry.name)).tags[0].column)
+
+        self.__servicer.delete_tag(datacatalog.DeleteTagRequest(name=tag.name))
+
+        self.assertEqual(0, self.__servicer.tags_count)
+
+    def test_search_catalog_should_filter_entries(self):
+        self.__create_entry('entry_1', 'system_1')
+        self.__create_entry('entry_2', 'system_2')
+
+        results = self.__search('system=system_1 entry_')
+
+        self.assertEqual(1, len(results))
+        self.assertEqual('{}/entries/entry_1'.format(self.__ENTRY_GROUP_NAME),
+                         results[0].relative_resource_name)
+        self.assertEqual(2, len(self.__search('type=table')))
+        self.assertEqual([], self.__search('unknown'))
+        self.assertEqual([], self.__search('system=system_1', 'other-project'))
+
+    def test_search_catalog_tag_templates_should_return_them(self):
+        self.__create_entry('entry_1')
+        self.__servicer.create_tag_template(
+            datacatalog.CreateTagTemplateRequest(parent=self.__LOCATION_NAME,
+                                                 tag_template_id='template'))
+
+        results = self.__search('type=tag_template')
+
+        self.assertEqual(1, len(results))
+        self.assertEqual(datacatalog.SearchResultType.TAG_TEMPLATE,
+                         results[0].search_result_type)
+
+    def test_search_catalog_after_write_should_not_return_cached_results(self):
+        self.__create_entry('entry_1')
+        self.assertEqual(1, len(self.__search('system=system')))
+
+        self.__create_entry('entry_2')
+
+        self.assertEqual(2, len(self.__search('system=system')))
+
+    def __create_entry(self, entry_id, system='system'):
+        return self.__servicer.create_entry(
+            datacatalog.CreateEntryRequest(
+                parent=self.__ENTRY_GROUP_NAME,
+                entry_id=entry_id,
+                entry=datacatalog.Entry(
+                    display_name=entry_id,
+                    user_specified_system=system,
+                    user_specified_type='table',
+                    linked_resource='//resource/{}'.format(entry_id))))
+
+    def __create_tag(self, entry_name, template):
+        tag = datacatalog.Tag(template=template)
+        string_field = datacatalog.TagField()
+        string_field.string_value = 'value'
+        tag.fields['string-field'] = string_field
+
+        return self.__servicer.create_tag(
+            datacatalog.CreateTagRequest(parent=entry_name, tag=tag))
+
+    def __search(self, query, project_id='project-id'):
+        request = datacatalog.SearchCatalogRequest(query=query)
+        request.scope.include_project_ids.append(project_id)
+        return list(self.__servicer.search_catalog(request).results)
+
+    def __assert_raises_status(self, status_code, function, *args):
+        with self.assertRaises(fake_datacatalog.FakeDataCatalogError) as error:
+            function(*args)
+        self.assertEqual(status_code, error.exception.status_code)
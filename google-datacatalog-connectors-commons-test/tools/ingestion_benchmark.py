@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the ingestion and cleanup flows against a local fake Data
+Catalog server.
+
+Synthetic Entries are ingested with DataCatalogMetadataIngestor, and a ratio
+of them is then deleted with DataCatalogMetadataCleaner. The entries/s, RPCs
+per entry, p50/p99 RPC latency and peak RSS of each phase, the latter on
+Linux only, and the peak RSS of each run are written as JSON, so the results
+of a release can be used as the baseline of the next one. Each size runs in
+a fresh process, so the peak RSS of a run is not inflated by the previous
+ones.
+
+Usage: python tools/ingestion_benchmark.py [--sizes 10000 100000 1000000]
+    [--output results.json] [--baseline previous_results.json]
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+
+import pkg_resources
+
+from google.datacatalog_connectors.commons_test import benchmark
+
+
+def run(args, entries_count):
+    """Runs the benchmark for a given number of Entries.
+
+    :param args: The parsed command line arguments.
+    :param entries_count: Number of Entries.
+    :return: A dict returned by IngestionBenchmark.run.
+    """
+    ingest_config = {}
+    if args.max_workers:
+        ingest_config['max_workers'] = args.max_workers
+
+    return benchmark.IngestionBenchmark(server_options={
+        'latency_seconds': args.latency_ms / 1000,
+        'max_workers': max(args.max_workers or 1, 10)
+    },
+                                        ingest_config=ingest_config).run(
+                                            entries_count, args.columns,
+                                            args.tags_per_entry,
+                                            args.obsolete_ratio)
+
+
+def get_version(distribution):
+    try:
+        return pkg_resources.get_distribution(distribution).version
+    except pkg_resources.DistributionNotFound:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[10000, 100000, 1000000],
+                        help='numbers of entries benchmarked')
+    parser.add_argument('--columns',
+                        type=int,
+                        default=10,
+                        help='columns per entry')
+    parser.add_argument('--tags-per-entry',
+                        type=float,
+                        default=1.0,
+                        help='average number of tags per entry')
+    parser.add_argument('--obsolete-ratio',
+                        type=float,
+                        default=0.1,
+                        help='ratio of the entries deleted by the cleanup')
+    parser.add_argument('--latency-ms',
+                        type=float,
+                        default=0,
+                        help='latency of the fake server')
+    parser.add_argument('--max-workers',
+                        type=int,
+                        help='entries ingested concurrently')
+    parser.add_argument('--output', help='results file, printed if not set')
+    parser.add_argument('--baseline',
+                        help='results file of a previous run, the command '
+                        'fails if the new results regressed')
+    parser.add_argument('--tolerance',
+                        type=float,
+                        default=0.1,
+                        help='ratio by which a metric may regress')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = []
+    for entries_count in args.sizes:
+        with multiprocessing.Pool(1) as pool:
+            results.append(pool.apply(run, (args, entries_count)))
+
+    report = {
+        'created_at':
+            datetime.datetime.utcnow().isoformat(),
+        'commons_version':
+            get_version('google-datacatalog-connectors-commons'),
+        'python_version':
+            platform.python_version(),
+        'platform':
+            platform.platform(),
+        'results':
+            results,
+    }
+
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(report_json)
+    else:
+        print(report_json)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline_results = json.load(baseline_file)['results']
+        regressions = benchmark.IngestionBenchmark.find_regressions(
+            results, baseline_results, args.tolerance)
+        for regression in regressions:
+            print('Regression: {}'.format(regression), file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,49 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .datacatalog_facade import DataCatalogFacade
+import importlib
+import sys
 
-__all__ = ['DataCatalogFacade']
+# The API clients take hundreds of milliseconds to import, so the public
+# classes and the subpackages are only imported on first use (PEP 562).
+_LAZY_ATTRIBUTES = {
+    'AsyncDataCatalogFacade': 'async_datacatalog_facade',
+    'DataCatalogClientProvider': 'datacatalog_client_provider',
+    'DataCatalogFacade': 'datacatalog_facade',
+    'TagWriteFailure': 'tag_writes_result',
+    'TagWritesResult': 'tag_writes_result',
+}
+
+_LAZY_SUBPACKAGES = ('cleanup', 'config', 'ingest', 'monitoring', 'prepare',
+                     'state', 'utils')
+
+__all__ = [
+    'AsyncDataCatalogFacade', 'DataCatalogClientProvider', 'DataCatalogFacade',
+    'TagWriteFailure', 'TagWritesResult'
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module('{}.{}'.format(
+            __name__, _LAZY_ATTRIBUTES[name]))
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+
+    if name in _LAZY_SUBPACKAGES:
+        return importlib.import_module('{}.{}'.format(__name__, name))
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(
+        __name__, name))
+
+
+def __dir__():
+    return sorted(
+        set(globals()) | set(_LAZY_ATTRIBUTES) | set(_LAZY_SUBPACKAGES))
+
+
+# Module __getattr__ requires Python 3.7, older versions import eagerly.
+if sys.version_info < (3, 7):
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
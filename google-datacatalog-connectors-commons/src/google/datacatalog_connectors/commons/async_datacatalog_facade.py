@@ -0,0 +1,377 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from google.datacatalog_connectors.commons import datacatalog_facade
+from google.datacatalog_connectors.commons import state
+from google.datacatalog_connectors.commons import tag_writes_result
+from google.datacatalog_connectors.commons import utils
+
+from google.api_core import exceptions
+from google.cloud import datacatalog
+from google.protobuf import field_mask_pb2
+
+
+class AsyncDataCatalogFacade:
+    """Wraps Data Catalog's API calls using the asyncio client.
+
+    Provides the same methods as DataCatalogFacade, as coroutines.
+    """
+
+    # The request building and logging helpers are shared with the
+    # synchronous facade.
+    __FACADE = datacatalog_facade.DataCatalogFacade
+
+    def __init__(self, project_id):
+        # The asyncio client is bound to the event loop running when it is
+        # created, so it is only created by the first coroutine that uses it.
+        self.__datacatalog = None
+        self.__project_id = project_id
+
+    def __get_client(self):
+        if not self.__datacatalog:
+            self.__datacatalog = datacatalog.DataCatalogAsyncClient()
+        return self.__datacatalog
+
+    async def create_entry(self, entry_group_name, entry_id, entry):
+        """Creates a Data Catalog Entry.
+
+        :param entry_group_name: Parent Entry Group name.
+        :param entry_id: Entry id.
+        :param entry: An Entry object.
+        :return: The created Entry.
+        """
+        try:
+            entry = await self.__get_client().create_entry(
+                parent=entry_group_name, entry_id=entry_id, entry=entry)
+            self.__FACADE.log_entry_operation('created', entry=entry)
+            return entry
+        except (exceptions.FailedPrecondition,
+                exceptions.PermissionDenied) as e:
+            entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
+            self.__FACADE.log_entry_operation('was not created',
+                                              entry_name=entry_name)
+            raise e
+
+    async def get_entry(self, name):
+        """Retrieves Data Catalog Entry.
+
+        :param name: The Entry name.
+        :return: An Entry object if it exists.
+        """
+        return await self.__get_client().get_entry(name=name)
+
+    async def lookup_entry(self, linked_resource):
+        """Get an Entry by target resource name.
+
+        :param linked_resource: The full name of the resource the Data Catalog
+            Entry represents.
+        :return: An Entry object if it exists.
+        """
+        request = datacatalog.LookupEntryRequest()
+        request.linked_resource = linked_resource
+        return await self.__get_client().lookup_entry(request=request)
+
+    async def update_entry(self, entry, update_mask=None):
+        """Updates an Entry.
+
+        :param entry: An Entry object.
+        :param update_mask: A list of the Entry field paths to update.
+            All fields are updated if not set.
+        :return: The updated Entry.
+        """
+        entry = await self.__get_client().update_entry(
+            entry=entry, update_mask=self.__build_field_mask(update_mask))
+        self.__FACADE.log_entry_operation('updated', entry=entry)
+        return entry
+
+    async def upsert_entry(self, entry_group_name, entry_id, entry):
+        """
+        Update a Data Catalog Entry if it exists and has been changed.
+        Creates a new Entry if it does not exist.
+
+        :param entry_group_name: Parent Entry Group name.
+        :param entry_id: Entry id.
+        :param entry: An Entry object.
+        :return: The updated or created Entry.
+        """
+        entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
+        try:
+            persisted_entry = await self.get_entry(entry_name)
+            self.__FACADE.log_entry_operation('already exists',
+                                              entry_name=entry_name)
+            changed_fields = utils.DataCatalogComparisonHelper\
+                .get_entry_changed_fields(persisted_entry, entry)
+            if changed_fields:
+                entry_update = self.__FACADE.build_entry_update(
+                    persisted_entry.name, entry, changed_fields)
+                persisted_entry = await self.update_entry(
+                    entry_update, update_mask=changed_fields)
+            else:
+                self.__FACADE.log_entry_operation('is up-to-date',
+                                                  entry=persisted_entry)
+            return persisted_entry
+        except exceptions.PermissionDenied:
+            self.__FACADE.log_entry_operation('does not exist',
+                                              entry_name=entry_name)
+            persisted_entry = await self.create_entry(
+                entry_group_name=entry_group_name,
+                entry_id=entry_id,
+                entry=entry)
+            return persisted_entry
+        except exceptions.FailedPrecondition as e:
+            logging.warning('Entry was not updated: %s', entry_name)
+            raise e
+
+    async def delete_entry(self, name):
+        """Deletes a Data Catalog Entry.
+
+        :param name: The Entry name.
+        """
+        try:
+            await self.__get_client().delete_entry(name=name)
+            self.__FACADE.log_entry_operation('deleted', entry_name=name)
+        except Exception as e:
+            logging.info(
+                'An exception ocurred while attempting to'
+                ' delete Entry: %s', name)
+            logging.debug(str(e))
+
+    @classmethod
+    def __build_field_mask(cls, paths):
+        return field_mask_pb2.FieldMask(paths=paths) if paths else None
+
+    async def create_entry_group(self, location_id, entry_group_id):
+        """Creates a Data Catalog Entry Group.
+
+        :param location_id: Location id.
+        :param entry_group_id: Entry Group id.
+        :return: The created Entry Group.
+        """
+        entry_group = await self.__get_client().create_entry_group(
+            parent=f'projects/{self.__project_id}/locations/{location_id}',
+            entry_group_id=entry_group_id,
+            entry_group=datacatalog.EntryGroup())
+        logging.info('Entry Group created: %s', entry_group.name)
+        return entry_group
+
+    async def delete_entry_group(self, name):
+        """
+        Deletes a Data Catalog Entry Group.
+
+        :param name: The Entry Group name.
+        """
+        await self.__get_client().delete_entry_group(name=name)
+        # Lets the ingestors of this process create it again.
+        state.KnownResourcesRegistry.shared().discard(name)
+
+    async def create_tag_template(self, location_id, tag_template_id,
+                                  tag_template):
+        """Creates a Data Catalog Tag Template.
+
+        :param location_id: Location id.
+        :param tag_template_id: Tag Template id.
+        :param tag_template: A Tag Template object.
+        :return: The created Tag Template.
+        """
+        created_tag_template = await self.__get_client().create_tag_template(
+            parent=f'projects/{self.__project_id}/locations/{location_id}',
+            tag_template_id=tag_template_id,
+            tag_template=tag_template)
+
+        logging.info('Tag Template created: %s', created_tag_template.name)
+        return created_tag_template
+
+    async def get_tag_template(self, name):
+        """Retrieves a Data Catalog Tag Template.
+
+        :param name: The Tag Templane name.
+        :return: A Tag Template object if it exists.
+        """
+        return await self.__get_client().get_tag_template(name=name)
+
+    async def get_tag_field_values_for_search_results(self, query, template,
+                                                      tag_field,
+                                                      tag_field_type):
+        """Retrieves Data Catalog Tag field values for search results.
+
+        :param query: Query used on search.
+        :param template: The Tag Template name.
+        :param tag_field: The Tag Field name.
+        :param tag_field_type: The Tag Field type.
+
+        :return: List of tag field values.
+        """
+        tag_field_values = []
+        table_entries_name = \
+            await self.search_catalog_relative_resource_name(query)
+        get_value = self.__FACADE.get_tag_field_value_getter(tag_field_type)
+        for table_entry_name in table_entries_name:
+            tags = await self.list_tags(table_entry_name)
+            for tag in tags:
+                if template in tag.template:
+                    tag_field_values.append(get_value(tag.fields[tag_field]))
+        return tag_field_values
+
+    async def delete_tag_template(self, name):
+        """Deletes a Data Catalog Tag Template.
+
+        :param name: The Tag Template name.
+        """
+        await self.__get_client().delete_tag_template(name=name, force=True)
+        state.KnownResourcesRegistry.shared().discard(name)
+        logging.info('Tag Template deleted: %s', name)
+
+    async def create_tag(self, entry_name, tag):
+        """Creates a Data Catalog Tag.
+
+        :param entry_name: Parent Entry name.
+        :param tag: A Tag object.
+        :return: The created Tag.
+        """
+        return await self.__get_client().create_tag(parent=entry_name, tag=tag)
+
+    async def delete_tag(self, tag):
+        """Deletes a Data Catalog Tag.
+
+        :param tag: A Tag object.
+        :return: The deleted Tag.
+        """
+        return await self.__get_client().delete_tag(name=tag.name)
+
+    async def list_tags(self, entry_name):
+        """List Tags for a given Entry.
+
+        :param entry_name: The parent Entry name.
+        :return: A list of Tag objects.
+        """
+        # Fetch AsyncPager.
+        pager = await self.__get_client().list_tags(parent=entry_name)
+        return [tag async for tag in pager]
+
+    async def update_tag(self, tag, update_mask=None):
+        """Updates a Tag.
+
+        :param tag: A Tag object.
+        :param update_mask: A list of the Tag field paths to update.
+            All fields are updated if not set.
+        :return: The updated Tag.
+        """
+        return await self.__get_client().update_tag(
+            tag=tag, update_mask=self.__build_field_mask(update_mask))
+
+    async def upsert_tags(self, entry, tags):
+        """Updates or creates Tag for a given Entry.
+
+        :param entry: The Entry object.
+        :param tags: A list of Tag objects.
+        :return: A TagWritesResult object.
+        """
+        if not tags:
+            return tag_writes_result.TagWritesResult()
+
+        persisted_tags = await self.list_tags(entry.name)
+
+        tag_writes = self.__FACADE.plan_tag_upserts(tags, persisted_tags)
+        return await self.__write_tags(entry, tag_writes)
+
+    async def delete_tags(self, entry, tags, tag_template_name):
+        """Deletes Tags for a given Entry if they don't exist
+        in Data Catalog.
+
+        :param entry: The Entry object.
+        :param tags: A list of Tag objects.
+        :param tag_template_name: Template name used to filter
+        templates out, it can be a part of the template name.
+        :return: A TagWritesResult object.
+        """
+        persisted_tags = await self.list_tags(entry.name)
+
+        tag_writes = self.__FACADE.plan_tag_deletions(tags, persisted_tags,
+                                                      tag_template_name)
+        return await self.__write_tags(entry, tag_writes)
+
+    async def reconcile_tags(self, entry, tags, tag_template_name):
+        """Updates or creates the given Tags for a given Entry, and deletes
+        the persisted Tags that are not present in the list, reading the
+        persisted Tags only once.
+
+        Tags are matched by Template and column, the column being case
+        insensitive.
+
+        :param entry: The Entry object.
+        :param tags: A list of Tag objects.
+        :param tag_template_name: Template name used to find the Tags that
+        should be deleted, it can be a part of the template name.
+        :return: A TagWritesResult object.
+        """
+        persisted_tags = await self.list_tags(entry.name)
+
+        tag_writes = self.__FACADE.plan_tag_upserts(tags, persisted_tags)
+        tag_writes.extend(
+            self.__FACADE.plan_tag_deletions(tags, persisted_tags,
+                                             tag_template_name))
+        return await self.__write_tags(entry, tag_writes)
+
+    async def __write_tags(self, entry, tag_writes):
+        result = tag_writes_result.TagWritesResult()
+        for operation, tag in tag_writes:
+            await self.__write_tag(entry, operation, tag)
+            result.add_success(operation, tag)
+        return result
+
+    async def __write_tag(self, entry, operation, tag):
+        if operation == tag_writes_result.TagWritesResult.CREATE:
+            created_tag = await self.create_tag(entry.name, tag)
+            logging.info('Tag created: %s', created_tag.name)
+        elif operation == tag_writes_result.TagWritesResult.UPDATE:
+            await self.update_tag(tag,
+                                  update_mask=self.__FACADE.TAG_UPDATE_MASK)
+            logging.info('Tag updated: %s', tag.name)
+        else:
+            await self.delete_tag(tag)
+            logging.info('Tag deleted: %s', tag.name)
+
+    async def search_catalog(self, query):
+        """Searches Data Catalog for a given query.
+
+        :param query: The query string.
+        :return: A Search Result list.
+        """
+        scope = datacatalog.SearchCatalogRequest.Scope()
+        scope.include_project_ids.append(self.__project_id)
+
+        request = datacatalog.SearchCatalogRequest()
+        request.scope = scope
+        request.query = query
+        request.page_size = 1000
+
+        # Fetch AsyncPager.
+        pager = await self.__get_client().search_catalog(request)
+        return [result async for result in pager]
+
+    async def search_catalog_relative_resource_name(self, query):
+        """Searches Data Catalog for a given query.
+
+        :param query: The query string.
+        :return: A string list in which each element represents
+        an Entry resource name.
+        """
+        return [
+            result.relative_resource_name
+            for result in await self.search_catalog(query)
+        ]
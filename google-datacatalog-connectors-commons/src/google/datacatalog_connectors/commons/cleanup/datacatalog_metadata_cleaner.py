@@ -14,11 +14,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
 import logging
 import re
 
 from google.datacatalog_connectors.commons import \
     datacatalog_facade
+from google.datacatalog_connectors.commons import state
 
 from google.api_core import exceptions
 from google.cloud import datacatalog
@@ -26,15 +28,27 @@ from google.cloud import datacatalog
 
 class DataCatalogMetadataCleaner:
 
-    def __init__(self, project_id, location_id, entry_group_id):
+    __ENTRY_NAME_PATTERN = '(?P<entry_group_name>.+?)/entries/(.+?)'
+
+    def __init__(self,
+                 project_id,
+                 location_id,
+                 entry_group_id,
+                 client_provider=None):
+        """
+        :param client_provider: A DataCatalogClientProvider shared with other
+            cleaners and ingestors. A new client is created if not set.
+        """
         self.__datacatalog_facade = datacatalog_facade.DataCatalogFacade(
-            project_id)
+            project_id, client_provider=client_provider)
         self.__project_id = project_id
         self.__location_id = location_id
         self.__entry_group_id = entry_group_id
 
-    def delete_obsolete_metadata(self, new_assembled_entries_data,
-                                 existing_entries_search_query):
+    def delete_obsolete_metadata(self,
+                                 new_assembled_entries_data,
+                                 existing_entries_search_query,
+                                 config=None):
         """Cleans up obsolete entries and entry_groups.
 
         Uses the required args to find out which Entries and Entry Groups
@@ -46,71 +60,103 @@ class DataCatalogMetadataCleaner:
             new entries from the custom system
         - old_entries_search_query (str):
             query used to retrieve the old entries from DataCatalog.
+        - config: dict with cleanup config, supported keys:
+            - state_store: dict, the state_store config given to
+              DataCatalogMetadataIngestor.ingest_metadata. The deleted
+              Entries and Entry Groups are forgotten, so they are created
+              again by the next ingestion runs.
         """
         logging.info('')
         logging.info('Starting to clean up the catalog...')
 
-        # Delete any pre-existing Entries.
-        old_entries_name = \
-            self.__datacatalog_facade.search_catalog_relative_resource_name(
-                existing_entries_search_query)
+        new_entries_name = set(
+            assembled_entry_data.entry.name
+            for assembled_entry_data in new_assembled_entries_data)
 
-        logging.info(
-            '%s entries that match the search query'
-            ' exist in Data Catalog!', len(old_entries_name))
+        # The search results are streamed, so only the names of the Entries
+        # to be deleted are kept in memory. They are deleted after the search
+        # completes to avoid changing the results while paginating them.
         logging.info('Looking for entries to be deleted...')
+        old_entries_count = 0
+        entries_name_pending_deletion = set()
+        entries_group_name = set()
+        for old_entry_name in self.__datacatalog_facade\
+                .iter_search_catalog_relative_resource_name(
+                    existing_entries_search_query):
+            old_entries_count += 1
+            if old_entry_name not in new_entries_name:
+                entries_name_pending_deletion.add(old_entry_name)
+
+            match = re.match(pattern=self.__ENTRY_NAME_PATTERN,
+                             string=old_entry_name)
+            if match:
+                entries_group_name.add(match.group('entry_group_name'))
 
-        new_entries_name = [
-            assembled_entry_data.entry.name
-            for assembled_entry_data in new_assembled_entries_data
-        ]
-
-        entries_name_pending_deletion = set(old_entries_name).difference(
-            set(new_entries_name))
+        logging.info(
+            '%s entries that match the search query'
+            ' exist in Data Catalog!', old_entries_count)
         logging.info('%s entries will be deleted.',
                      len(entries_name_pending_deletion))
 
-        for entry_name in entries_name_pending_deletion:
-            self.__datacatalog_facade.delete_entry(entry_name)
+        with self.__open_state_store(config) as state_store:
+            for entry_name in entries_name_pending_deletion:
+                self.__delete_entry(entry_name, state_store)
 
-        self.__cleanup_entry_groups(old_entries_name)
-
-    def __cleanup_entry_groups(self, obsolete_entries_name):
-        entries_group_name = []
-
-        datacatalog_entry_name_pattern =\
-            '(?P<entry_group_name>.+?)/entries/(.+?)'
-        for name in obsolete_entries_name:
-            match = re.match(pattern=datacatalog_entry_name_pattern,
-                             string=name)
-            if match:
-                entry_group_name = match.group('entry_group_name')
-                entries_group_name.append(entry_group_name)
+            self.__cleanup_entry_groups(entries_group_name, state_store)
 
-        for entry_group_name in set(entries_group_name):
+    def __cleanup_entry_groups(self, entries_group_name, state_store):
+        for entry_group_name in entries_group_name:
             try:
                 self.__datacatalog_facade.delete_entry_group(entry_group_name)
                 logging.info('Entry Group deleted: %s', entry_group_name)
+                if state_store:
+                    state_store.delete_resource(entry_group_name)
             except exceptions.GoogleAPICallError as e:
                 logging.info('Exception deleting Entry Group: %s',
                              entry_group_name)
                 logging.debug(str(e))
 
-    def delete_metadata(self, assembled_entries_data):
+    def delete_metadata(self, assembled_entries_data, config=None):
         """Deletes the given assembled_entries_data from Data Catalog.
 
         :param assembled_entries_data: type
             datacatalog_connectors_commons/ingest/assembled_entry_data.py
+        :param config: dict with the state_store key supported by
+            delete_obsolete_metadata.
         """
         logging.info('')
         logging.info('Starting the deletion flow...')
 
-        self.__delete_entries(assembled_entries_data)
+        with self.__open_state_store(config) as state_store:
+            self.__delete_entries(assembled_entries_data, state_store)
 
-    def __delete_entries(self, assembled_entries_data):
+    def __delete_entries(self, assembled_entries_data, state_store):
         for assembled_entry_data in assembled_entries_data:
             entry_id = assembled_entry_data.entry_id
             name = datacatalog.DataCatalogClient.entry_path(
                 self.__project_id, self.__location_id, self.__entry_group_id,
                 entry_id)
-            self.__datacatalog_facade.delete_entry(name=name)
+            self.__delete_entry(name, state_store)
+
+    def __delete_entry(self, name, state_store):
+        self.__datacatalog_facade.delete_entry(name=name)
+        # Forgotten even if the deletion failed, which only costs a
+        # verification on the next ingestion run.
+        if state_store:
+            state_store.delete(name)
+
+    @classmethod
+    @contextlib.contextmanager
+    def __open_state_store(cls, config):
+        state_store_config = config.get('state_store') if config else None
+        if not state_store_config:
+            yield None
+            return
+
+        state_store = state.IngestionStateStore(
+            state_store_config['path'],
+            state_store_config.get('full_verification_interval_hours'))
+        try:
+            yield state_store
+        finally:
+            state_store.close()
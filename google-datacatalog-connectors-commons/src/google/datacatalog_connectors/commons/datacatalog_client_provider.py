@@ -0,0 +1,87 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import threading
+
+from google.cloud import datacatalog
+
+
+class DataCatalogClientProvider:
+    """Provides Data Catalog clients from a pool shared by several facades.
+
+    Each client owns a gRPC channel, so sharing them avoids paying for new
+    connections, TLS handshakes and credentials refreshes per facade. The
+    requests are spread over the pooled clients in round robin, which keeps
+    concurrent requests below the streams limit of a single HTTP/2
+    connection.
+
+    gRPC shares subchannels, and hence connections, between channels that
+    have the same target and arguments, so the default clients are created
+    with local subchannel pools to get a connection each.
+    """
+
+    __CHANNEL_OPTIONS = [('grpc.use_local_subchannel_pool', 1)]
+
+    __shared_provider = None
+    __shared_provider_lock = threading.Lock()
+
+    def __init__(self, pool_size=1, client_factory=None):
+        """
+        :param pool_size: Number of clients, and hence of channels.
+        :param client_factory: Function that creates a client, defaults to
+            one that creates a datacatalog.DataCatalogClient over its own
+            connection. The clients are created on first use.
+        """
+        self.__pool_size = pool_size
+        self.__client_factory = client_factory or self.__create_client
+        self.__clients = None
+        self.__clients_cycle = None
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, pool_size=1):
+        """Gets the provider shared by the whole process.
+
+        :param pool_size: Number of clients of the shared provider, only
+            used when it is created by the first call.
+        :return: A DataCatalogClientProvider object.
+        """
+        with cls.__shared_provider_lock:
+            if cls.__shared_provider is None:
+                cls.__shared_provider = cls(pool_size)
+            return cls.__shared_provider
+
+    @classmethod
+    def __create_client(cls):
+        transport_class = datacatalog.DataCatalogClient.get_transport_class(
+            'grpc')
+        channel = transport_class.create_channel(options=cls.__CHANNEL_OPTIONS)
+        return datacatalog.DataCatalogClient(transport=transport_class(
+            channel=channel))
+
+    def get_client(self):
+        """Gets the next client of the pool.
+
+        :return: A DataCatalogClient object.
+        """
+        with self.__lock:
+            if self.__clients is None:
+                self.__clients = [
+                    self.__client_factory() for _ in range(self.__pool_size)
+                ]
+                self.__clients_cycle = itertools.cycle(self.__clients)
+            return next(self.__clients_cycle)
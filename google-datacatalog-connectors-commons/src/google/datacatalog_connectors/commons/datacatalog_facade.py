@@ -14,12 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+from concurrent import futures
 import logging
+import threading
 
+from google.datacatalog_connectors.commons import state
+from google.datacatalog_connectors.commons import tag_writes_result
 from google.datacatalog_connectors.commons import utils
 
 from google.api_core import exceptions
 from google.cloud import datacatalog
+from google.protobuf import field_mask_pb2
 
 
 class DataCatalogFacade:
@@ -30,12 +36,138 @@ class DataCatalogFacade:
     __STRING_TYPE = datacatalog.FieldType.PrimitiveType.STRING
     __TIMESTAMP_TYPE = datacatalog.FieldType.PrimitiveType.TIMESTAMP
 
-    # This is the value automatically set up by the GRPC client.
-    __DEFAULT_COLUMN_MODE = 'NULLABLE'
-
-    def __init__(self, project_id):
-        self.__datacatalog = datacatalog.DataCatalogClient()
+    # Reads a Tag field value according to its type, the values of
+    # non-primitive fields are read as enums.
+    __TAG_FIELD_VALUE_GETTERS = {
+        __BOOL_TYPE: lambda field: field.bool_value,
+        __DOUBLE_TYPE: lambda field: field.double_value,
+        __STRING_TYPE: lambda field: field.string_value,
+        __TIMESTAMP_TYPE: lambda field: field.timestamp_value,
+    }
+
+    # The values are the only mutable part of a Tag.
+    TAG_UPDATE_MASK = ['fields']
+
+    # Strategies supported by upsert_entry.
+    UPSERT_STRATEGY_GET_FIRST = 'get_first'
+    UPSERT_STRATEGY_CREATE_FIRST = 'create_first'
+    UPSERT_STRATEGY_AUTO = 'auto'
+
+    # The auto strategy switches to create_first when less than this ratio
+    # of the upserted Entries already existed.
+    __AUTO_STRATEGY_HIT_RATIO_THRESHOLD = 0.5
+
+    # The API methods not listed here are throttled as writes.
+    __API_METHOD_BUDGETS = {
+        'get_entry': utils.RateLimiter.READ,
+        'get_tag_template': utils.RateLimiter.READ,
+        'list_entries': utils.RateLimiter.READ,
+        'list_tags': utils.RateLimiter.READ,
+        'lookup_entry': utils.RateLimiter.READ,
+        'search_catalog': utils.RateLimiter.SEARCH,
+    }
+
+    __DEFAULT_SEARCH_CACHE_MAX_SIZE = 128
+    __DEFAULT_TAG_TEMPLATE_CACHE_MAX_SIZE = 256
+    __TAG_TEMPLATE_QUERY = 'type=tag_template'
+
+    def __init__(self,
+                 project_id,
+                 search_cache_ttl_seconds=None,
+                 search_cache_max_size=None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 client_provider=None,
+                 tag_template_cache_ttl_seconds=None,
+                 tag_template_cache_max_size=None):
+        """
+        :param project_id: The project searches are scoped to.
+        :param search_cache_ttl_seconds: Caches the search results for the
+            given time. Searches are not cached if not set.
+        :param search_cache_max_size: Max number of cached queries,
+            defaults to 128.
+        :param rate_limiter: A utils.RateLimiter that throttles the API
+            requests, which may be shared with other facades.
+        :param retry_policy: A utils.RetryPolicy that retries the API
+            requests failed because of transient errors.
+        :param client_provider: A DataCatalogClientProvider that spreads
+            the API requests over its pooled clients. The facade creates its
+            own client if not set.
+        :param tag_template_cache_ttl_seconds: Caches the Tag Templates
+            read or created for the given time. Tag Templates rarely change,
+            but changes made by other clients are not visible until they
+            expire. Tag Templates are not cached if not set.
+        :param tag_template_cache_max_size: Max number of cached Tag
+            Templates, defaults to 256.
+        """
+        self.__client_provider = client_provider
+        # Created on first use, so code paths that send no requests do not
+        # pay for the channel and credentials setup.
+        self.__datacatalog = None
+        self.__client_lock = threading.Lock()
         self.__project_id = project_id
+        self.__rate_limiter = rate_limiter
+        self.__retry_policy = retry_policy
+        self.__upserted_entries_count = 0
+        self.__existing_entries_count = 0
+        self.__upsert_stats_lock = threading.Lock()
+        # Entries indexed by name, grouped by Entry Group name.
+        self.__prefetched_entries = {}
+        self.__search_cache = None
+        if search_cache_ttl_seconds:
+            self.__search_cache = utils.TTLCache(
+                search_cache_max_size or self.__DEFAULT_SEARCH_CACHE_MAX_SIZE,
+                search_cache_ttl_seconds)
+        self.__tag_template_cache = None
+        if tag_template_cache_ttl_seconds:
+            self.__tag_template_cache = utils.TTLCache(
+                tag_template_cache_max_size or
+                self.__DEFAULT_TAG_TEMPLATE_CACHE_MAX_SIZE,
+                tag_template_cache_ttl_seconds)
+
+    def set_rate_limiter(self, rate_limiter):
+        """Sets the utils.RateLimiter that throttles the API requests.
+
+        :param rate_limiter: A RateLimiter object, or None to disable it.
+        """
+        self.__rate_limiter = rate_limiter
+
+    def set_retry_policy(self, retry_policy):
+        """Sets the utils.RetryPolicy that retries the API requests.
+
+        :param retry_policy: A RetryPolicy object, or None to disable it.
+        """
+        self.__retry_policy = retry_policy
+
+    def __execute(self, method_name, *args, **kwargs):
+        retry_policy = self.__retry_policy
+        if retry_policy:
+            # Disables the client's own retries, which would multiply the
+            # attempts and hide them from the retry budget, the retry stats
+            # and the rate limiter. No attempt outlasts the policy deadline.
+            kwargs['retry'] = None
+            kwargs['timeout'] = retry_policy.get_deadline_seconds(method_name)
+            return retry_policy.execute(method_name, self.__call_api,
+                                        method_name, *args, **kwargs)
+        return self.__call_api(method_name, *args, **kwargs)
+
+    def __call_api(self, method_name, *args, **kwargs):
+        # Each attempt takes its own rate limiter token.
+        if self.__rate_limiter:
+            self.__rate_limiter.acquire(
+                self.__API_METHOD_BUDGETS.get(method_name,
+                                              utils.RateLimiter.WRITE))
+        return getattr(self.__get_client(), method_name)(*args, **kwargs)
+
+    def __get_client(self):
+        if self.__client_provider:
+            return self.__client_provider.get_client()
+
+        if not self.__datacatalog:
+            with self.__client_lock:
+                if not self.__datacatalog:
+                    self.__datacatalog = datacatalog.DataCatalogClient()
+        return self.__datacatalog
 
     def create_entry(self, entry_group_name, entry_id, entry):
         """Creates a Data Catalog Entry.
@@ -46,16 +178,17 @@ class DataCatalogFacade:
         :return: The created Entry.
         """
         try:
-            entry = self.__datacatalog.create_entry(parent=entry_group_name,
-                                                    entry_id=entry_id,
-                                                    entry=entry)
-            self.__log_entry_operation('created', entry=entry)
+            entry = self.__execute('create_entry',
+                                   parent=entry_group_name,
+                                   entry_id=entry_id,
+                                   entry=entry)
+            self.log_entry_operation('created', entry=entry)
+            self.__invalidate_search_cache()
             return entry
         except (exceptions.FailedPrecondition,
                 exceptions.PermissionDenied) as e:
             entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
-            self.__log_entry_operation('was not created',
-                                       entry_name=entry_name)
+            self.log_entry_operation('was not created', entry_name=entry_name)
             raise e
 
     def get_entry(self, name):
@@ -64,7 +197,7 @@ class DataCatalogFacade:
         :param name: The Entry name.
         :return: An Entry object if it exists.
         """
-        return self.__datacatalog.get_entry(name=name)
+        return self.__execute('get_entry', name=name)
 
     def lookup_entry(self, linked_resource):
         """Get an Entry by target resource name.
@@ -75,19 +208,29 @@ class DataCatalogFacade:
         """
         request = datacatalog.LookupEntryRequest()
         request.linked_resource = linked_resource
-        return self.__datacatalog.lookup_entry(request=request)
+        return self.__execute('lookup_entry', request=request)
 
-    def update_entry(self, entry):
+    def update_entry(self, entry, update_mask=None):
         """Updates an Entry.
 
         :param entry: An Entry object.
+        :param update_mask: A list of the Entry field paths to update.
+            All fields are updated if not set.
         :return: The updated Entry.
         """
-        entry = self.__datacatalog.update_entry(entry=entry, update_mask=None)
-        self.__log_entry_operation('updated', entry=entry)
+        entry = self.__execute(
+            'update_entry',
+            entry=entry,
+            update_mask=self.__build_field_mask(update_mask))
+        self.log_entry_operation('updated', entry=entry)
+        self.__invalidate_search_cache()
         return entry
 
-    def upsert_entry(self, entry_group_name, entry_id, entry):
+    def upsert_entry(self,
+                     entry_group_name,
+                     entry_id,
+                     entry,
+                     strategy=UPSERT_STRATEGY_GET_FIRST):
         """
         Update a Data Catalog Entry if it exists and has been changed.
         Creates a new Entry if it does not exist.
@@ -95,20 +238,41 @@ class DataCatalogFacade:
         :param entry_group_name: Parent Entry Group name.
         :param entry_id: Entry id.
         :param entry: An Entry object.
+        :param strategy: How to find out whether the Entry exists:
+            - get_first: reads the Entry and creates it if not found, which
+              is the cheapest option when most Entries already exist;
+            - create_first: creates the Entry and only reads it when it
+              already exists, which is the cheapest option on initial loads;
+            - auto: picks one of the above based on the ratio of existing
+              Entries observed by this facade so far.
+            It is ignored if the Entry Group was prefetched.
         :return: The updated or created Entry.
         """
+        prefetched_entries = self.__prefetched_entries.get(entry_group_name)
+        if prefetched_entries is not None:
+            return self.__upsert_prefetched_entry(prefetched_entries,
+                                                  entry_group_name, entry_id,
+                                                  entry)
+
+        if strategy == self.UPSERT_STRATEGY_AUTO:
+            strategy = self.__choose_upsert_strategy()
+
+        if strategy == self.UPSERT_STRATEGY_CREATE_FIRST:
+            return self.__upsert_entry_create_first(entry_group_name, entry_id,
+                                                    entry)
+
+        return self.__upsert_entry_get_first(entry_group_name, entry_id, entry)
+
+    def __upsert_entry_get_first(self, entry_group_name, entry_id, entry):
         entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
         try:
             persisted_entry = self.get_entry(entry_name)
-            self.__log_entry_operation('already exists', entry_name=entry_name)
-            if self.__entry_was_updated(persisted_entry, entry):
-                persisted_entry = self.update_entry(entry)
-            else:
-                self.__log_entry_operation('is up-to-date',
-                                           entry=persisted_entry)
-            return persisted_entry
+            self.log_entry_operation('already exists', entry_name=entry_name)
+            self.__record_upsert(entry_existed=True)
+            return self.__update_entry_if_changed(persisted_entry, entry)
         except exceptions.PermissionDenied:
-            self.__log_entry_operation('does not exist', entry_name=entry_name)
+            self.log_entry_operation('does not exist', entry_name=entry_name)
+            self.__record_upsert(entry_existed=False)
             persisted_entry = self.create_entry(
                 entry_group_name=entry_group_name,
                 entry_id=entry_id,
@@ -118,104 +282,147 @@ class DataCatalogFacade:
             logging.warning('Entry was not updated: %s', entry_name)
             raise e
 
-    @classmethod
-    def __entry_was_updated(cls, current_entry, new_entry):
-        # Update time comparison allows to verify whether the entry was
-        # updated on the source system.
-        current_update_time = 0
-        if current_entry.source_system_timestamps.update_time:
-            current_update_time = \
-                current_entry.source_system_timestamps.update_time.timestamp()
-
-        new_update_time = 0
-        if new_entry.source_system_timestamps.update_time:
-            new_update_time = \
-                new_entry.source_system_timestamps.update_time.timestamp()
+    def __upsert_entry_create_first(self, entry_group_name, entry_id, entry):
+        entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
+        try:
+            persisted_entry = self.create_entry(
+                entry_group_name=entry_group_name,
+                entry_id=entry_id,
+                entry=entry)
+            self.__record_upsert(entry_existed=False)
+            return persisted_entry
+        except exceptions.AlreadyExists:
+            self.log_entry_operation('already exists', entry_name=entry_name)
+            self.__record_upsert(entry_existed=True)
 
-        updated_time_changed = \
-            new_update_time != 0 and current_update_time != new_update_time
+        try:
+            persisted_entry = self.get_entry(entry_name)
+            return self.__update_entry_if_changed(persisted_entry, entry)
+        except exceptions.FailedPrecondition as e:
+            logging.warning('Entry was not updated: %s', entry_name)
+            raise e
 
-        return updated_time_changed or not cls.__entries_are_equal(
-            current_entry, new_entry)
+    def __upsert_prefetched_entry(self, prefetched_entries, entry_group_name,
+                                  entry_id, entry):
+        entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
+        persisted_entry = prefetched_entries.get(entry_name)
+
+        if persisted_entry:
+            self.log_entry_operation('already exists', entry_name=entry_name)
+            self.__record_upsert(entry_existed=True)
+            try:
+                persisted_entry = self.__update_entry_if_changed(
+                    persisted_entry, entry)
+            except exceptions.FailedPrecondition as e:
+                logging.warning('Entry was not updated: %s', entry_name)
+                raise e
+        else:
+            self.log_entry_operation('does not exist', entry_name=entry_name)
+            # Another writer may have created it after the prefetch.
+            persisted_entry = self.__upsert_entry_create_first(
+                entry_group_name, entry_id, entry)
+
+        prefetched_entries[entry_name] = persisted_entry
+        return persisted_entry
+
+    def __update_entry_if_changed(self, persisted_entry, entry):
+        changed_fields = utils.DataCatalogComparisonHelper\
+            .get_entry_changed_fields(persisted_entry, entry)
+        if changed_fields:
+            entry_update = self.build_entry_update(persisted_entry.name, entry,
+                                                   changed_fields)
+            return self.update_entry(entry_update, update_mask=changed_fields)
+
+        self.log_entry_operation('is up-to-date', entry=persisted_entry)
+        return persisted_entry
 
     @classmethod
-    def __entries_are_equal(cls, entry_1, entry_2):
-        object_1 = utils.ValuesComparableObject()
-        object_1.user_specified_system = entry_1.user_specified_system
-        object_1.user_specified_type = entry_1.user_specified_type
-        object_1.display_name = entry_1.display_name
-        object_1.description = entry_1.description
-        object_1.linked_resource = entry_1.linked_resource
-
-        object_2 = utils.ValuesComparableObject()
-        object_2.user_specified_system = entry_2.user_specified_system
-        object_2.user_specified_type = entry_2.user_specified_type
-        object_2.display_name = entry_2.display_name
-        object_2.description = entry_2.description
-        object_2.linked_resource = entry_2.linked_resource
-
-        return object_1 == object_2 and cls.__schemas_are_equal(
-            entry_1.schema, entry_2.schema)
+    def build_entry_update(cls, name, entry, changed_fields):
+        """Builds the Entry sent by update_entry, which only has the changed
+        fields set.
+
+        :param name: The persisted Entry name.
+        :param entry: The new Entry object.
+        :param changed_fields: The update mask paths, as returned by
+            DataCatalogComparisonHelper.get_entry_changed_fields.
+        :return: An Entry object.
+        """
+        # Only the changed fields are sent, which keeps the request small
+        # when a single field of an Entry with a wide schema has changed.
+        entry_update = datacatalog.Entry()
+        entry_update.name = name
+        for field in changed_fields:
+            setattr(entry_update, field, getattr(entry, field))
+        return entry_update
 
     @classmethod
-    def __schemas_are_equal(cls, schema_1, schema_2):
-        columns_1 = schema_1.columns
-        columns_2 = schema_2.columns
+    def __build_field_mask(cls, paths):
+        return field_mask_pb2.FieldMask(paths=paths) if paths else None
 
-        column_names_are_equal = set(
-            [column_1.column for column_1 in columns_1]) == \
-            set(column_2.column for column_2 in columns_2)
+    def __choose_upsert_strategy(self):
+        with self.__upsert_stats_lock:
+            upserted_entries_count = self.__upserted_entries_count
+            existing_entries_count = self.__existing_entries_count
 
-        # No more checks needed if the column names don't match.
-        # For example, in case a column is deleted or
-        # a new column is created.
-        if not column_names_are_equal:
-            return False
+        # Reading first is the safest choice while there is no evidence
+        # most of the Entries are new.
+        if not upserted_entries_count:
+            return self.UPSERT_STRATEGY_GET_FIRST
 
-        for column_2 in columns_2:
-            column_to_evaluate = next((column_1 for column_1 in columns_1
-                                       if column_2.column == column_1.column),
-                                      None)
+        hit_ratio = existing_entries_count / upserted_entries_count
+        if hit_ratio < self.__AUTO_STRATEGY_HIT_RATIO_THRESHOLD:
+            return self.UPSERT_STRATEGY_CREATE_FIRST
 
-            if not (column_to_evaluate and cls.__column_fields_are_equal(
-                    column_to_evaluate, column_2)):
-                return False
+        return self.UPSERT_STRATEGY_GET_FIRST
 
-        return True
+    def __record_upsert(self, entry_existed):
+        with self.__upsert_stats_lock:
+            self.__upserted_entries_count += 1
+            if entry_existed:
+                self.__existing_entries_count += 1
 
-    @classmethod
-    def __column_fields_are_equal(cls, column_1, column_2):
-        object_1 = utils.ValuesComparableObject()
-        object_1.column = column_1.column
-        object_1.description = column_1.description
-        object_1.type = column_1.type
+    def list_entries(self, entry_group_name):
+        """List Entries for a given Entry Group.
 
-        # We need to initialize with the default MODE if it is not fulfilled.
-        if not column_1.mode:
-            column_1.mode = cls.__DEFAULT_COLUMN_MODE
+        :param entry_group_name: The parent Entry Group name.
+        :return: An Entry generator, which fetches the pages as they are
+            consumed.
+        """
+        request = datacatalog.ListEntriesRequest()
+        request.parent = entry_group_name
+        request.page_size = 1000
 
-        object_1.mode = column_1.mode
+        return self.__iter_pages('list_entries', request, 'entries')
 
-        # Currently, we simply compare the subcolumns length.
-        # The connectors do not handle this field at present.
-        object_1.subcolumns_len = len(column_1.subcolumns)
+    def prefetch_entries(self, entry_group_name):
+        """Reads all Entries from a given Entry Group into memory, so
+        upsert_entry compares the Entries that belong to it without sending
+        one get_entry request per Entry.
 
-        object_2 = utils.ValuesComparableObject()
-        object_2.column = column_2.column
-        object_2.description = column_2.description
-        object_2.type = column_2.type
+        The prefetched Entries are kept up to date with the changes made by
+        this facade. Changes made by other clients after the prefetch are not
+        visible to it.
 
-        # We need to initialize with the default MODE if it is not fulfilled.
-        if not column_2.mode:
-            column_2.mode = cls.__DEFAULT_COLUMN_MODE
+        :param entry_group_name: The Entry Group name.
+        :return: The number of prefetched Entries.
+        """
+        prefetched_entries = {
+            entry.name: entry for entry in self.list_entries(entry_group_name)
+        }
+        self.__prefetched_entries[entry_group_name] = prefetched_entries
 
-        object_2.mode = column_2.mode
+        logging.info('%s Entries prefetched from: %s', len(prefetched_entries),
+                     entry_group_name)
+        return len(prefetched_entries)
 
-        # Currently, we simply compare the subcolumns length.
-        # The connectors do not handle this field at present.
-        object_2.subcolumns_len = len(column_2.subcolumns)
+    def get_prefetched_entry(self, name):
+        """Gets an Entry read by prefetch_entries.
 
-        return object_1 == object_2
+        :param name: The Entry name.
+        :return: The Entry object, or None if it was not prefetched.
+        """
+        entry_group_name = name.split('/entries/')[0]
+        return self.__prefetched_entries.get(entry_group_name, {}).get(name)
 
     def delete_entry(self, name):
         """Deletes a Data Catalog Entry.
@@ -223,8 +430,11 @@ class DataCatalogFacade:
         :param name: The Entry name.
         """
         try:
-            self.__datacatalog.delete_entry(name=name)
-            self.__log_entry_operation('deleted', entry_name=name)
+            self.__execute('delete_entry', name=name)
+            self.log_entry_operation('deleted', entry_name=name)
+            self.__invalidate_search_cache()
+            entry_group_name = name.split('/entries/')[0]
+            self.__prefetched_entries.get(entry_group_name, {}).pop(name, None)
         except Exception as e:
             logging.info(
                 'An exception ocurred while attempting to'
@@ -232,8 +442,13 @@ class DataCatalogFacade:
             logging.debug(str(e))
 
     @classmethod
-    def __log_entry_operation(cls, description, entry=None, entry_name=None):
+    def log_entry_operation(cls, description, entry=None, entry_name=None):
+        """Logs an operation performed on an Entry.
 
+        :param description: The operation description, e.g. 'created'.
+        :param entry: The Entry object, if available.
+        :param entry_name: The Entry name, used if the Entry is not set.
+        """
         formatted_description = 'Entry {}: '.format(description)
         logging.info('%s%s', formatted_description,
                      entry.name if entry else entry_name)
@@ -249,7 +464,8 @@ class DataCatalogFacade:
         :param entry_group_id: Entry Group id.
         :return: The created Entry Group.
         """
-        entry_group = self.__datacatalog.create_entry_group(
+        entry_group = self.__execute(
+            'create_entry_group',
             parent=f'projects/{self.__project_id}/locations/{location_id}',
             entry_group_id=entry_group_id,
             entry_group=datacatalog.EntryGroup())
@@ -262,7 +478,10 @@ class DataCatalogFacade:
 
         :param name: The Entry Group name.
         """
-        self.__datacatalog.delete_entry_group(name=name)
+        self.__execute('delete_entry_group', name=name)
+        self.__invalidate_search_cache()
+        # Lets the ingestors of this process create it again.
+        state.KnownResourcesRegistry.shared().discard(name)
 
     def create_tag_template(self, location_id, tag_template_id, tag_template):
         """Creates a Data Catalog Tag Template.
@@ -272,61 +491,179 @@ class DataCatalogFacade:
         :param tag_template: A Tag Template object.
         :return: The created Tag Template.
         """
-        created_tag_template = self.__datacatalog.create_tag_template(
+        created_tag_template = self.__execute(
+            'create_tag_template',
             parent=f'projects/{self.__project_id}/locations/{location_id}',
             tag_template_id=tag_template_id,
             tag_template=tag_template)
 
         logging.info('Tag Template created: %s', created_tag_template.name)
+        self.__invalidate_search_cache()
+        self.__cache_tag_template(created_tag_template.name,
+                                  created_tag_template)
         return created_tag_template
 
     def get_tag_template(self, name):
         """Retrieves a Data Catalog Tag Template.
 
+        If tag_template_cache_ttl_seconds is set, repeated lookups do not
+        send one request each.
+
         :param name: The Tag Templane name.
         :return: A Tag Template object if it exists.
         """
-        return self.__datacatalog.get_tag_template(name=name)
+        if self.__tag_template_cache is not None:
+            tag_template = self.__tag_template_cache.get(name)
+            if tag_template is not None:
+                # Callers may change the returned object.
+                return datacatalog.TagTemplate(tag_template)
+
+        tag_template = self.__execute('get_tag_template', name=name)
+        self.__cache_tag_template(name, tag_template)
+        return tag_template
+
+    def __cache_tag_template(self, name, tag_template):
+        if self.__tag_template_cache is not None:
+            self.__tag_template_cache.put(
+                name, datacatalog.TagTemplate(tag_template))
+
+    def prefetch_tag_templates(self, location_id):
+        """Reads the Tag Templates of a given location into the Tag Template
+        cache. Does nothing if tag_template_cache_ttl_seconds is not set.
+
+        :param location_id: Location id.
+        :return: The number of prefetched Tag Templates.
+        """
+        if self.__tag_template_cache is None:
+            logging.warning('Tag Templates not prefetched, the Tag Template'
+                            ' cache is disabled.')
+            return 0
+
+        # The API has no list method for Tag Templates, so their names are
+        # found through a single search.
+        name_prefix = f'projects/{self.__project_id}/locations/' \
+            f'{location_id}/tagTemplates/'
+        tag_template_names = [
+            result.relative_resource_name
+            for result in self.__iter_search_catalog_pages(
+                self.__TAG_TEMPLATE_QUERY)
+            if result.relative_resource_name.startswith(name_prefix)
+        ]
+
+        for name in tag_template_names:
+            self.__cache_tag_template(
+                name, self.__execute('get_tag_template', name=name))
 
-    def get_tag_field_values_for_search_results(self, query, template,
-                                                tag_field, tag_field_type):
+        logging.info('%s Tag Templates prefetched from: %s',
+                     len(tag_template_names), location_id)
+        return len(tag_template_names)
+
+    def get_tag_field_values_for_search_results(self,
+                                                query,
+                                                template,
+                                                tag_field,
+                                                tag_field_type,
+                                                max_workers=None):
         """Retrieves Data Catalog Tag field values for search results.
 
         :param query: Query used on search.
         :param template: The Tag Template name.
         :param tag_field: The Tag Field name.
         :param tag_field_type: The Tag Field type.
+        :param max_workers: Number of Entries whose Tags are listed
+            concurrently. Entries are processed one at a time if not set.
 
         :return: List of tag field values.
         """
-        tag_field_values = []
-        table_entries_name = \
-            self.search_catalog_relative_resource_name(query)
-        for table_entry_name in table_entries_name:
-            tags = self.list_tags(table_entry_name)
+        return list(
+            self.iter_tag_field_values_for_search_results(
+                query, template, tag_field, tag_field_type, max_workers))
+
+    def iter_tag_field_values_for_search_results(self,
+                                                 query,
+                                                 template,
+                                                 tag_field,
+                                                 tag_field_type,
+                                                 max_workers=None):
+        """Retrieves Data Catalog Tag field values for search results, as
+        they are read.
+
+        :param query: Query used on search.
+        :param template: The Tag Template name.
+        :param tag_field: The Tag Field name.
+        :param tag_field_type: The Tag Field type.
+        :param max_workers: Number of Entries whose Tags are listed
+            concurrently. Entries are processed one at a time if not set.
+
+        :return: Generator of tag field values, in the search results order.
+        """
+        entries_name = self.iter_search_catalog_relative_resource_name(query)
+        if max_workers:
+            entries_tags = self.__list_tags_concurrently(
+                entries_name, max_workers)
+        else:
+            entries_tags = (
+                self.list_tags(entry_name) for entry_name in entries_name)
+
+        get_value = self.get_tag_field_value_getter(tag_field_type)
+        for tags in entries_tags:
             for tag in tags:
                 if template in tag.template:
-                    field = tag.fields[tag_field]
-
-                    if self.__STRING_TYPE == tag_field_type:
-                        tag_field_value = field.string_value
-                    elif self.__BOOL_TYPE == tag_field_type:
-                        tag_field_value = field.bool_value
-                    elif self.__DOUBLE_TYPE == tag_field_type:
-                        tag_field_value = field.double_value
-                    elif self.__TIMESTAMP_TYPE == tag_field_type:
-                        tag_field_value = field.timestamp_value
-                    else:
-                        tag_field_value = field.enum_value.display_name
-                    tag_field_values.append(tag_field_value)
-        return tag_field_values
+                    yield get_value(tag.fields[tag_field])
+
+    def __list_tags_concurrently(self, entries_name, max_workers):
+        # The amount of pending work is bounded to twice the number of
+        # workers, so the search results keep being streamed.
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending_futures = collections.deque()
+            for entry_name in entries_name:
+                if len(pending_futures) >= max_workers * 2:
+                    yield pending_futures.popleft().result()
+
+                pending_futures.append(
+                    executor.submit(self.list_tags, entry_name))
+
+            while pending_futures:
+                yield pending_futures.popleft().result()
+
+    @classmethod
+    def get_tag_field_value(cls, field, tag_field_type):
+        """Reads a Tag field value according to its type.
+
+        :param field: A TagField object.
+        :param tag_field_type: The Tag Field type, the values of
+            non-primitive fields are read as enums.
+        :return: The field value.
+        """
+        return cls.get_tag_field_value_getter(tag_field_type)(field)
+
+    @classmethod
+    def get_tag_field_value_getter(cls, tag_field_type):
+        """Gets the function that reads the Tag field values of a given type,
+        so it can be resolved once for several fields.
+
+        :param tag_field_type: The Tag Field type, the values of
+            non-primitive fields are read as enums.
+        :return: A function that receives a TagField object and returns its
+            value.
+        """
+        return cls.__TAG_FIELD_VALUE_GETTERS.get(
+            tag_field_type, cls.__get_enum_tag_field_value)
+
+    @classmethod
+    def __get_enum_tag_field_value(cls, field):
+        return field.enum_value.display_name
 
     def delete_tag_template(self, name):
         """Deletes a Data Catalog Tag Template.
 
         :param name: The Tag Template name.
         """
-        self.__datacatalog.delete_tag_template(name=name, force=True)
+        self.__execute('delete_tag_template', name=name, force=True)
+        self.__invalidate_search_cache()
+        state.KnownResourcesRegistry.shared().discard(name)
+        if self.__tag_template_cache is not None:
+            self.__tag_template_cache.invalidate(name)
         logging.info('Tag Template deleted: %s', name)
 
     def create_tag(self, entry_name, tag):
@@ -336,7 +673,9 @@ class DataCatalogFacade:
         :param tag: A Tag object.
         :return: The created Tag.
         """
-        return self.__datacatalog.create_tag(parent=entry_name, tag=tag)
+        created_tag = self.__execute('create_tag', parent=entry_name, tag=tag)
+        self.__invalidate_search_cache()
+        return created_tag
 
     def delete_tag(self, tag):
         """Deletes a Data Catalog Tag.
@@ -344,7 +683,9 @@ class DataCatalogFacade:
         :param tag: A Tag object.
         :return: The deleted Tag.
         """
-        return self.__datacatalog.delete_tag(name=tag.name)
+        deleted_tag = self.__execute('delete_tag', name=tag.name)
+        self.__invalidate_search_cache()
+        return deleted_tag
 
     def list_tags(self, entry_name):
         """List Tags for a given Entry.
@@ -352,56 +693,48 @@ class DataCatalogFacade:
         :param entry_name: The parent Entry name.
         :return: A list of Tag objects.
         """
-        return self.__datacatalog.list_tags(parent=entry_name)
+        request = datacatalog.ListTagsRequest()
+        request.parent = entry_name
+
+        return list(self.__iter_pages('list_tags', request, 'tags'))
 
-    def update_tag(self, tag):
+    def update_tag(self, tag, update_mask=None):
         """Updates a Tag.
 
         :param tag: A Tag object.
+        :param update_mask: A list of the Tag field paths to update.
+            All fields are updated if not set.
         :return: The updated Tag.
         """
-        return self.__datacatalog.update_tag(tag=tag, update_mask=None)
-
-    def upsert_tags(self, entry, tags):
+        updated_tag = self.__execute(
+            'update_tag',
+            tag=tag,
+            update_mask=self.__build_field_mask(update_mask))
+        self.__invalidate_search_cache()
+        return updated_tag
+
+    def upsert_tags(self, entry, tags, max_workers=None):
         """Updates or creates Tag for a given Entry.
 
         :param entry: The Entry object.
         :param tags: A list of Tag objects.
+        :param max_workers: Number of Tag writes sent concurrently. If set,
+            the rejected writes are collected into the result instead of
+            raising. Tags are written one at a time if not set.
+        :return: A TagWritesResult object.
         """
         if not tags:
-            return
+            return tag_writes_result.TagWritesResult()
 
         persisted_tags = self.list_tags(entry.name)
 
         # Fetch GRPCIterator.
         persisted_tags = [tag for tag in persisted_tags]
 
-        for tag in tags:
-            logging.info('Processing Tag from Template: %s ...', tag.template)
-
-            tag_to_create = tag
-            tag_to_update = None
-            for persisted_tag in persisted_tags:
-                # The column field is not case sensitive.
-                if tag.template == persisted_tag.template and \
-                   tag.column.lower() == persisted_tag.column.lower():
-
-                    tag_to_create = None
-                    tag.name = persisted_tag.name
-                    if not self.__tag_fields_are_equal(tag, persisted_tag):
-                        tag_to_update = tag
-                    break
-
-            if tag_to_create:
-                created_tag = self.create_tag(entry.name, tag_to_create)
-                logging.info('Tag created: %s', created_tag.name)
-            elif tag_to_update:
-                self.update_tag(tag_to_update)
-                logging.info('Tag updated: %s', tag_to_update.name)
-            else:
-                logging.info('Tag is up-to-date: %s', tag.name)
+        tag_writes = self.plan_tag_upserts(tags, persisted_tags)
+        return self.__write_tags(entry, tag_writes, max_workers)
 
-    def delete_tags(self, entry, tags, tag_template_name):
+    def delete_tags(self, entry, tags, tag_template_name, max_workers=None):
         """Deletes Tags for a given Entry if they don't exist
         in Data Catalog.
 
@@ -409,65 +742,140 @@ class DataCatalogFacade:
         :param tags: A list of Tag objects.
         :param tag_template_name: Template name used to filter
         templates out, it can be a part of the template name.
+        :param max_workers: Number of Tag writes sent concurrently. If set,
+            the rejected writes are collected into the result instead of
+            raising. Tags are written one at a time if not set.
+        :return: A TagWritesResult object.
         """
         persisted_tags = self.list_tags(entry.name)
 
         # Fetch GRPCIterator.
         persisted_tags = [tag for tag in persisted_tags]
 
-        for persisted_tag in persisted_tags:
-            logging.info('Processing Tag from Template: %s ...',
-                         persisted_tag.template)
-            tag_to_delete = None
-
-            if tag_template_name in persisted_tag.template:
-                tag_to_delete = persisted_tag
-                for tag in tags:
-                    if tag.template == persisted_tag.template and \
-                       tag.column == persisted_tag.column:
-                        tag_to_delete = None
-                        break
-
-            if tag_to_delete:
-                self.delete_tag(tag_to_delete)
-                logging.info('Tag deleted: %s', tag_to_delete.name)
-            else:
-                logging.info('Tag is up-to-date: %s', persisted_tag.name)
+        tag_writes = self.plan_tag_deletions(tags, persisted_tags,
+                                             tag_template_name)
+        return self.__write_tags(entry, tag_writes, max_workers)
+
+    def reconcile_tags(self, entry, tags, tag_template_name, max_workers=None):
+        """Updates or creates the given Tags for a given Entry, and deletes
+        the persisted Tags that are not present in the list, reading the
+        persisted Tags only once.
+
+        Tags are matched by Template and column, the column being case
+        insensitive.
+
+        :param entry: The Entry object.
+        :param tags: A list of Tag objects.
+        :param tag_template_name: Template name used to find the Tags that
+        should be deleted, it can be a part of the template name.
+        :param max_workers: Number of Tag writes sent concurrently. If set,
+            the rejected writes are collected into the result instead of
+            raising. Tags are written one at a time if not set.
+        :return: A TagWritesResult object.
+        """
+        persisted_tags = self.list_tags(entry.name)
+
+        # Fetch GRPCIterator.
+        persisted_tags = [tag for tag in persisted_tags]
+
+        tag_writes = self.plan_tag_upserts(tags, persisted_tags)
+        tag_writes.extend(
+            self.plan_tag_deletions(tags, persisted_tags, tag_template_name))
+        return self.__write_tags(entry, tag_writes, max_workers)
 
     @classmethod
-    def __tag_fields_are_equal(cls, tag_1, tag_2):
-        for field_id in tag_1.fields:
-            tag_1_field = tag_1.fields[field_id]
-            tag_2_field = tag_2.fields.get(field_id)
-
-            if tag_2_field is None:
-                return False
-
-            values_are_equal = tag_1_field.bool_value == \
-                tag_2_field.bool_value
-            values_are_equal = values_are_equal \
-                and tag_1_field.double_value == tag_2_field.double_value
-            values_are_equal = values_are_equal \
-                and tag_1_field.string_value == tag_2_field.string_value
-            values_are_equal = values_are_equal \
-                and cls.__timestamp_tag_fields_are_equal(
-                    tag_1_field, tag_2_field)
-            values_are_equal = values_are_equal \
-                and tag_1_field.enum_value.display_name == \
-                tag_2_field.enum_value.display_name
-
-            if not values_are_equal:
-                return False
-
-        return True
+    def plan_tag_upserts(cls, tags, persisted_tags):
+        """Lists the writes needed to create or update the given Tags.
+
+        The name of the persisted Tags is copied into the matching Tags.
+
+        :param tags: A list of Tag objects.
+        :param persisted_tags: A list of the Entry's persisted Tag objects.
+        :return: A list of (TagWritesResult operation, Tag) tuples.
+        """
+        persisted_tags_index = utils.DataCatalogComparisonHelper.index_tags(
+            persisted_tags)
+
+        tag_writes = []
+        for tag in tags or []:
+            logging.info('Processing Tag from Template: %s ...', tag.template)
+            persisted_tag = persisted_tags_index.get(
+                utils.DataCatalogComparisonHelper.get_tag_key(tag))
+
+            if not persisted_tag:
+                tag_writes.append(
+                    (tag_writes_result.TagWritesResult.CREATE, tag))
+                continue
+
+            tag.name = persisted_tag.name
+            if utils.DataCatalogComparisonHelper.tag_fields_are_equal(
+                    tag, persisted_tag):
+                logging.info('Tag is up-to-date: %s', tag.name)
+            else:
+                tag_writes.append(
+                    (tag_writes_result.TagWritesResult.UPDATE, tag))
+
+        return tag_writes
 
     @classmethod
-    def __timestamp_tag_fields_are_equal(cls, tag_1_field, tag_2_field):
-        if not (tag_1_field.timestamp_value and tag_2_field.timestamp_value):
-            return True
+    def plan_tag_deletions(cls, tags, persisted_tags, tag_template_name):
+        """Lists the writes needed to delete the persisted Tags that are not
+        present in the given Tags.
 
-        return tag_1_field.timestamp_value.timestamp() == \
-            tag_2_field.timestamp_value.timestamp()
+        :param tags: A list of Tag objects.
+        :param persisted_tags: A list of the Entry's persisted Tag objects.
+        :param tag_template_name: Template name used to find the Tags that
+            should be deleted, it can be a part of the template name.
+        :return: A list of (TagWritesResult operation, Tag) tuples.
+        """
+        tags_index = utils.DataCatalogComparisonHelper.index_tags(tags)
+
+        tag_writes = []
+        for persisted_tag in persisted_tags:
+            if utils.DataCatalogComparisonHelper.tag_is_obsolete(
+                    persisted_tag, tags_index, tag_template_name):
+                tag_writes.append(
+                    (tag_writes_result.TagWritesResult.DELETE, persisted_tag))
+        return tag_writes
+
+    def __write_tags(self, entry, tag_writes, max_workers):
+        result = tag_writes_result.TagWritesResult()
+
+        if not max_workers:
+            for operation, tag in tag_writes:
+                self.__write_tag(entry, operation, tag)
+                result.add_success(operation, tag)
+            return result
+
+        # The writes are independent from each other, so they are sent
+        # concurrently and a rejected write does not stop the others.
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures_to_writes = {
+                executor.submit(self.__write_tag, entry, operation, tag):
+                    (operation, tag) for operation, tag in tag_writes
+            }
+            for future in futures.as_completed(futures_to_writes):
+                operation, tag = futures_to_writes[future]
+                try:
+                    future.result()
+                    result.add_success(operation, tag)
+                except exceptions.GoogleAPICallError as e:
+                    logging.warning('Tag %s failed for Template %s: %s',
+                                    operation, tag.template, e)
+                    result.add_failure(operation, tag, e)
+
+        return result
+
+    def __write_tag(self, entry, operation, tag):
+        if operation == tag_writes_result.TagWritesResult.CREATE:
+            created_tag = self.create_tag(entry.name, tag)
+            logging.info('Tag created: %s', created_tag.name)
+        elif operation == tag_writes_result.TagWritesResult.UPDATE:
+            self.update_tag(tag, update_mask=self.TAG_UPDATE_MASK)
+            logging.info('Tag updated: %s', tag.name)
+        else:
+            self.delete_tag(tag)
+            logging.info('Tag deleted: %s', tag.name)
 
     def search_catalog(self, query):
         """Searches Data Catalog for a given query.
@@ -475,6 +883,38 @@ class DataCatalogFacade:
         :param query: The query string.
         :return: A Search Result list.
         """
+        return [result for result in self.iter_search_catalog(query)]
+
+    def iter_search_catalog(self, query):
+        """Searches Data Catalog for a given query, fetching the result pages
+        as they are consumed, so only one page is held in memory at a time.
+
+        When the search cache is enabled, the results of the fully consumed
+        searches are kept in memory and served again for the same query.
+
+        :param query: The query string.
+        :return: A Search Result generator.
+        """
+        if self.__search_cache is None:
+            yield from self.__iter_search_catalog_pages(query)
+            return
+
+        cache_key = (self.__project_id, query)
+        cached_results = self.__search_cache.get(cache_key)
+        if cached_results is not None:
+            yield from cached_results
+            return
+
+        # The writes made while the results are consumed, e.g. deleting the
+        # Entries found, make them stale.
+        generation = self.__search_cache.generation
+        results = []
+        for result in self.__iter_search_catalog_pages(query):
+            results.append(result)
+            yield result
+        self.__search_cache.put(cache_key, results, generation)
+
+    def __iter_search_catalog_pages(self, query):
         scope = datacatalog.SearchCatalogRequest.Scope()
         scope.include_project_ids.append(self.__project_id)
 
@@ -483,9 +923,20 @@ class DataCatalogFacade:
         request.query = query
         request.page_size = 1000
 
-        return [
-            result for result in self.__datacatalog.search_catalog(request)
-        ]
+        # The next page is only requested when the current one has been
+        # consumed.
+        yield from self.__iter_pages('search_catalog', request, 'results')
+
+    def __iter_pages(self, method_name, request, items_field):
+        # The pages are requested one by one through __execute, instead of
+        # letting the pager request the next ones, so every page is
+        # throttled, and a failed page is retried without starting over.
+        while True:
+            page = self.__execute(method_name, request=request)
+            yield from getattr(page, items_field)
+            if not page.next_page_token:
+                return
+            request.page_token = page.next_page_token
 
     def search_catalog_relative_resource_name(self, query):
         """Searches Data Catalog for a given query.
@@ -498,3 +949,30 @@ class DataCatalogFacade:
             result.relative_resource_name
             for result in self.search_catalog(query)
         ]
+
+    def iter_search_catalog_relative_resource_name(self, query):
+        """Searches Data Catalog for a given query, fetching the result pages
+        as they are consumed.
+
+        :param query: The query string.
+        :return: A string generator in which each element represents
+        an Entry resource name.
+        """
+        for result in self.iter_search_catalog(query):
+            yield result.relative_resource_name
+
+    def get_search_cache_stats(self):
+        """Gets the search cache usage counters.
+
+        :return: A dict with the hits, misses and size of the cache, or None
+            if the cache is not enabled.
+        """
+        if self.__search_cache is None:
+            return None
+        return self.__search_cache.stats()
+
+    def __invalidate_search_cache(self):
+        # Any write, including the Tag writes since Tags are searchable,
+        # may change the results of any query.
+        if self.__search_cache is not None:
+            self.__search_cache.invalidate()
@@ -14,6 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .async_datacatalog_metadata_ingestor import \
+    AsyncDataCatalogMetadataIngestor
 from .datacatalog_metadata_ingestor import DataCatalogMetadataIngestor
+from .ingestion_plan import IngestionPlan
+from .ingestion_planner import IngestionPlanner
 
-__all__ = ('DataCatalogMetadataIngestor',)
+__all__ = ('AsyncDataCatalogMetadataIngestor', 'DataCatalogMetadataIngestor',
+           'IngestionPlan', 'IngestionPlanner')
@@ -0,0 +1,259 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+
+from google.datacatalog_connectors.commons import \
+    async_datacatalog_facade
+from google.datacatalog_connectors.commons import state
+
+from google.api_core import exceptions
+from google.cloud import datacatalog
+
+
+class AsyncDataCatalogMetadataIngestor:
+    """Ingests custom metadata into Data Catalog using asyncio."""
+
+    __DEFAULT_MAX_WORKERS = 10
+
+    # Errors returned by Data Catalog when writing to an Entry Group that
+    # does not exist.
+    __MISSING_ENTRY_GROUP_ERRORS = (exceptions.NotFound,
+                                    exceptions.PermissionDenied)
+
+    # Errors returned by Data Catalog when writing a Tag whose Template does
+    # not exist.
+    __MISSING_TAG_TEMPLATE_ERRORS = (exceptions.NotFound,
+                                     exceptions.FailedPrecondition)
+
+    def __init__(self, project_id, location_id, entry_group_id):
+        self.__datacatalog_facade = \
+            async_datacatalog_facade.AsyncDataCatalogFacade(project_id)
+        self.__project_id = project_id
+        self.__location_id = location_id
+        self.__entry_group_id = entry_group_id
+        self.__known_resources = state.KnownResourcesRegistry.shared()
+        # The locks are bound to the running event loop, so they are
+        # created by ingest_metadata.
+        self.__entry_group_lock = None
+        self.__entry_group_trusted = False
+        # Incremented whenever the Entry Group is created again.
+        self.__entry_group_generation = 0
+        self.__tag_templates_lock = None
+        # The Tag Templates known to exist, by name, with their ids.
+        self.__trusted_tag_templates = {}
+        # Incremented whenever the Tag Templates are created again.
+        self.__tag_templates_generation = 0
+
+    async def ingest_metadata(self,
+                              assembled_entries_data,
+                              tag_templates_dict=None,
+                              config=None):
+        """Ingest metadata into Data Catalog.
+
+         :param
+         - assembled_entries_data: type
+             datacatalog_connectors_commons/ingest/assembled_entry_data.py
+         - tag_templates_dict: type dict
+         - config: dict with ingestion config, supported keys:
+             - delete_tags: dict, deletes the managed Tags that are not
+               present in the assembled entries.
+             - max_workers: int, max number of entries processed
+               concurrently, defaults to 10.
+        """
+        logging.info('')
+        logging.info('Starting the ingestion flow...')
+
+        self.__entry_group_lock = asyncio.Lock()
+        self.__tag_templates_lock = asyncio.Lock()
+
+        await self.__create_tag_templates(tag_templates_dict)
+        entry_group_name = await self.__create_entry_group()
+
+        await self.__ingest_entries(entry_group_name, assembled_entries_data,
+                                    config)
+
+    async def __create_tag_templates(self, tag_templates_dict=None):
+        self.__trusted_tag_templates = {}
+        if not tag_templates_dict:
+            return
+
+        for tag_template_id, tag_template in tag_templates_dict.items():
+            tag_template_name = datacatalog.DataCatalogClient \
+                .tag_template_path(self.__project_id, self.__location_id,
+                                   tag_template_id)
+            if tag_template_name in self.__known_resources:
+                logging.info('Tag Template "%s" known to exist, skipped.',
+                             tag_template_id)
+                self.__trusted_tag_templates[tag_template_name] = \
+                    (tag_template_id, tag_template)
+                continue
+
+            await self.__create_tag_template(tag_template_name,
+                                             tag_template_id, tag_template)
+
+    async def __create_tag_template(self, tag_template_name, tag_template_id,
+                                    tag_template):
+        try:
+            await self.__datacatalog_facade.create_tag_template(
+                location_id=self.__location_id,
+                tag_template_id=tag_template_id,
+                tag_template=tag_template)
+        except exceptions.AlreadyExists:
+            logging.info('Tag Template "%s" already exists!', tag_template_id)
+        self.__known_resources.add(tag_template_name)
+
+    async def __create_entry_group(self):
+        entry_group_name = datacatalog.DataCatalogClient.entry_group_path(
+            self.__project_id, self.__location_id, self.__entry_group_id)
+        self.__entry_group_trusted = \
+            entry_group_name in self.__known_resources
+        if self.__entry_group_trusted:
+            logging.info('Entry Group "%s" known to exist, skipped.',
+                         entry_group_name)
+            return entry_group_name
+
+        try:
+            await self.__datacatalog_facade.create_entry_group(
+                location_id=self.__location_id,
+                entry_group_id=self.__entry_group_id)
+        except exceptions.AlreadyExists:
+            logging.info('Entry Group "%s" already exists!', entry_group_name)
+        self.__known_resources.add(entry_group_name)
+        return entry_group_name
+
+    async def __call_on_entry_group(self, entry_group_name, coroutine_function,
+                                    *args):
+        generation = self.__entry_group_generation
+        try:
+            return await coroutine_function(*args)
+        except self.__MISSING_ENTRY_GROUP_ERRORS:
+            if not await self.__recreate_entry_group(entry_group_name,
+                                                     generation):
+                raise
+            return await coroutine_function(*args)
+
+    async def __recreate_entry_group(self, entry_group_name, generation):
+        """Creates the Entry Group again if it was only known to exist, as
+        it may have been deleted since.
+
+        :param generation: The Entry Group generation seen by the failed
+            request.
+        :return: True if the Entry Group was created again after the failed
+            request was sent, in which case it is worth retrying.
+        """
+        async with self.__entry_group_lock:
+            if self.__entry_group_trusted:
+                logging.warning(
+                    'Entry Group "%s" known to exist may have been deleted,'
+                    ' creating it again...', entry_group_name)
+                self.__known_resources.discard(entry_group_name)
+                await self.__create_entry_group()
+                self.__entry_group_trusted = False
+                self.__entry_group_generation += 1
+            return self.__entry_group_generation != generation
+
+    async def __call_on_tag_templates(self, coroutine_function, *args):
+        generation = self.__tag_templates_generation
+        try:
+            return await coroutine_function(*args)
+        except self.__MISSING_TAG_TEMPLATE_ERRORS:
+            if not await self.__recreate_tag_templates(generation):
+                raise
+            return await coroutine_function(*args)
+
+    async def __recreate_tag_templates(self, generation):
+        """Creates the Tag Templates again if they were only known to exist,
+        as they may have been deleted since.
+
+        :param generation: The Tag Templates generation seen by the failed
+            Tag writes.
+        :return: True if the Tag Templates were created again after the
+            failed Tag writes were sent, in which case they are worth
+            retrying.
+        """
+        async with self.__tag_templates_lock:
+            if self.__trusted_tag_templates:
+                logging.warning(
+                    'Tag Templates known to exist may have been deleted,'
+                    ' creating them again...')
+                for tag_template_name, (tag_template_id, tag_template) \
+                        in self.__trusted_tag_templates.items():
+                    self.__known_resources.discard(tag_template_name)
+                    await self.__create_tag_template(tag_template_name,
+                                                     tag_template_id,
+                                                     tag_template)
+                self.__trusted_tag_templates = {}
+                self.__tag_templates_generation += 1
+            return self.__tag_templates_generation != generation
+
+    async def __ingest_entries(self,
+                               entry_group_name,
+                               assembled_entries_data,
+                               config=None):
+        max_workers = config.get('max_workers') if config else None
+        semaphore = asyncio.Semaphore(max_workers or
+                                      self.__DEFAULT_MAX_WORKERS)
+
+        progress_indicator = 0
+        assembled_entries_count = len(assembled_entries_data)
+
+        async def ingest_entry(assembled_entry_data):
+            nonlocal progress_indicator
+            async with semaphore:
+                await self.__ingest_entry(entry_group_name,
+                                          assembled_entry_data, config)
+            progress_indicator += 1
+            logging.info('%s/%s', progress_indicator, assembled_entries_count)
+
+        await asyncio.gather(*[
+            ingest_entry(assembled_entry_data)
+            for assembled_entry_data in assembled_entries_data
+        ])
+
+    async def __ingest_entry(self, entry_group_name, assembled_entry_data,
+                             config):
+        entry_id = assembled_entry_data.entry_id
+        new_entry = assembled_entry_data.entry
+
+        try:
+            entry = await self.__call_on_entry_group(
+                entry_group_name, self.__datacatalog_facade.upsert_entry,
+                entry_group_name, entry_id, new_entry)
+
+            if config and 'delete_tags' in config:
+                delete_tags = config['delete_tags']
+                logging.info('')
+                logging.info('Starting the reconcile tags step')
+                # If not specified uses the entry group id to find
+                # what tag templates should have their tags deleted.
+                managed_tag_template = delete_tags.get('managed_tag_template')
+                if not managed_tag_template:
+                    managed_tag_template = self.__entry_group_id
+
+                await self.__call_on_tag_templates(
+                    self.__datacatalog_facade.reconcile_tags, entry,
+                    assembled_entry_data.tags, managed_tag_template)
+            else:
+                logging.info('')
+                logging.info('Starting the upsert tags step')
+                await self.__call_on_tag_templates(
+                    self.__datacatalog_facade.upsert_tags, entry,
+                    assembled_entry_data.tags)
+        except (exceptions.FailedPrecondition, exceptions.PermissionDenied):
+            logging.warning('Entry ignored, error on upsert_entry:',
+                            exc_info=True)
@@ -14,10 +14,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+from concurrent import futures
 import logging
+import random
+import threading
+import time
 
 from google.datacatalog_connectors.commons import \
     datacatalog_facade
+from google.datacatalog_connectors.commons import state
+from google.datacatalog_connectors.commons import utils
 
 from google.api_core import exceptions
 from google.cloud import datacatalog
@@ -26,12 +33,51 @@ from google.cloud import datacatalog
 class DataCatalogMetadataIngestor:
     """Ingests custom metadata into Data Catalog."""
 
-    def __init__(self, project_id, location_id, entry_group_id):
+    # How many times an Entry is tried when Data Catalog throttles it.
+    __MAX_THROTTLED_ATTEMPTS = 5
+
+    # Max wait before retrying a throttled Entry, which doubles per attempt
+    # up to the cap.
+    __THROTTLED_INITIAL_BACKOFF_SECONDS = 1
+    __THROTTLED_MAX_BACKOFF_SECONDS = 30
+
+    # Errors returned by Data Catalog when it is overloaded.
+    __THROTTLING_ERRORS = (exceptions.ResourceExhausted,
+                           exceptions.DeadlineExceeded)
+
+    # Errors returned by Data Catalog when writing a Tag whose Template does
+    # not exist.
+    __MISSING_TAG_TEMPLATE_ERRORS = (exceptions.NotFound,
+                                     exceptions.FailedPrecondition)
+
+    def __init__(self,
+                 project_id,
+                 location_id,
+                 entry_group_id,
+                 client_provider=None):
+        """
+        :param client_provider: A DataCatalogClientProvider shared with other
+            ingestors and cleaners. A new client is created if not set.
+        """
         self.__datacatalog_facade = datacatalog_facade.DataCatalogFacade(
-            project_id)
+            project_id, client_provider=client_provider)
         self.__project_id = project_id
         self.__location_id = location_id
         self.__entry_group_id = entry_group_id
+        self.__state_store = None
+        self.__checkpoint = None
+        self.__known_resources = state.KnownResourcesRegistry.shared()
+        self.__entry_group_lock = threading.Lock()
+        self.__entry_group_trusted = False
+        # Incremented whenever the Entry Group is created again.
+        self.__entry_group_generation = 0
+        self.__tag_templates_lock = threading.Lock()
+        # The Tag Templates known to exist, by name, with their ids.
+        self.__trusted_tag_templates = {}
+        # Incremented whenever the Tag Templates are created again.
+        self.__tag_templates_generation = 0
+        self.__concurrency_limiter = None
+        self.__retry_policy = None
 
     def ingest_metadata(self,
                         assembled_entries_data,
@@ -43,45 +89,341 @@ class DataCatalogMetadataIngestor:
          - assembled_entries_data: type
              datacatalog_connectors_commons/ingest/assembled_entry_data.py
          - tag_templates_dict: type dict
-         - config: dict with ingestion config
+         - config: dict with ingestion config, supported keys:
+             - delete_tags: dict, deletes the managed Tags that are not
+               present in the assembled entries.
+             - max_workers: int, number of entries processed concurrently.
+               Entries are processed one at a time if not set.
+             - adaptive_concurrency: bool, adjusts the number of entries
+               processed concurrently, up to max_workers, based on the
+               latency and the ResourceExhausted and DeadlineExceeded errors
+               returned by Data Catalog. The throttled entries are retried
+               after an exponential backoff with jitter.
+             - upsert_entry_strategy: str, the DataCatalogFacade.upsert_entry
+               strategy: get_first (default), create_first or auto.
+             - prefetch_entries: bool, reads all Entries from the Entry Group
+               upfront instead of reading them one by one.
+             - tag_writes_max_workers: int, number of Tag writes sent
+               concurrently for each Entry. The rejected Tag writes are
+               logged and do not stop the other ones. The throttled writes
+               are raised once the other ones complete.
+             - state_store: dict, keeps the fingerprints of the ingested
+               Entries and Tags in a local file, so the unchanged ones are
+               skipped on the next runs. Supported keys: path (required)
+               and full_verification_interval_hours, after which the
+               unchanged Entries are verified against Data Catalog again.
+               The Entry Group and Tag Templates known to exist are stored
+               as well, and are not created again on the next runs unless a
+               write finds them missing. When prefetch_entries is set, the
+               stored fingerprints of the Entries missing from the Entry
+               Group are ignored.
+             - rate_limits: dict, throttles the Data Catalog API requests.
+               Supported keys: reads_per_minute, writes_per_minute and
+               searches_per_minute. A utils.RateLimiter object is also
+               accepted, so the budgets can be shared by several ingestors.
+             - retry_policy: dict, retries the Data Catalog API requests
+               failed because of transient errors, with the
+               utils.RetryPolicy constructor arguments as keys. A
+               RetryPolicy object is also accepted, so the retry budget
+               can be shared by several ingestors.
+             - checkpoint: dict, records the Entries written, along with
+               their Tags, in an append-only file, so an interrupted run can
+               be resumed. Supported keys: path (required), resume, which
+               skips the Entries recorded by the interrupted run, and
+               batch_size, the number of Entries written to the file at
+               once. The file is deleted when the run finishes.
         """
         logging.info('')
         logging.info('Starting the ingestion flow...')
 
-        self.__create_tag_templates(tag_templates_dict)
+        self.__configure_facade(config)
+
+        state_store_config = config.get('state_store') if config else None
+        if state_store_config:
+            self.__state_store = state.IngestionStateStore(
+                state_store_config['path'],
+                state_store_config.get('full_verification_interval_hours'))
+
+        checkpoint_config = config.get('checkpoint') if config else None
+        if checkpoint_config:
+            self.__checkpoint = state.IngestionCheckpoint(
+                checkpoint_config['path'],
+                resume=checkpoint_config.get('resume', False),
+                batch_size=checkpoint_config.get('batch_size', 100))
 
         try:
-            entry_group = self.__datacatalog_facade.create_entry_group(
-                location_id=self.__location_id,
-                entry_group_id=self.__entry_group_id)
-            entry_group_name = entry_group.name
-        except exceptions.AlreadyExists:
-            entry_group_name = datacatalog.DataCatalogClient.entry_group_path(
-                self.__project_id, self.__location_id, self.__entry_group_id)
-            logging.info(
-                'Entry Group already exists!'
-                ' Name "%s" built as fallback.', entry_group_name)
+            self.__create_tag_templates(tag_templates_dict)
+            entry_group_name = self.__create_entry_group()
+
+            if config and config.get('prefetch_entries'):
+                self.__call_on_entry_group(
+                    entry_group_name,
+                    self.__datacatalog_facade.prefetch_entries,
+                    entry_group_name)
+
+            self.__ingest_entries(entry_group_name, assembled_entries_data,
+                                  config)
+
+            if self.__checkpoint:
+                self.__checkpoint.complete()
+                self.__checkpoint = None
+        finally:
+            if self.__state_store:
+                self.__state_store.close()
+                self.__state_store = None
+            if self.__checkpoint:
+                self.__checkpoint.close()
+                self.__checkpoint = None
+
+    def apply_plan(self, plan, config=None):
+        """Sends the writes listed in an ingestion plan, and only them.
+
+        The Entry Group and the Tag Templates are expected to exist. The
+        operations a stale plan no longer applies to, creating a resource
+        that already exists or changing one that was deleted, are skipped.
+
+        :param plan: An IngestionPlan object.
+        :param config: dict with the rate_limits and retry_policy keys
+            supported by ingest_metadata.
+        :return: The number of operations applied.
+        """
+        logging.info('')
+        logging.info('Applying the ingestion plan: %s operations...',
+                     len(plan))
+
+        self.__configure_facade(config)
+
+        applied_operations_count = 0
+        for planned_operation in plan:
+            try:
+                self.__apply_operation(plan, planned_operation)
+                applied_operations_count += 1
+            except (exceptions.FailedPrecondition,
+                    exceptions.PermissionDenied):
+                logging.warning('Operation ignored, error on %s: %s',
+                                planned_operation['operation'],
+                                planned_operation['entry_name'],
+                                exc_info=True)
+            except (exceptions.AlreadyExists, exceptions.NotFound) as e:
+                # The catalog changed since the plan was computed.
+                logging.warning('Stale operation skipped, %s: %s: %s',
+                                planned_operation['operation'],
+                                planned_operation['entry_name'], e.message)
+
+        logging.info('%s/%s operations applied.', applied_operations_count,
+                     len(plan))
+        return applied_operations_count
 
-        self.__ingest_entries(entry_group_name, assembled_entries_data, config)
+    def get_concurrency_stats(self):
+        """Gets the state of the adaptive concurrency control.
+
+        :return: A dict with the current window, the entries in flight, the
+            completed and throttled entries count, and the throughput in
+            entries per second, or None if adaptive_concurrency is disabled.
+        """
+        if not self.__concurrency_limiter:
+            return None
+        return self.__concurrency_limiter.stats()
+
+    def get_retry_stats(self):
+        """Gets the retry counters of the Data Catalog API requests.
+
+        :return: A dict with the retries count, the count of retries
+            prevented by an exhausted retry budget, and the budget left, or
+            None if retry_policy is not configured.
+        """
+        if not self.__retry_policy:
+            return None
+        return self.__retry_policy.stats()
+
+    def __apply_operation(self, plan, planned_operation):
+        operation = planned_operation['operation']
+        entry_name = planned_operation['entry_name']
+        update_mask = planned_operation.get('update_mask')
+
+        if operation == plan.CREATE_ENTRY:
+            self.__datacatalog_facade.create_entry(
+                entry_group_name=entry_name.rpartition('/entries/')[0],
+                entry_id=planned_operation['entry_id'],
+                entry=plan.get_entry(planned_operation))
+        elif operation == plan.UPDATE_ENTRY:
+            self.__datacatalog_facade.update_entry(
+                plan.get_entry(planned_operation), update_mask=update_mask)
+        elif operation == plan.DELETE_ENTRY:
+            self.__datacatalog_facade.delete_entry(entry_name)
+        elif operation == plan.CREATE_TAG:
+            self.__datacatalog_facade.create_tag(
+                entry_name, plan.get_tag(planned_operation))
+        elif operation == plan.UPDATE_TAG:
+            self.__datacatalog_facade.update_tag(
+                plan.get_tag(planned_operation), update_mask=update_mask)
+        else:
+            self.__datacatalog_facade.delete_tag(
+                plan.get_tag(planned_operation))
+
+    def __configure_facade(self, config):
+        rate_limits = config.get('rate_limits') if config else None
+        if rate_limits:
+            if not isinstance(rate_limits, utils.RateLimiter):
+                rate_limits = utils.RateLimiter.from_config(rate_limits)
+            self.__datacatalog_facade.set_rate_limiter(rate_limits)
+
+        retry_policy = config.get('retry_policy') if config else None
+        if retry_policy is not None:
+            if not isinstance(retry_policy, utils.RetryPolicy):
+                retry_policy = utils.RetryPolicy.from_config(retry_policy)
+            self.__retry_policy = retry_policy
+            self.__datacatalog_facade.set_retry_policy(retry_policy)
 
     def __create_tag_templates(self, tag_templates_dict=None):
+        self.__trusted_tag_templates = {}
         if not tag_templates_dict:
             return
 
         for tag_template_id, tag_template in tag_templates_dict.items():
-            try:
-                self.__datacatalog_facade.create_tag_template(
-                    location_id=self.__location_id,
-                    tag_template_id=tag_template_id,
-                    tag_template=tag_template)
-            except exceptions.AlreadyExists:
-                logging.info('Tag Template "%s" already exists!',
+            tag_template_name = datacatalog.DataCatalogClient \
+                .tag_template_path(self.__project_id, self.__location_id,
+                                   tag_template_id)
+            if self.__is_resource_known(tag_template_name):
+                logging.info('Tag Template "%s" known to exist, skipped.',
                              tag_template_id)
+                self.__trusted_tag_templates[tag_template_name] = \
+                    (tag_template_id, tag_template)
+                continue
+
+            self.__create_tag_template(tag_template_name, tag_template_id,
+                                       tag_template)
+
+    def __create_tag_template(self, tag_template_name, tag_template_id,
+                              tag_template):
+        try:
+            self.__datacatalog_facade.create_tag_template(
+                location_id=self.__location_id,
+                tag_template_id=tag_template_id,
+                tag_template=tag_template)
+        except exceptions.AlreadyExists:
+            logging.info('Tag Template "%s" already exists!', tag_template_id)
+        self.__save_known_resource(tag_template_name)
+
+    def __create_entry_group(self):
+        entry_group_name = datacatalog.DataCatalogClient.entry_group_path(
+            self.__project_id, self.__location_id, self.__entry_group_id)
+        self.__entry_group_trusted = \
+            self.__is_resource_known(entry_group_name)
+        if self.__entry_group_trusted:
+            logging.info('Entry Group "%s" known to exist, skipped.',
+                         entry_group_name)
+            return entry_group_name
+
+        try:
+            self.__datacatalog_facade.create_entry_group(
+                location_id=self.__location_id,
+                entry_group_id=self.__entry_group_id)
+        except exceptions.AlreadyExists:
+            logging.info('Entry Group "%s" already exists!', entry_group_name)
+        self.__save_known_resource(entry_group_name)
+        return entry_group_name
+
+    def __call_on_entry_group(self, entry_group_name, method, *args, **kwargs):
+        generation = self.__entry_group_generation
+        try:
+            return method(*args, **kwargs)
+        except (exceptions.NotFound, exceptions.PermissionDenied):
+            if not self.__recreate_entry_group(entry_group_name, generation):
+                raise
+            return method(*args, **kwargs)
+
+    def __recreate_entry_group(self, entry_group_name, generation):
+        """Creates the Entry Group again if it was only known to exist, as
+        it may have been deleted since.
+
+        :param generation: The Entry Group generation seen by the failed
+            request.
+        :return: True if the Entry Group was created again after the failed
+            request was sent, in which case it is worth retrying.
+        """
+        with self.__entry_group_lock:
+            if self.__entry_group_trusted:
+                logging.warning(
+                    'Entry Group "%s" known to exist may have been deleted,'
+                    ' creating it again...', entry_group_name)
+                self.__forget_known_resource(entry_group_name)
+                self.__create_entry_group()
+                self.__entry_group_trusted = False
+                self.__entry_group_generation += 1
+            return self.__entry_group_generation != generation
+
+    def __call_on_tag_templates(self, method, *args, **kwargs):
+        generation = self.__tag_templates_generation
+        try:
+            result = method(*args, **kwargs)
+        except self.__MISSING_TAG_TEMPLATE_ERRORS:
+            if not self.__recreate_tag_templates(generation):
+                raise
+            return method(*args, **kwargs)
+
+        if any(
+                isinstance(failure.error, self.__MISSING_TAG_TEMPLATE_ERRORS)
+                for failure in result.failures) \
+                and self.__recreate_tag_templates(generation):
+            return method(*args, **kwargs)
+        return result
+
+    def __recreate_tag_templates(self, generation):
+        """Creates the Tag Templates again if they were only known to exist,
+        as they may have been deleted since.
+
+        :param generation: The Tag Templates generation seen by the failed
+            Tag writes.
+        :return: True if the Tag Templates were created again after the
+            failed Tag writes were sent, in which case they are worth
+            retrying.
+        """
+        with self.__tag_templates_lock:
+            if self.__trusted_tag_templates:
+                logging.warning(
+                    'Tag Templates known to exist may have been deleted,'
+                    ' creating them again...')
+                for tag_template_name, (tag_template_id, tag_template) \
+                        in self.__trusted_tag_templates.items():
+                    self.__forget_known_resource(tag_template_name)
+                    self.__create_tag_template(tag_template_name,
+                                               tag_template_id, tag_template)
+                self.__trusted_tag_templates = {}
+                self.__tag_templates_generation += 1
+            return self.__tag_templates_generation != generation
+
+    def __is_resource_known(self, name):
+        if name in self.__known_resources:
+            return True
+
+        if self.__state_store and self.__state_store.is_resource_known(name):
+            self.__known_resources.add(name)
+            return True
+
+        return False
+
+    def __save_known_resource(self, name):
+        self.__known_resources.add(name)
+        if self.__state_store:
+            self.__state_store.save_resource(name)
+
+    def __forget_known_resource(self, name):
+        self.__known_resources.discard(name)
+        if self.__state_store:
+            self.__state_store.delete_resource(name)
 
     def __ingest_entries(self,
                          entry_group_name,
                          assembled_entries_data,
                          config=None):
+        max_workers = config.get('max_workers') if config else None
+        if max_workers and max_workers > 1:
+            self.__ingest_entries_concurrently(entry_group_name,
+                                               assembled_entries_data,
+                                               max_workers, config)
+            return
+
         progress_indicator = 0
         assembled_entries_count = len(assembled_entries_data)
         for assembled_entry_data in assembled_entries_data:
@@ -89,31 +431,174 @@ class DataCatalogMetadataIngestor:
             logging.info('')
             logging.info('%s/%s', progress_indicator, assembled_entries_count)
 
-            entry_id = assembled_entry_data.entry_id
-            new_entry = assembled_entry_data.entry
+            self.__ingest_entry(entry_group_name, assembled_entry_data, config)
+
+    def __ingest_entries_concurrently(self, entry_group_name,
+                                      assembled_entries_data, max_workers,
+                                      config):
+        """Processes the entries on a pool of worker threads.
+
+        The amount of pending work is bounded to twice the number of workers,
+        and the progress is logged in the same order the entries were
+        provided, regardless of the order they finish.
+        """
+        logging.info('Ingesting entries with %s workers...', max_workers)
+
+        ingest_entry = self.__ingest_entry
+        self.__concurrency_limiter = None
+        if config.get('adaptive_concurrency'):
+            self.__concurrency_limiter = utils.AdaptiveConcurrencyLimiter(
+                max_workers, initial_window=max(1, max_workers // 2))
+            ingest_entry = self.__ingest_entry_adaptively
+
+        progress_indicator = 0
+        assembled_entries_count = len(assembled_entries_data)
+        pending_futures = collections.deque()
+
+        def log_progress(future):
+            nonlocal progress_indicator
+            # Re-raises any unexpected error raised by the worker thread.
+            future.result()
+            progress_indicator += 1
+            logging.info('%s/%s', progress_indicator, assembled_entries_count)
+
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for assembled_entry_data in assembled_entries_data:
+                if len(pending_futures) >= max_workers * 2:
+                    log_progress(pending_futures.popleft())
+
+                pending_futures.append(
+                    executor.submit(ingest_entry, entry_group_name,
+                                    assembled_entry_data, config))
+
+            while pending_futures:
+                log_progress(pending_futures.popleft())
 
+    def __ingest_entry_adaptively(self, entry_group_name, assembled_entry_data,
+                                  config):
+        limiter = self.__concurrency_limiter
+        for attempt in range(1, self.__MAX_THROTTLED_ATTEMPTS + 1):
+            limiter.acquire()
+            started_at = time.monotonic()
+            throttled = False
             try:
-                entry = self.__datacatalog_facade.upsert_entry(
-                    entry_group_name, entry_id, new_entry)
+                self.__ingest_entry(entry_group_name, assembled_entry_data,
+                                    config)
+                return
+            except self.__THROTTLING_ERRORS as e:
+                throttled = True
+                if attempt == self.__MAX_THROTTLED_ATTEMPTS:
+                    raise
+                logging.warning('Entry throttled, attempt %s of %s: %s (%s)',
+                                attempt, self.__MAX_THROTTLED_ATTEMPTS,
+                                assembled_entry_data.entry_id, e)
+            finally:
+                limiter.release(time.monotonic() - started_at, throttled)
+            # Waits without holding a concurrency slot.
+            time.sleep(self.__compute_throttled_backoff(attempt))
+
+    @classmethod
+    def __compute_throttled_backoff(cls, attempt):
+        # Full jitter, so the Entries throttled together are not retried
+        # in waves.
+        max_backoff_seconds = min(
+            cls.__THROTTLED_MAX_BACKOFF_SECONDS,
+            cls.__THROTTLED_INITIAL_BACKOFF_SECONDS * 2**(attempt - 1))
+        return random.uniform(0, max_backoff_seconds)
+
+    def __ingest_entry(self, entry_group_name, assembled_entry_data, config):
+        entry_id = assembled_entry_data.entry_id
+        new_entry = assembled_entry_data.entry
+
+        entry_name = '{}/entries/{}'.format(entry_group_name, entry_id)
+        fingerprint = None
+        if self.__state_store or self.__checkpoint:
+            # Computed before the upsert, which may fill in default values.
+            fingerprint = state.IngestionStateStore.compute_fingerprint(
+                new_entry, assembled_entry_data.tags)
+
+        if self.__checkpoint and \
+                self.__checkpoint.is_completed(entry_name, fingerprint):
+            logging.info(
+                'Entry skipped, completed before the interruption: %s',
+                entry_name)
+            return
+
+        if self.__state_store and \
+                self.__state_store.is_up_to_date(entry_name, fingerprint) \
+                and not self.__is_prefetched_entry_missing(entry_name, config):
+            logging.info('Entry skipped, unchanged since the last run: %s',
+                         entry_name)
+            return
+
+        upsert_entry_kwargs = {}
+        if config and 'upsert_entry_strategy' in config:
+            upsert_entry_kwargs['strategy'] = config['upsert_entry_strategy']
 
+        tag_writes_kwargs = {}
+        if config and 'tag_writes_max_workers' in config:
+            tag_writes_kwargs['max_workers'] = config['tag_writes_max_workers']
+
+        written = False
+        try:
+            entry = self.__call_on_entry_group(
+                entry_group_name, self.__datacatalog_facade.upsert_entry,
+                entry_group_name, entry_id, new_entry, **upsert_entry_kwargs)
+
+            if config and 'delete_tags' in config:
+                delete_tags = config['delete_tags']
+                logging.info('')
+                logging.info('Starting the reconcile tags step')
+                # If not specified uses the entry group id to find
+                # what tag templates should have their tags deleted.
+                managed_tag_template = delete_tags.get('managed_tag_template')
+                if not managed_tag_template:
+                    managed_tag_template = self.__entry_group_id
+
+                tag_writes_result = self.__call_on_tag_templates(
+                    self.__datacatalog_facade.reconcile_tags, entry,
+                    assembled_entry_data.tags, managed_tag_template,
+                    **tag_writes_kwargs)
+            else:
                 logging.info('')
                 logging.info('Starting the upsert tags step')
-                self.__datacatalog_facade.upsert_tags(
-                    entry, assembled_entry_data.tags)
-                if config and 'delete_tags' in config:
-                    delete_tags = config['delete_tags']
-                    logging.info('')
-                    logging.info('Starting the delete tags step')
-                    # If not specified uses the entry group id to find
-                    # what tag templates should have their tags deleted.
-                    managed_tag_template = delete_tags.get(
-                        'managed_tag_template')
-                    if not managed_tag_template:
-                        managed_tag_template = self.__entry_group_id
-
-                    self.__datacatalog_facade.delete_tags(
-                        entry, assembled_entry_data.tags, managed_tag_template)
-            except (exceptions.FailedPrecondition,
-                    exceptions.PermissionDenied):
-                logging.warning('Entry ignored, error on upsert_entry:',
-                                exc_info=True)
+                tag_writes_result = self.__call_on_tag_templates(
+                    self.__datacatalog_facade.upsert_tags, entry,
+                    assembled_entry_data.tags, **tag_writes_kwargs)
+
+            if not tag_writes_result.succeeded:
+                self.__raise_throttled_tag_write_failure(tag_writes_result)
+                logging.warning('%s Tag writes failed for Entry: %s',
+                                len(tag_writes_result.failures), entry_name)
+                return
+
+            written = True
+            if self.__state_store:
+                self.__state_store.save(entry_name, fingerprint)
+            if self.__checkpoint:
+                self.__checkpoint.record(entry_name, fingerprint)
+        except (exceptions.FailedPrecondition, exceptions.PermissionDenied):
+            logging.warning('Entry ignored, error on upsert_entry:',
+                            exc_info=True)
+        finally:
+            # A fingerprint stored by a previous run is no longer trusted
+            # once the Entry was found outdated or missing.
+            if not written and self.__state_store:
+                self.__state_store.delete(entry_name)
+
+    @classmethod
+    def __raise_throttled_tag_write_failure(cls, tag_writes_result):
+        # Raised as if the Tags were written one at a time, so the adaptive
+        # concurrency control backs off and tries the Entry again.
+        for failure in tag_writes_result.failures:
+            if isinstance(failure.error, cls.__THROTTLING_ERRORS):
+                raise failure.error
+
+    def __is_prefetched_entry_missing(self, entry_name, config):
+        # The prefetched Entries reveal, at no extra cost, the Entries
+        # deleted by other clients since their fingerprint was stored.
+        if not (config and config.get('prefetch_entries')):
+            return False
+        prefetched_entry = self.__datacatalog_facade.get_prefetched_entry(
+            entry_name)
+        return prefetched_entry is None
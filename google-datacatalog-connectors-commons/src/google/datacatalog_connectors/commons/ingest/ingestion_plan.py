@@ -0,0 +1,164 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import json
+
+from google.cloud import datacatalog
+from google.protobuf import json_format
+
+
+class IngestionPlan:
+    """The Data Catalog writes needed to ingest metadata, computed upfront
+    by an IngestionPlanner so they can be reviewed before being applied.
+
+    Each operation is sent as a single request when the plan is applied,
+    which gives the plan's estimated RPC cost.
+    """
+
+    CREATE_ENTRY = 'create_entry'
+    UPDATE_ENTRY = 'update_entry'
+    DELETE_ENTRY = 'delete_entry'
+    CREATE_TAG = 'create_tag'
+    UPDATE_TAG = 'update_tag'
+    DELETE_TAG = 'delete_tag'
+
+    OPERATIONS = (CREATE_ENTRY, UPDATE_ENTRY, DELETE_ENTRY, CREATE_TAG,
+                  UPDATE_TAG, DELETE_TAG)
+
+    def __init__(self, operations=None, unchanged_entries_count=0):
+        self.__operations = list(operations or [])
+        self.__unchanged_entries_count = unchanged_entries_count
+
+    def __iter__(self):
+        return iter(self.__operations)
+
+    def __len__(self):
+        return len(self.__operations)
+
+    @property
+    def unchanged_entries_count(self):
+        return self.__unchanged_entries_count
+
+    def add_operation(self,
+                      operation,
+                      entry_name,
+                      entry_id=None,
+                      entry=None,
+                      tag=None,
+                      update_mask=None):
+        """Adds an operation to the plan.
+
+        :param operation: One of the IngestionPlan.OPERATIONS.
+        :param entry_name: The name of the Entry written, or of the Entry
+            the Tag belongs to.
+        :param entry_id: The id of the Entry to be created.
+        :param entry: The Entry object to be created or updated.
+        :param tag: The Tag object to be created, updated or deleted.
+        :param update_mask: A list of the field paths to update.
+        """
+        if operation not in self.OPERATIONS:
+            raise ValueError('Unknown operation: {}'.format(operation))
+
+        planned_operation = {'operation': operation, 'entry_name': entry_name}
+        if entry_id:
+            planned_operation['entry_id'] = entry_id
+        if entry is not None:
+            planned_operation['entry'] = self.__message_to_dict(entry)
+        if tag is not None:
+            planned_operation['tag'] = self.__message_to_dict(tag)
+        if update_mask:
+            planned_operation['update_mask'] = list(update_mask)
+
+        self.__operations.append(planned_operation)
+
+    def add_unchanged_entry(self):
+        self.__unchanged_entries_count += 1
+
+    @classmethod
+    def get_entry(cls, planned_operation):
+        """Reads the Entry of a planned operation.
+
+        :param planned_operation: An operation dict, as iterated from a plan.
+        :return: An Entry object.
+        """
+        return cls.__message_from_dict(datacatalog.Entry,
+                                       planned_operation['entry'])
+
+    @classmethod
+    def get_tag(cls, planned_operation):
+        """Reads the Tag of a planned operation.
+
+        :param planned_operation: An operation dict, as iterated from a plan.
+        :return: A Tag object.
+        """
+        return cls.__message_from_dict(datacatalog.Tag,
+                                       planned_operation['tag'])
+
+    def counts(self):
+        """Counts the planned operations.
+
+        :return: A dict with the count of each operation and of the Entries
+            that do not need any write.
+        """
+        counts = collections.OrderedDict(
+            (operation, 0) for operation in self.OPERATIONS)
+        for planned_operation in self.__operations:
+            counts[planned_operation['operation']] += 1
+        counts['unchanged_entries'] = self.__unchanged_entries_count
+        return counts
+
+    def estimated_rpc_cost(self):
+        """Estimates the number of requests sent to apply the plan.
+
+        :return: The number of write requests, no reads being needed.
+        """
+        return len(self.__operations)
+
+    def to_json(self):
+        """Serializes the plan.
+
+        :return: A JSON string with the counts, the estimated RPC cost and
+            the operations.
+        """
+        return json.dumps(
+            {
+                'counts': self.counts(),
+                'estimated_rpc_cost': self.estimated_rpc_cost(),
+                'operations': self.__operations
+            },
+            indent=2)
+
+    @classmethod
+    def from_json(cls, plan_json):
+        """Reads a plan serialized by to_json.
+
+        :param plan_json: A JSON string.
+        :return: An IngestionPlan object.
+        """
+        plan_dict = json.loads(plan_json)
+        return cls(plan_dict['operations'],
+                   plan_dict['counts'].get('unchanged_entries', 0))
+
+    @classmethod
+    def __message_to_dict(cls, message):
+        return json_format.MessageToDict(type(message).pb(message))
+
+    @classmethod
+    def __message_from_dict(cls, message_class, message_dict):
+        message = message_class()
+        json_format.ParseDict(message_dict, message_class.pb(message))
+        return message
@@ -0,0 +1,169 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from google.datacatalog_connectors.commons import datacatalog_facade
+from google.datacatalog_connectors.commons import state
+from google.datacatalog_connectors.commons import tag_writes_result
+from google.datacatalog_connectors.commons import utils
+from google.datacatalog_connectors.commons.ingest import ingestion_plan
+
+from google.cloud import datacatalog
+
+
+class IngestionPlanner:
+    """Computes the writes an ingestion run would send to Data Catalog,
+    comparing the assembled entries with a snapshot of the persisted
+    metadata instead of reading it entry by entry.
+
+    The comparison is the one used by DataCatalogFacade.upsert_entry,
+    upsert_tags and reconcile_tags, so applying the plan leaves the catalog
+    as an ingestion run would.
+    """
+
+    __TAG_OPERATIONS = {
+        tag_writes_result.TagWritesResult.CREATE:
+            ingestion_plan.IngestionPlan.CREATE_TAG,
+        tag_writes_result.TagWritesResult.UPDATE:
+            ingestion_plan.IngestionPlan.UPDATE_TAG,
+        tag_writes_result.TagWritesResult.DELETE:
+            ingestion_plan.IngestionPlan.DELETE_TAG,
+    }
+
+    def __init__(self,
+                 project_id,
+                 location_id,
+                 entry_group_id,
+                 client_provider=None):
+        """
+        :param client_provider: A DataCatalogClientProvider shared with
+            ingestors and cleaners. A new client is created if not set.
+        """
+        self.__datacatalog_facade = datacatalog_facade.DataCatalogFacade(
+            project_id, client_provider=client_provider)
+        self.__entry_group_name = \
+            datacatalog.DataCatalogClient.entry_group_path(
+                project_id, location_id, entry_group_id)
+        self.__entry_group_id = entry_group_id
+
+    def capture_snapshot(self):
+        """Reads the Entries of the Entry Group, and their Tags.
+
+        :return: A state.CatalogSnapshot object.
+        """
+        snapshot = state.CatalogSnapshot()
+        for entry in self.__datacatalog_facade.list_entries(
+                self.__entry_group_name):
+            tags = self.__datacatalog_facade.list_tags(entry.name)
+            snapshot.add(entry, [tag for tag in tags])
+
+        logging.info('%s Entries captured from: %s', len(snapshot),
+                     self.__entry_group_name)
+        return snapshot
+
+    def plan(self, assembled_entries_data, snapshot, config=None):
+        """Computes the writes needed to ingest metadata.
+
+        :param assembled_entries_data: type
+            datacatalog_connectors_commons/ingest/assembled_entry_data.py
+        :param snapshot: A state.CatalogSnapshot of the Entry Group, or a
+            state.CatalogSnapshotReader of a file exported from it.
+        :param config: dict with planning config, supported keys:
+            - delete_tags: dict, plans the deletion of the managed Tags that
+              are not present in the assembled entries, as
+              DataCatalogMetadataIngestor.ingest_metadata does.
+            - delete_obsolete_entries: bool, plans the deletion of the
+              Entries of the snapshot that are not present in the assembled
+              entries, as DataCatalogMetadataCleaner does.
+        :return: An IngestionPlan object.
+        """
+        plan = ingestion_plan.IngestionPlan()
+
+        managed_tag_template = None
+        if config and 'delete_tags' in config:
+            # If not specified uses the entry group id to find
+            # what tag templates should have their tags deleted.
+            managed_tag_template = config['delete_tags'].get(
+                'managed_tag_template') or self.__entry_group_id
+
+        entries_name = set()
+        for assembled_entry_data in assembled_entries_data:
+            entry_name = '{}/entries/{}'.format(self.__entry_group_name,
+                                                assembled_entry_data.entry_id)
+            entries_name.add(entry_name)
+            self.__plan_entry(plan, entry_name, assembled_entry_data, snapshot,
+                              managed_tag_template)
+
+        if config and config.get('delete_obsolete_entries'):
+            for entry_name in snapshot:
+                if entry_name not in entries_name:
+                    plan.add_operation(plan.DELETE_ENTRY, entry_name)
+
+        logging.info('Ingestion plan: %s', dict(plan.counts()))
+        return plan
+
+    def __plan_entry(self, plan, entry_name, assembled_entry_data, snapshot,
+                     managed_tag_template):
+        entry = assembled_entry_data.entry
+        tags = assembled_entry_data.tags
+
+        changed_fields = []
+        persisted_entry = snapshot.get_entry(entry_name)
+        if persisted_entry is None:
+            plan.add_operation(plan.CREATE_ENTRY,
+                               entry_name,
+                               entry_id=assembled_entry_data.entry_id,
+                               entry=entry)
+        else:
+            changed_fields = utils.DataCatalogComparisonHelper\
+                .get_entry_changed_fields(persisted_entry, entry)
+            if changed_fields:
+                entry_update = datacatalog_facade.DataCatalogFacade\
+                    .build_entry_update(entry_name, entry, changed_fields)
+                plan.add_operation(plan.UPDATE_ENTRY,
+                                   entry_name,
+                                   entry=entry_update,
+                                   update_mask=changed_fields)
+
+        persisted_tags = snapshot.get_tags(entry_name)
+        tag_writes = []
+        if managed_tag_template:
+            tag_writes.extend(
+                datacatalog_facade.DataCatalogFacade.plan_tag_upserts(
+                    tags, persisted_tags))
+            tag_writes.extend(
+                datacatalog_facade.DataCatalogFacade.plan_tag_deletions(
+                    tags, persisted_tags, managed_tag_template))
+        elif tags:
+            tag_writes.extend(
+                datacatalog_facade.DataCatalogFacade.plan_tag_upserts(
+                    tags, persisted_tags))
+
+        for tag_operation, tag in tag_writes:
+            operation = self.__TAG_OPERATIONS[tag_operation]
+            update_mask = None
+            if operation == plan.UPDATE_TAG:
+                update_mask = datacatalog_facade.DataCatalogFacade\
+                    .TAG_UPDATE_MASK
+            plan.add_operation(operation,
+                               entry_name,
+                               tag=tag,
+                               update_mask=update_mask)
+
+        if persisted_entry is not None and not changed_fields \
+                and not tag_writes:
+            plan.add_unchanged_entry()
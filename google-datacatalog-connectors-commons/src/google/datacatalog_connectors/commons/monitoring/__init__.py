@@ -14,7 +14,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .metrics_processor import MetricsProcessor
-from .monitoring_facade import MonitoringFacade
+import importlib
+import sys
+
+# monitoring_v3 is only imported when monitoring is used (PEP 562).
+_LAZY_ATTRIBUTES = {
+    'MetricsProcessor': 'metrics_processor',
+    'MonitoringFacade': 'monitoring_facade',
+}
 
 __all__ = ('MonitoringFacade', 'MetricsProcessor')
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module('{}.{}'.format(
+            __name__, _LAZY_ATTRIBUTES[name]))
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(
+        __name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+# Module __getattr__ requires Python 3.7, older versions import eagerly.
+if sys.version_info < (3, 7):
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
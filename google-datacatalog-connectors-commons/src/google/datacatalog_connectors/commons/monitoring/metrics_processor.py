@@ -17,9 +17,6 @@
 import json
 import timeit
 
-from google.datacatalog_connectors.commons.monitoring import \
-    monitoring_facade
-
 
 class MetricsProcessor:
 
@@ -31,6 +28,10 @@ class MetricsProcessor:
                  task_id=None):
         self.__enable_monitoring = enable_monitoring
         if enable_monitoring:
+            # Imported here so monitoring_v3 is not loaded when monitoring
+            # is disabled.
+            from google.datacatalog_connectors.commons.monitoring import \
+                monitoring_facade
             self.__monitoring_facade = monitoring_facade.MonitoringFacade(
                 project_id, location_id, entry_group_id, task_id)
             self.__monitoring_facade.create_metrics()
@@ -56,3 +57,15 @@ class MetricsProcessor:
             json_bytes = len(metadata_as_json.encode())
             self.__monitoring_facade.write_metadata_payload_bytes_metric(
                 json_bytes)
+
+    def process_concurrency_metrics(self, concurrency_stats):
+        if self.__enable_monitoring and concurrency_stats:
+            self.__monitoring_facade.write_concurrency_window_metric(
+                concurrency_stats['window'])
+            self.__monitoring_facade.write_entries_throughput_metric(
+                concurrency_stats['throughput'])
+
+    def process_retry_metrics(self, retry_stats):
+        if self.__enable_monitoring and retry_stats:
+            self.__monitoring_facade.write_retry_count_metric(
+                retry_stats['retry_count'])
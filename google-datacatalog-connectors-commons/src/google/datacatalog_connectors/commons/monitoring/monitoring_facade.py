@@ -28,6 +28,9 @@ class MonitoringFacade:
     ELAPSED_TIME = 'elapsed_time'
     ENTRIES_LENGTH = 'entries_length'
     METADATA_PAYLOAD_BYTES = 'metadata_payload_bytes'
+    CONCURRENCY_WINDOW = 'concurrency_window'
+    ENTRIES_THROUGHPUT = 'entries_throughput'
+    RETRY_COUNT = 'retry_count'
 
     def __init__(self,
                  project_id,
@@ -130,6 +133,15 @@ class MonitoringFacade:
     def write_elapsed_time_metric(self, value):
         self.__write_metric(self.ELAPSED_TIME, value)
 
+    def write_concurrency_window_metric(self, value):
+        self.__write_metric(self.CONCURRENCY_WINDOW, value)
+
+    def write_entries_throughput_metric(self, value):
+        self.__write_metric(self.ENTRIES_THROUGHPUT, value)
+
+    def write_retry_count_metric(self, value):
+        self.__write_metric(self.RETRY_COUNT, value)
+
     def __create_metric_descriptor(self, metric_name):
         project_name = self.__monitoring_client.project_path(self.__project_id)
         descriptor = monitoring_v3.types.MetricDescriptor()
@@ -165,6 +177,9 @@ class MonitoringFacade:
         metadata_payload_bytes = self.METADATA_PAYLOAD_BYTES
         entries_length = self.ENTRIES_LENGTH
         elapsed_time = self.ELAPSED_TIME
+        concurrency_window = self.CONCURRENCY_WINDOW
+        entries_throughput = self.ENTRIES_THROUGHPUT
+        retry_count = self.RETRY_COUNT
         return {
             metadata_payload_bytes: {
                 'type': self.__build_metric_type(metadata_payload_bytes)
@@ -174,6 +189,15 @@ class MonitoringFacade:
             },
             elapsed_time: {
                 'type': self.__build_metric_type(elapsed_time)
+            },
+            concurrency_window: {
+                'type': self.__build_metric_type(concurrency_window)
+            },
+            entries_throughput: {
+                'type': self.__build_metric_type(entries_throughput)
+            },
+            retry_count: {
+                'type': self.__build_metric_type(retry_count)
             }
         }
 
@@ -0,0 +1,28 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .catalog_snapshot import CatalogSnapshot
+from .catalog_snapshot_exporter import CatalogSnapshotExporter
+from .catalog_snapshot_file import CatalogSnapshotReader
+from .catalog_snapshot_file import CatalogSnapshotWriter
+from .ingestion_checkpoint import IngestionCheckpoint
+from .ingestion_state_store import IngestionStateStore
+from .known_resources_registry import KnownResourcesRegistry
+
+__all__ = ('CatalogSnapshot', 'CatalogSnapshotExporter',
+           'CatalogSnapshotReader', 'CatalogSnapshotWriter',
+           'IngestionCheckpoint', 'IngestionStateStore',
+           'KnownResourcesRegistry')
@@ -0,0 +1,59 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class CatalogSnapshot:
+    """An in-memory copy of the Entries and Tags persisted in Data Catalog,
+    used to compare metadata without sending requests to the API.
+    """
+
+    def __init__(self):
+        self.__entries = {}
+        self.__tags = {}
+
+    def __contains__(self, entry_name):
+        return entry_name in self.__entries
+
+    def __iter__(self):
+        return iter(self.__entries)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def add(self, entry, tags=None):
+        """Adds an Entry and its Tags, replacing them if already present.
+
+        :param entry: An Entry object.
+        :param tags: A list of the Entry's Tag objects.
+        """
+        self.__entries[entry.name] = entry
+        self.__tags[entry.name] = list(tags or [])
+
+    def get_entry(self, entry_name):
+        """Gets an Entry.
+
+        :param entry_name: The Entry name.
+        :return: The Entry object, or None if not present.
+        """
+        return self.__entries.get(entry_name)
+
+    def get_tags(self, entry_name):
+        """Gets the Tags of an Entry.
+
+        :param entry_name: The Entry name.
+        :return: A list of Tag objects, empty if the Entry is not present.
+        """
+        return self.__tags.get(entry_name, [])
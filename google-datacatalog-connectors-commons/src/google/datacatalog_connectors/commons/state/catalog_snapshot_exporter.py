@@ -0,0 +1,51 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+
+from google.datacatalog_connectors.commons.state import catalog_snapshot_file
+
+
+class CatalogSnapshotExporter:
+    """Exports the Entries of an Entry Group and their Tags to a snapshot
+    file, which can be read with CatalogSnapshotReader.
+    """
+
+    def __init__(self, datacatalog_facade):
+        """
+        :param datacatalog_facade: The DataCatalogFacade used to read the
+            Entries and Tags.
+        """
+        self.__datacatalog_facade = datacatalog_facade
+
+    def export(self, entry_group_name, path):
+        """Pages the Entries of an Entry Group and their Tags, writing them
+        to the file as they are read.
+
+        :param entry_group_name: The Entry Group name.
+        :param path: The snapshot file path, overwritten if it exists.
+        :return: The number of exported Entries.
+        """
+        with catalog_snapshot_file.CatalogSnapshotWriter(path) as writer:
+            for entry in self.__datacatalog_facade.list_entries(
+                    entry_group_name):
+                writer.add(entry,
+                           self.__datacatalog_facade.list_tags(entry.name))
+            exported_entries_count = len(writer)
+
+        logging.info('%s Entries exported from %s to: %s',
+                     exported_entries_count, entry_group_name, path)
+        return exported_entries_count
@@ -0,0 +1,221 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mmap
+import os
+import struct
+
+from google.cloud import datacatalog
+
+# The file starts and ends with the magic bytes. The records come after the
+# header, each one holding an Entry and its Tags as length-delimited
+# serialized protobufs, and are followed by the index, which maps the Entry
+# names to their record offsets. The index offset is stored right before the
+# trailing magic bytes.
+_MAGIC = b'DCSNAP01'
+_OFFSET_FORMAT = '<Q'
+_FOOTER_SIZE = struct.calcsize(_OFFSET_FORMAT) + len(_MAGIC)
+
+
+class CatalogSnapshotWriter:
+    """Writes Entries and their Tags to a snapshot file, one at a time, so
+    the snapshot size is not limited by the available memory.
+
+    The file is written to a temporary path and only renamed to the
+    snapshot path once closed, so an interrupted export leaves neither a
+    truncated snapshot nor one that looks complete.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: The snapshot file path, overwritten if it exists.
+        """
+        self.__path = path
+        self.__temp_path = '{}.tmp'.format(path)
+        self.__file = open(self.__temp_path, 'wb')
+        self.__file.write(_MAGIC)
+        self.__offsets = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
+
+    def __len__(self):
+        return len(self.__offsets)
+
+    def add(self, entry, tags=None):
+        """Writes an Entry and its Tags.
+
+        :param entry: An Entry object.
+        :param tags: A list of the Entry's Tag objects.
+        """
+        tags = list(tags or [])
+        self.__offsets[entry.name] = self.__file.tell()
+
+        self.__write_message(datacatalog.Entry.pb(entry).SerializeToString())
+        self.__file.write(self.__encode_varint(len(tags)))
+        for tag in tags:
+            self.__write_message(datacatalog.Tag.pb(tag).SerializeToString())
+
+    def close(self):
+        """Writes the index, closes the file and moves it to the snapshot
+        path."""
+        if self.__file.closed:
+            return
+
+        index_offset = self.__file.tell()
+        self.__file.write(self.__encode_varint(len(self.__offsets)))
+        for entry_name, offset in self.__offsets.items():
+            self.__write_message(entry_name.encode('utf-8'))
+            self.__file.write(self.__encode_varint(offset))
+
+        self.__file.write(struct.pack(_OFFSET_FORMAT, index_offset))
+        self.__file.write(_MAGIC)
+        self.__file.close()
+        os.replace(self.__temp_path, self.__path)
+
+    def abort(self):
+        """Closes and deletes the file, without writing the index."""
+        if self.__file.closed:
+            return
+
+        self.__file.close()
+        os.remove(self.__temp_path)
+
+    def __write_message(self, message_bytes):
+        self.__file.write(self.__encode_varint(len(message_bytes)))
+        self.__file.write(message_bytes)
+
+    @classmethod
+    def __encode_varint(cls, value):
+        encoded = bytearray()
+        while value > 0x7f:
+            encoded.append((value & 0x7f) | 0x80)
+            value >>= 7
+        encoded.append(value)
+        return bytes(encoded)
+
+
+class CatalogSnapshotReader:
+    """Reads a snapshot file written by CatalogSnapshotWriter.
+
+    The file is memory-mapped and only its index is loaded, so Entries are
+    read on demand by name. It supports the read methods of CatalogSnapshot,
+    and can be used in its place.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: The snapshot file path.
+        :raises ValueError: If the file is not a snapshot file.
+        """
+        with open(path, 'rb') as snapshot_file:
+            self.__buffer = mmap.mmap(snapshot_file.fileno(),
+                                      0,
+                                      access=mmap.ACCESS_READ)
+
+        if len(self.__buffer) < len(_MAGIC) + _FOOTER_SIZE \
+                or self.__buffer[:len(_MAGIC)] != _MAGIC \
+                or self.__buffer[-len(_MAGIC):] != _MAGIC:
+            self.__buffer.close()
+            raise ValueError('Not a snapshot file: {}'.format(path))
+
+        self.__offsets = self.__read_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, entry_name):
+        return entry_name in self.__offsets
+
+    def __iter__(self):
+        return iter(self.__offsets)
+
+    def __len__(self):
+        return len(self.__offsets)
+
+    def get_entry(self, entry_name):
+        """Gets an Entry.
+
+        :param entry_name: The Entry name.
+        :return: The Entry object, or None if not present.
+        """
+        offset = self.__offsets.get(entry_name)
+        if offset is None:
+            return None
+
+        entry_bytes, _ = self.__read_message(offset)
+        return datacatalog.Entry.deserialize(entry_bytes)
+
+    def get_tags(self, entry_name):
+        """Gets the Tags of an Entry.
+
+        :param entry_name: The Entry name.
+        :return: A list of Tag objects, empty if the Entry is not present.
+        """
+        offset = self.__offsets.get(entry_name)
+        if offset is None:
+            return []
+
+        # Skips the Entry, which comes before its Tags.
+        _, offset = self.__read_message(offset)
+        tags_count, offset = self.__decode_varint(offset)
+
+        tags = []
+        for _ in range(tags_count):
+            tag_bytes, offset = self.__read_message(offset)
+            tags.append(datacatalog.Tag.deserialize(tag_bytes))
+        return tags
+
+    def close(self):
+        """Unmaps the file."""
+        self.__buffer.close()
+
+    def __read_index(self):
+        index_offset, = struct.unpack_from(_OFFSET_FORMAT, self.__buffer,
+                                           len(self.__buffer) - _FOOTER_SIZE)
+
+        entries_count, offset = self.__decode_varint(index_offset)
+        offsets = {}
+        for _ in range(entries_count):
+            entry_name_bytes, offset = self.__read_message(offset)
+            offsets[entry_name_bytes.decode('utf-8')], offset = \
+                self.__decode_varint(offset)
+        return offsets
+
+    def __read_message(self, offset):
+        message_size, offset = self.__decode_varint(offset)
+        end = offset + message_size
+        return self.__buffer[offset:end], end
+
+    def __decode_varint(self, offset):
+        value = 0
+        shift = 0
+        while True:
+            byte = self.__buffer[offset]
+            offset += 1
+            value |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return value, offset
+            shift += 7
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import threading
+
+
+class IngestionCheckpoint:
+    """Records the Entries written by an ingestion run, so an interrupted
+    run can be resumed without processing them again.
+
+    The file is append-only: each line is a JSON object with a batch of
+    Entry names and the fingerprints of the Entries and Tags written, so a
+    new batch costs a single write. A line left incomplete by a crash is
+    discarded when the checkpoint is resumed.
+    """
+
+    def __init__(self, path, resume=False, batch_size=100):
+        """
+        :param path: The checkpoint file path.
+        :param resume: Loads the Entries recorded by a previous run. The
+            file is truncated if not set.
+        :param batch_size: How many Entries are written per line.
+        """
+        self.__path = path
+        self.__batch_size = batch_size
+        if resume:
+            self.__truncate_incomplete_line(path)
+        self.__completed_entries = self.__load(path) if resume else {}
+        self.__pending_entries = {}
+        self.__lock = threading.Lock()
+        self.__file = open(path, 'a' if resume else 'w')
+
+        if resume:
+            logging.info('%s completed Entries loaded from checkpoint: %s',
+                         len(self.__completed_entries), path)
+
+    @classmethod
+    def __truncate_incomplete_line(cls, path):
+        # New lines would be appended to the incomplete one otherwise, and
+        # both would be lost on the next resume.
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'rb+') as checkpoint_file:
+            content = checkpoint_file.read()
+            complete_lines_length = content.rfind(b'\n') + 1
+            if complete_lines_length < len(content):
+                logging.warning('Incomplete checkpoint line discarded')
+                checkpoint_file.truncate(complete_lines_length)
+
+    @classmethod
+    def __load(cls, path):
+        completed_entries = {}
+        if not os.path.exists(path):
+            return completed_entries
+
+        with open(path) as checkpoint_file:
+            for line in checkpoint_file:
+                try:
+                    completed_entries.update(json.loads(line)['entries'])
+                except (ValueError, KeyError):
+                    logging.warning('Incomplete checkpoint line ignored')
+        return completed_entries
+
+    def is_completed(self, entry_name, fingerprint):
+        """Checks whether an Entry was written with the given fingerprint
+        before the run was interrupted.
+
+        :param entry_name: The Entry name.
+        :param fingerprint: The fingerprint of the Entry and its Tags.
+        :return: True if the Entry can be skipped.
+        """
+        return self.__completed_entries.get(entry_name) == fingerprint
+
+    def record(self, entry_name, fingerprint):
+        """Records an Entry and its Tags as written.
+
+        :param entry_name: The Entry name.
+        :param fingerprint: The fingerprint of the Entry and its Tags.
+        """
+        with self.__lock:
+            self.__pending_entries[entry_name] = fingerprint
+            if len(self.__pending_entries) >= self.__batch_size:
+                self.__flush()
+
+    def close(self):
+        """Writes the pending Entries and closes the file."""
+        with self.__lock:
+            self.__flush()
+            self.__file.close()
+
+    def complete(self):
+        """Closes and deletes the checkpoint, once the run is finished."""
+        self.close()
+        os.remove(self.__path)
+
+    def __flush(self):
+        if not self.__pending_entries:
+            return
+
+        self.__file.write(
+            json.dumps({'entries': self.__pending_entries}) + '\n')
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+        logging.debug('%s Entries written to checkpoint',
+                      len(self.__pending_entries))
+        self.__pending_entries = {}
@@ -0,0 +1,189 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+from google.cloud import datacatalog
+
+
+class IngestionStateStore:
+    """Keeps track of the metadata successfully written to Data Catalog.
+
+    Stores a fingerprint of each Entry and its Tags in a local SQLite
+    database, so the ingestion flow can skip the Entries that did not change
+    since the last run without sending any request to Data Catalog.
+
+    The names of the Entry Groups and Tag Templates known to exist are
+    stored as well, so they are not created again on the next runs.
+
+    Changes made to the catalog by other clients are not detected, so the
+    Entries and resources are verified against Data Catalog again once they
+    are older than full_verification_interval_hours.
+    """
+
+    # Pending writes are committed in batches to avoid one fsync per Entry.
+    __COMMIT_BATCH_SIZE = 100
+
+    def __init__(self, path, full_verification_interval_hours=None):
+        """
+        :param path: The SQLite database file path.
+        :param full_verification_interval_hours: How long a fingerprint is
+            trusted. Fingerprints never expire if not set, and are never
+            trusted if set to 0.
+        """
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS entries ('
+                                  'name TEXT PRIMARY KEY, '
+                                  'fingerprint TEXT NOT NULL, '
+                                  'verified_at REAL NOT NULL)')
+        self.__connection.execute('CREATE TABLE IF NOT EXISTS resources ('
+                                  'name TEXT PRIMARY KEY, '
+                                  'verified_at REAL NOT NULL)')
+        self.__connection.commit()
+
+        self.__max_age_seconds = None
+        if full_verification_interval_hours is not None:
+            self.__max_age_seconds = full_verification_interval_hours * 3600
+
+        self.__lock = threading.Lock()
+        self.__pending_writes_count = 0
+
+    @classmethod
+    def compute_fingerprint(cls, entry, tags=None):
+        """Computes a stable hash of an Entry and its Tags.
+
+        :param entry: An Entry object.
+        :param tags: A list of Tag objects.
+        :return: The fingerprint as an hexadecimal string.
+        """
+        fingerprint = hashlib.sha256()
+        fingerprint.update(
+            datacatalog.Entry.pb(entry).SerializeToString(deterministic=True))
+
+        # The Tags order does not matter when they are ingested.
+        tags_bytes = sorted(
+            datacatalog.Tag.pb(tag).SerializeToString(deterministic=True)
+            for tag in tags or [])
+        for tag_bytes in tags_bytes:
+            fingerprint.update(tag_bytes)
+
+        return fingerprint.hexdigest()
+
+    def is_up_to_date(self, entry_name, fingerprint):
+        """Checks whether an Entry was successfully written with the given
+        fingerprint and does not need to be verified again.
+
+        :param entry_name: The Entry name.
+        :param fingerprint: The Entry fingerprint.
+        :return: True if the Entry can be skipped.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT fingerprint, verified_at FROM entries WHERE name = ?',
+                (entry_name,)).fetchone()
+
+        if not row:
+            return False
+
+        stored_fingerprint, verified_at = row
+        if stored_fingerprint != fingerprint:
+            return False
+
+        return self.__is_recent(verified_at)
+
+    def is_resource_known(self, name):
+        """Checks whether a resource, such as an Entry Group or a Tag
+        Template, was recently known to exist.
+
+        :param name: The resource name.
+        :return: True if the resource does not need to be created.
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                'SELECT verified_at FROM resources WHERE name = ?',
+                (name,)).fetchone()
+
+        return bool(row) and self.__is_recent(row[0])
+
+    def save_resource(self, name):
+        """Records a resource as existing.
+
+        :param name: The resource name.
+        """
+        with self.__lock:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO resources (name, verified_at)'
+                ' VALUES (?, ?)', (name, time.time()))
+            self.__commit()
+
+    def delete_resource(self, name):
+        """Forgets a resource, so it is created again if needed.
+
+        :param name: The resource name.
+        """
+        with self.__lock:
+            self.__connection.execute('DELETE FROM resources WHERE name = ?',
+                                      (name,))
+            self.__commit()
+
+    def __is_recent(self, verified_at):
+        if self.__max_age_seconds is None:
+            return True
+
+        return time.time() - verified_at < self.__max_age_seconds
+
+    def save(self, entry_name, fingerprint):
+        """Records an Entry as successfully written.
+
+        :param entry_name: The Entry name.
+        :param fingerprint: The Entry fingerprint.
+        """
+        with self.__lock:
+            self.__connection.execute(
+                'INSERT OR REPLACE INTO entries'
+                ' (name, fingerprint, verified_at) VALUES (?, ?, ?)',
+                (entry_name, fingerprint, time.time()))
+            self.__pending_writes_count += 1
+            if self.__pending_writes_count >= self.__COMMIT_BATCH_SIZE:
+                self.__commit()
+
+    def delete(self, entry_name):
+        """Forgets an Entry, so it is verified on the next run.
+
+        :param entry_name: The Entry name.
+        """
+        with self.__lock:
+            self.__connection.execute('DELETE FROM entries WHERE name = ?',
+                                      (entry_name,))
+            self.__pending_writes_count += 1
+            if self.__pending_writes_count >= self.__COMMIT_BATCH_SIZE:
+                self.__commit()
+
+    def close(self):
+        """Commits the pending writes and closes the database."""
+        with self.__lock:
+            self.__commit()
+            self.__connection.close()
+
+    def __commit(self):
+        self.__connection.commit()
+        logging.debug('%s ingestion state changes committed',
+                      self.__pending_writes_count)
+        self.__pending_writes_count = 0
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+
+class KnownResourcesRegistry:
+    """Keeps the names of the Data Catalog resources known to exist, such
+    as Entry Groups and Tag Templates, so they are not created again.
+
+    The shared registry is used by all the ingestors of a process, which
+    usually write to the same Entry Groups.
+    """
+
+    __shared_registry = None
+    __shared_registry_lock = threading.Lock()
+
+    def __init__(self):
+        self.__names = set()
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Gets the registry shared by the whole process.
+
+        :return: A KnownResourcesRegistry object.
+        """
+        with cls.__shared_registry_lock:
+            if cls.__shared_registry is None:
+                cls.__shared_registry = cls()
+            return cls.__shared_registry
+
+    def __contains__(self, name):
+        with self.__lock:
+            return name in self.__names
+
+    def add(self, name):
+        """Records a resource as existing.
+
+        :param name: The resource name.
+        """
+        with self.__lock:
+            self.__names.add(name)
+
+    def discard(self, name):
+        """Forgets a resource, usually because it was deleted.
+
+        :param name: The resource name.
+        """
+        with self.__lock:
+            self.__names.discard(name)
+
+    def clear(self):
+        """Forgets all the resources."""
+        with self.__lock:
+            self.__names.clear()
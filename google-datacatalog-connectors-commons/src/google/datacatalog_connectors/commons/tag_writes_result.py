@@ -0,0 +1,59 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class TagWriteFailure:
+    """
+    A Data Transfer Object representing a Tag write
+    rejected by Data Catalog.
+    """
+
+    def __init__(self, operation, tag, error):
+        self.operation = operation
+        self.tag = tag
+        self.error = error
+
+
+class TagWritesResult:
+    """
+    A Data Transfer Object representing the outcome
+    of the Tag writes sent for a given Entry.
+    """
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+    def __init__(self):
+        self.created_tags = []
+        self.updated_tags = []
+        self.deleted_tags = []
+        self.failures = []
+
+    @property
+    def succeeded(self):
+        return not self.failures
+
+    def add_success(self, operation, tag):
+        if operation == self.CREATE:
+            self.created_tags.append(tag)
+        elif operation == self.UPDATE:
+            self.updated_tags.append(tag)
+        else:
+            self.deleted_tags.append(tag)
+
+    def add_failure(self, operation, tag, error):
+        self.failures.append(TagWriteFailure(operation, tag, error))
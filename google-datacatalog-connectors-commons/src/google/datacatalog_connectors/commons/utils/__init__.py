@@ -14,7 +14,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from .datacatalog_comparison_helper import DataCatalogComparisonHelper
+from .rate_limiter import RateLimiter
 from .region_tag_helper import RegionTagHelper
+from .retry_policy import RetryPolicy
+from .schema_diff import ColumnDiff, SchemaDiff
+from .ttl_cache import TTLCache
 from .values_comparable_object import ValuesComparableObject
 
-__all__ = ('RegionTagHelper', 'ValuesComparableObject')
+__all__ = ('AdaptiveConcurrencyLimiter', 'ColumnDiff',
+           'DataCatalogComparisonHelper', 'RateLimiter', 'RegionTagHelper',
+           'RetryPolicy', 'SchemaDiff', 'TTLCache', 'ValuesComparableObject')
@@ -0,0 +1,141 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limits the number of concurrent requests with a window adjusted by
+    Additive Increase / Multiplicative Decrease (AIMD).
+
+    The window grows by about one slot per window of successful requests
+    while their latency stays close to the best one observed, and is halved
+    when a request is throttled by the server.
+    """
+
+    __DECREASE_FACTOR = 0.5
+    # The window stops growing when the latency exceeds this many times the
+    # best latency observed.
+    __LATENCY_TOLERANCE = 2.0
+    # Weight of the newest sample in the latency moving average.
+    __LATENCY_SMOOTHING = 0.2
+
+    def __init__(self,
+                 max_window,
+                 min_window=1,
+                 initial_window=None,
+                 clock=None):
+        """
+        :param max_window: Max number of concurrent requests.
+        :param min_window: Min number of concurrent requests.
+        :param initial_window: Initial number of concurrent requests,
+            defaults to min_window.
+        :param clock: Function returning the current time in seconds,
+            defaults to time.monotonic.
+        """
+        self.__max_window = max_window
+        self.__min_window = min_window
+        self.__window = float(initial_window or min_window)
+        self.__clock = clock or time.monotonic
+        self.__condition = threading.Condition()
+
+        self.__in_flight = 0
+        self.__completed_count = 0
+        self.__throttled_count = 0
+        self.__smoothed_latency = None
+        self.__baseline_latency = None
+        self.__decreased_at = None
+        self.__started_at = self.__clock()
+
+    @property
+    def window(self):
+        return int(self.__window)
+
+    def acquire(self):
+        """Waits until the window has room for another request."""
+        with self.__condition:
+            while self.__in_flight >= int(self.__window):
+                self.__condition.wait()
+            self.__in_flight += 1
+
+    def release(self, latency_seconds, throttled=False):
+        """Records the outcome of a request and adjusts the window.
+
+        :param latency_seconds: How long the request took.
+        :param throttled: True if the server rejected the request because
+            of quota or load.
+        """
+        with self.__condition:
+            self.__in_flight -= 1
+            if throttled:
+                self.__on_throttled()
+            else:
+                self.__on_success(latency_seconds)
+            self.__condition.notify_all()
+
+    def __on_success(self, latency_seconds):
+        self.__completed_count += 1
+
+        if self.__smoothed_latency is None:
+            self.__smoothed_latency = latency_seconds
+        else:
+            self.__smoothed_latency += self.__LATENCY_SMOOTHING * (
+                latency_seconds - self.__smoothed_latency)
+
+        if self.__baseline_latency is None:
+            self.__baseline_latency = self.__smoothed_latency
+        self.__baseline_latency = min(self.__baseline_latency,
+                                      self.__smoothed_latency)
+
+        if self.__smoothed_latency <= \
+                self.__baseline_latency * self.__LATENCY_TOLERANCE:
+            self.__window = min(self.__max_window,
+                                self.__window + 1 / self.__window)
+
+    def __on_throttled(self):
+        self.__throttled_count += 1
+
+        # The requests already in flight when the window was decreased are
+        # likely to be throttled too, so the window is decreased at most once
+        # per round trip.
+        now = self.__clock()
+        if self.__decreased_at is not None and \
+                now - self.__decreased_at < (self.__smoothed_latency or 0):
+            return
+
+        self.__decreased_at = now
+        self.__window = max(self.__min_window,
+                            self.__window * self.__DECREASE_FACTOR)
+
+    def stats(self):
+        """Gets the limiter state and counters.
+
+        :return: A dict with the current window, the requests in flight, the
+            completed and throttled requests count, and the throughput in
+            completed requests per second.
+        """
+        with self.__condition:
+            elapsed_seconds = self.__clock() - self.__started_at
+            throughput = self.__completed_count / elapsed_seconds \
+                if elapsed_seconds else 0
+            return {
+                'window': int(self.__window),
+                'in_flight': self.__in_flight,
+                'completed_count': self.__completed_count,
+                'throttled_count': self.__throttled_count,
+                'throughput': throughput
+            }
@@ -0,0 +1,249 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors.commons.utils import schema_diff
+
+
+class DataCatalogComparisonHelper:
+    """Helper class with the logic used to compare the metadata sent by the
+    connectors with the metadata already persisted in Data Catalog.
+    """
+
+    # This is the value automatically set up by the GRPC client.
+    __DEFAULT_COLUMN_MODE = 'NULLABLE'
+
+    # Column fields compared one by one, subcolumns are compared
+    # recursively.
+    __COLUMN_FIELDS = ('type', 'description')
+
+    # Entry fields compared one by one, which are also their update mask
+    # paths.
+    __ENTRY_FIELDS = ('user_specified_system', 'user_specified_type',
+                      'display_name', 'description', 'linked_resource')
+
+    @classmethod
+    def entry_was_updated(cls, current_entry, new_entry):
+        return bool(cls.get_entry_changed_fields(current_entry, new_entry))
+
+    @classmethod
+    def get_entry_changed_fields(cls, current_entry, new_entry):
+        """Lists the fields that differ between a persisted Entry and the
+        Entry sent by a connector.
+
+        :param current_entry: The persisted Entry object.
+        :param new_entry: The new Entry object.
+        :return: A list of update mask paths, empty if the Entries are equal.
+        """
+        changed_fields = [
+            field for field in cls.__ENTRY_FIELDS
+            if getattr(current_entry, field) != getattr(new_entry, field)
+        ]
+
+        if cls.diff_schemas(current_entry.schema,
+                            new_entry.schema).has_changes:
+            changed_fields.append('schema')
+
+        # Update time comparison allows to verify whether the entry was
+        # updated on the source system.
+        current_update_time = 0
+        if current_entry.source_system_timestamps.update_time:
+            current_update_time = \
+                current_entry.source_system_timestamps.update_time.timestamp()
+
+        new_update_time = 0
+        if new_entry.source_system_timestamps.update_time:
+            new_update_time = \
+                new_entry.source_system_timestamps.update_time.timestamp()
+
+        if new_update_time != 0 and current_update_time != new_update_time:
+            changed_fields.append('source_system_timestamps')
+
+        return changed_fields
+
+    @classmethod
+    def diff_schemas(cls, current_schema, new_schema):
+        """Compares two schemas column by column, including their subcolumns.
+
+        Columns are matched by name regardless of their position, and none
+        of the given objects is modified.
+
+        :param current_schema: The persisted Schema object.
+        :param new_schema: The new Schema object.
+        :return: A SchemaDiff object.
+        """
+        column_diffs = []
+        # The raw protobuf messages are much faster to read than their
+        # proto-plus wrappers, which matters for wide tables.
+        cls.__diff_columns(
+            datacatalog.Schema.pb(current_schema).columns,
+            datacatalog.Schema.pb(new_schema).columns, None, column_diffs)
+        return schema_diff.SchemaDiff(column_diffs)
+
+    @classmethod
+    def __diff_columns(cls, current_columns, new_columns, parent_path,
+                       column_diffs):
+
+        current_columns_index = cls.__index_columns(current_columns)
+        new_columns_index = cls.__index_columns(new_columns)
+
+        for key, new_column in new_columns_index.items():
+            path = cls.__get_column_path(parent_path, new_column.column)
+            current_column = current_columns_index.get(key)
+
+            if current_column is None:
+                column_diffs.append(
+                    schema_diff.ColumnDiff(path, schema_diff.ColumnDiff.ADDED))
+                continue
+
+            changed_fields = cls.__get_column_changed_fields(
+                current_column, new_column)
+            if changed_fields:
+                column_diffs.append(
+                    schema_diff.ColumnDiff(path,
+                                           schema_diff.ColumnDiff.CHANGED,
+                                           changed_fields))
+
+            if current_column.subcolumns or new_column.subcolumns:
+                cls.__diff_columns(current_column.subcolumns,
+                                   new_column.subcolumns, path, column_diffs)
+
+        for key, current_column in current_columns_index.items():
+            if key not in new_columns_index:
+                column_diffs.append(
+                    schema_diff.ColumnDiff(
+                        cls.__get_column_path(parent_path,
+                                              current_column.column),
+                        schema_diff.ColumnDiff.DELETED))
+
+    @classmethod
+    def __index_columns(cls, columns):
+        # Columns are indexed by name and occurrence, so repeated names are
+        # matched in the same order they appear in both schemas.
+        index = {}
+        occurrences = {}
+        for column in columns:
+            occurrence = occurrences.get(column.column, 0)
+            occurrences[column.column] = occurrence + 1
+            index[(column.column, occurrence)] = column
+        return index
+
+    @classmethod
+    def __get_column_changed_fields(cls, current_column, new_column):
+        changed_fields = [
+            field for field in cls.__COLUMN_FIELDS
+            if getattr(current_column, field) != getattr(new_column, field)
+        ]
+
+        # The mode is set to its default value by the API when not provided.
+        if (current_column.mode or cls.__DEFAULT_COLUMN_MODE) != \
+                (new_column.mode or cls.__DEFAULT_COLUMN_MODE):
+            changed_fields.append('mode')
+
+        return changed_fields
+
+    @classmethod
+    def __get_column_path(cls, parent_path, column_name):
+        if parent_path is None:
+            return column_name
+        return '{}.{}'.format(parent_path, column_name)
+
+    @classmethod
+    def get_tag_key(cls, tag):
+        """Builds the key that identifies the Tags attached to the same
+        column, or to the Entry itself, from the same Template.
+
+        :param tag: A Tag object.
+        :return: A tuple with the Template name and the lowercase column,
+        as the column field is not case sensitive.
+        """
+        return tag.template, tag.column.lower()
+
+    @classmethod
+    def index_tags(cls, tags):
+        """Indexes a list of Tags by their keys, so the matching Tags of
+        two lists are found with dict lookups.
+
+        :param tags: A list of Tag objects.
+        :return: A dict of Tag objects, keeping the first Tag of each key.
+        """
+        tags_index = {}
+        for tag in tags or []:
+            tags_index.setdefault(cls.get_tag_key(tag), tag)
+        return tags_index
+
+    @classmethod
+    def tag_is_obsolete(cls, persisted_tag, tags_index, tag_template_name):
+        """Checks whether a persisted Tag is managed by the connector and is
+        no longer present in the Tags list.
+
+        :param persisted_tag: A Tag object.
+        :param tags_index: A dict of Tag objects, built by index_tags.
+        :param tag_template_name: Template name used to filter
+        templates out, it can be a part of the template name.
+        :return: True if the persisted Tag should be deleted.
+        """
+        return tag_template_name in persisted_tag.template and \
+            cls.get_tag_key(persisted_tag) not in tags_index
+
+    @classmethod
+    def tag_fields_are_equal(cls, tag_1, tag_2):
+        return not cls.get_tag_changed_fields(tag_1, tag_2)
+
+    @classmethod
+    def get_tag_changed_fields(cls, tag_1, tag_2):
+        """Lists the fields of a given Tag whose values differ from, or are
+        missing in, another Tag.
+
+        :param tag_1: The Tag object with the expected values.
+        :param tag_2: The Tag object to compare with.
+        :return: A list of field ids, empty if the values are equal.
+        """
+        changed_fields = []
+        for field_id in tag_1.fields:
+            tag_1_field = tag_1.fields[field_id]
+            tag_2_field = tag_2.fields.get(field_id)
+
+            if tag_2_field is None:
+                changed_fields.append(field_id)
+                continue
+
+            values_are_equal = tag_1_field.bool_value == \
+                tag_2_field.bool_value
+            values_are_equal = values_are_equal \
+                and tag_1_field.double_value == tag_2_field.double_value
+            values_are_equal = values_are_equal \
+                and tag_1_field.string_value == tag_2_field.string_value
+            values_are_equal = values_are_equal \
+                and cls.__timestamp_tag_fields_are_equal(
+                    tag_1_field, tag_2_field)
+            values_are_equal = values_are_equal \
+                and tag_1_field.enum_value.display_name == \
+                tag_2_field.enum_value.display_name
+
+            if not values_are_equal:
+                changed_fields.append(field_id)
+
+        return changed_fields
+
+    @classmethod
+    def __timestamp_tag_fields_are_equal(cls, tag_1_field, tag_2_field):
+        if not (tag_1_field.timestamp_value and tag_2_field.timestamp_value):
+            return True
+
+        return tag_1_field.timestamp_value.timestamp() == \
+            tag_2_field.timestamp_value.timestamp()
@@ -0,0 +1,132 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket, refilled at a constant rate."""
+
+    def __init__(self, rate_per_second, capacity, clock=None, sleep=None):
+        """
+        :param rate_per_second: How many tokens are added per second.
+        :param capacity: Max number of tokens, which allows short bursts.
+        :param clock: Function returning the current time in seconds,
+            defaults to time.monotonic.
+        :param sleep: Function used to wait for the tokens, defaults to
+            time.sleep.
+        """
+        self.__rate_per_second = rate_per_second
+        self.__capacity = capacity
+        self.__clock = clock or time.monotonic
+        self.__sleep = sleep or time.sleep
+        self.__tokens = capacity
+        self.__refilled_at = self.__clock()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, waiting until one is available.
+
+        :return: The number of seconds waited.
+        """
+        with self.__lock:
+            now = self.__clock()
+            self.__tokens = min(
+                self.__capacity, self.__tokens +
+                (now - self.__refilled_at) * self.__rate_per_second)
+            self.__refilled_at = now
+
+            # The token is reserved right away, so concurrent callers queue
+            # up behind each other instead of competing for the same one.
+            self.__tokens -= 1
+            wait_seconds = max(0, -self.__tokens / self.__rate_per_second)
+
+        if wait_seconds:
+            self.__sleep(wait_seconds)
+        return wait_seconds
+
+
+class RateLimiter:
+    """Client-side limiter for the Data Catalog API requests.
+
+    Data Catalog enforces per-method quotas by minute, so the requests are
+    throttled with separate budgets for reads, writes and searches. A single
+    RateLimiter can be shared by several facades of the same process.
+    """
+
+    READ = 'read'
+    WRITE = 'write'
+    SEARCH = 'search'
+
+    def __init__(self,
+                 reads_per_minute=None,
+                 writes_per_minute=None,
+                 searches_per_minute=None):
+        """
+        :param reads_per_minute: Max get, lookup and list requests per minute.
+        :param writes_per_minute: Max create, update and delete requests per
+            minute.
+        :param searches_per_minute: Max search requests per minute.
+
+        The requests of a budget that is not set are not throttled.
+        """
+        requests_per_minute_by_budget = {
+            self.READ: reads_per_minute,
+            self.WRITE: writes_per_minute,
+            self.SEARCH: searches_per_minute,
+        }
+        self.__buckets = {
+            budget: self.__create_bucket(requests_per_minute)
+            for budget, requests_per_minute in
+            requests_per_minute_by_budget.items()
+            if requests_per_minute
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        """Creates a RateLimiter from a config dict.
+
+        :param config: dict with the reads_per_minute, writes_per_minute and
+            searches_per_minute keys, all of them optional.
+        :return: A RateLimiter object.
+        """
+        return cls(reads_per_minute=config.get('reads_per_minute'),
+                   writes_per_minute=config.get('writes_per_minute'),
+                   searches_per_minute=config.get('searches_per_minute'))
+
+    @classmethod
+    def __create_bucket(cls, requests_per_minute):
+        rate_per_second = requests_per_minute / 60
+        # Allows bursts of up to one second worth of requests.
+        return TokenBucket(rate_per_second, max(1, rate_per_second))
+
+    def acquire(self, budget):
+        """Waits until a request of the given budget can be sent.
+
+        :param budget: READ, WRITE or SEARCH.
+        :return: The number of seconds waited.
+        """
+        bucket = self.__buckets.get(budget)
+        if not bucket:
+            return 0
+
+        wait_seconds = bucket.acquire()
+        if wait_seconds:
+            logging.debug('%s request throttled for %.3f seconds', budget,
+                          wait_seconds)
+        return wait_seconds
@@ -0,0 +1,223 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import random
+import threading
+import time
+
+from google.api_core import exceptions
+
+
+class RetryPolicy:
+    """Retries the Data Catalog API requests that failed because of
+    transient errors, with exponential backoff and full jitter.
+
+    Each method can have its own deadline, after which it is not retried
+    anymore. The retries also take tokens from a budget shared by all the
+    requests, which is refilled by a fraction of every request sent. A
+    brown-out then makes the requests fail fast once the budget runs out,
+    instead of multiplying the load with retries.
+    """
+
+    RETRYABLE_ERRORS = (exceptions.Aborted, exceptions.DeadlineExceeded,
+                        exceptions.InternalServerError,
+                        exceptions.ResourceExhausted,
+                        exceptions.ServiceUnavailable)
+
+    # The create requests are not idempotent: one that was aborted or timed
+    # out may have been applied anyway, so they are only retried on the
+    # errors returned before the request is processed.
+    NON_IDEMPOTENT_METHODS = ('create_entry', 'create_entry_group',
+                              'create_tag', 'create_tag_template')
+    NON_IDEMPOTENT_RETRYABLE_ERRORS = (exceptions.ResourceExhausted,
+                                       exceptions.ServiceUnavailable)
+
+    # A delete request that was aborted or timed out may have been applied
+    # anyway, so the resource missing on retry means it was deleted.
+    DELETE_METHODS = ('delete_entry', 'delete_entry_group', 'delete_tag',
+                      'delete_tag_template')
+    MISSING_RESOURCE_ERRORS = (exceptions.NotFound,
+                               exceptions.PermissionDenied)
+
+    def __init__(self,
+                 max_attempts=5,
+                 initial_backoff_seconds=0.1,
+                 max_backoff_seconds=30,
+                 backoff_multiplier=2,
+                 deadline_seconds=60,
+                 method_deadlines_seconds=None,
+                 retry_budget_ratio=0.1,
+                 min_retry_budget=10,
+                 clock=None,
+                 sleep=None):
+        """
+        :param max_attempts: Max number of attempts of a request.
+        :param initial_backoff_seconds: Max wait before the first retry.
+        :param max_backoff_seconds: Max wait before any retry.
+        :param backoff_multiplier: How much the max wait grows per retry.
+        :param deadline_seconds: Time since the first attempt after which
+            a request is not retried anymore.
+        :param method_deadlines_seconds: dict with the deadlines of specific
+            API methods, such as search_catalog, by method name.
+        :param retry_budget_ratio: Retry tokens added to the budget by
+            each request.
+        :param min_retry_budget: Retry tokens available upfront, which is
+            also the budget size.
+        :param clock: Function returning the current time in seconds,
+            defaults to time.monotonic.
+        :param sleep: Function used to wait between attempts, defaults to
+            time.sleep.
+        """
+        self.__max_attempts = max_attempts
+        self.__initial_backoff_seconds = initial_backoff_seconds
+        self.__max_backoff_seconds = max_backoff_seconds
+        self.__backoff_multiplier = backoff_multiplier
+        self.__deadline_seconds = deadline_seconds
+        self.__method_deadlines_seconds = method_deadlines_seconds or {}
+        self.__retry_budget_ratio = retry_budget_ratio
+        self.__max_retry_budget = min_retry_budget
+        self.__clock = clock or time.monotonic
+        self.__sleep = sleep or time.sleep
+
+        self.__lock = threading.Lock()
+        self.__retry_budget = float(min_retry_budget)
+        self.__retry_count = 0
+        self.__retry_budget_exhausted_count = 0
+
+    @classmethod
+    def from_config(cls, config):
+        """Creates a RetryPolicy from a config dict.
+
+        :param config: dict with the RetryPolicy constructor arguments, all
+            of them optional.
+        :return: A RetryPolicy object.
+        """
+        return cls(**config)
+
+    @classmethod
+    def is_retryable(cls, error, method_name=None):
+        """Checks whether an error is transient.
+
+        Errors such as FailedPrecondition or PermissionDenied are not going
+        to change on retry, so they are terminal.
+
+        :param error: An exception.
+        :param method_name: The API method name. The create methods are
+            only retried on NON_IDEMPOTENT_RETRYABLE_ERRORS.
+        :return: True if the request can be retried.
+        """
+        if method_name in cls.NON_IDEMPOTENT_METHODS:
+            return isinstance(error, cls.NON_IDEMPOTENT_RETRYABLE_ERRORS)
+        return isinstance(error, cls.RETRYABLE_ERRORS)
+
+    def get_deadline_seconds(self, method_name):
+        """Gets the time after which a method is not retried anymore.
+
+        :param method_name: The API method name.
+        :return: The deadline in seconds, or None if it has no deadline.
+        """
+        return self.__method_deadlines_seconds.get(method_name,
+                                                   self.__deadline_seconds)
+
+    def execute(self, method_name, function, *args, **kwargs):
+        """Calls a function, retrying it on transient errors.
+
+        :param method_name: The API method name, used to pick its deadline.
+        :param function: The function that sends the request.
+        :return: The function result, or None if a delete request finds the
+            resource missing once retried after an ambiguous error.
+        """
+        deadline_seconds = self.get_deadline_seconds(method_name)
+        started_at = self.__clock()
+        self.__deposit()
+
+        attempt = 1
+        ambiguous_error = False
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except exceptions.GoogleAPICallError as e:
+                if ambiguous_error and method_name in self.DELETE_METHODS \
+                        and isinstance(e, self.MISSING_RESOURCE_ERRORS):
+                    logging.info(
+                        '%s retried after an ambiguous error, the resource'
+                        ' was already deleted: %s', method_name, e)
+                    return None
+
+                if not self.is_retryable(e, method_name) or \
+                        attempt >= self.__max_attempts:
+                    raise
+
+                backoff_seconds = self.__compute_backoff(attempt)
+                elapsed_seconds = self.__clock() - started_at
+                if deadline_seconds is not None and \
+                        elapsed_seconds + backoff_seconds > deadline_seconds:
+                    raise
+
+                if not self.__withdraw():
+                    logging.warning('Retry budget exhausted, %s not retried',
+                                    method_name)
+                    raise
+
+                logging.info('%s failed, retry %s in %.3f seconds: %s',
+                             method_name, attempt, backoff_seconds, e)
+                self.__sleep(backoff_seconds)
+                attempt += 1
+                ambiguous_error = ambiguous_error or not isinstance(
+                    e, self.NON_IDEMPOTENT_RETRYABLE_ERRORS)
+
+    def __compute_backoff(self, attempt):
+        # Full jitter: the wait is spread uniformly up to the capped
+        # exponential backoff, so the clients retrying together do not
+        # hit the server in waves.
+        max_backoff_seconds = min(
+            self.__max_backoff_seconds,
+            self.__initial_backoff_seconds *
+            self.__backoff_multiplier**(attempt - 1))
+        return random.uniform(0, max_backoff_seconds)
+
+    def __deposit(self):
+        with self.__lock:
+            self.__retry_budget = min(
+                self.__max_retry_budget,
+                self.__retry_budget + self.__retry_budget_ratio)
+
+    def __withdraw(self):
+        with self.__lock:
+            if self.__retry_budget < 1:
+                self.__retry_budget_exhausted_count += 1
+                return False
+
+            self.__retry_budget -= 1
+            self.__retry_count += 1
+            return True
+
+    def stats(self):
+        """Gets the retry counters.
+
+        :return: A dict with the retries count, the count of retries
+            prevented by an exhausted budget, and the budget left.
+        """
+        with self.__lock:
+            return {
+                'retry_count':
+                    self.__retry_count,
+                'retry_budget_exhausted_count':
+                    self.__retry_budget_exhausted_count,
+                'retry_budget':
+                    self.__retry_budget
+            }
@@ -0,0 +1,79 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class ColumnDiff:
+    """
+    A Data Transfer Object representing a column that differs
+    between two schemas.
+    """
+
+    ADDED = 'added'
+    CHANGED = 'changed'
+    DELETED = 'deleted'
+
+    def __init__(self, path, change_type, changed_fields=None):
+        """
+        :param path: The column name, prefixed by its parent columns names
+            for subcolumns, e.g. address.street.
+        :param change_type: One of ADDED, CHANGED or DELETED.
+        :param changed_fields: The changed column fields, if CHANGED.
+        """
+        self.path = path
+        self.change_type = change_type
+        self.changed_fields = changed_fields or []
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) \
+            and self.__dict__ == other.__dict__
+
+    def __repr__(self):
+        return '{}({!r}, {!r}, {!r})'.format(self.__class__.__name__,
+                                             self.path, self.change_type,
+                                             self.changed_fields)
+
+
+class SchemaDiff:
+    """
+    A Data Transfer Object representing the column level differences
+    between two schemas.
+    """
+
+    def __init__(self, column_diffs=None):
+        self.column_diffs = column_diffs or []
+
+    @property
+    def has_changes(self):
+        return bool(self.column_diffs)
+
+    @property
+    def added_columns(self):
+        return self.__get_paths(ColumnDiff.ADDED)
+
+    @property
+    def changed_columns(self):
+        return self.__get_paths(ColumnDiff.CHANGED)
+
+    @property
+    def deleted_columns(self):
+        return self.__get_paths(ColumnDiff.DELETED)
+
+    def __get_paths(self, change_type):
+        return [
+            column_diff.path
+            for column_diff in self.column_diffs
+            if column_diff.change_type == change_type
+        ]
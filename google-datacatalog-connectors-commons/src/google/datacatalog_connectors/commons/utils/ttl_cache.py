@@ -0,0 +1,120 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe, size-bounded cache whose values expire after a given
+    time. The least recently used values are evicted when it is full.
+    """
+
+    def __init__(self, max_size, ttl_seconds, timer=time.monotonic):
+        """
+        :param max_size: Max number of cached values.
+        :param ttl_seconds: How long a value is kept since it was cached.
+        :param timer: Function returning the current time in seconds.
+        """
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__timer = timer
+        self.__values = collections.OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__generation = 0
+
+    @property
+    def generation(self):
+        """Counter incremented by every invalidation, so a value computed
+        while the cache was invalidated is not cached."""
+        return self.__generation
+
+    @property
+    def hits(self):
+        return self.__hits
+
+    @property
+    def misses(self):
+        return self.__misses
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__values)
+
+    def get(self, key, default=None):
+        """Gets a cached value, if it has not expired.
+
+        :param key: The value key.
+        :param default: Returned on cache misses.
+        :return: The cached value, or the default one.
+        """
+        with self.__lock:
+            cached = self.__values.get(key)
+            if cached and cached[0] > self.__timer():
+                self.__values.move_to_end(key)
+                self.__hits += 1
+                return cached[1]
+
+            if cached:
+                del self.__values[key]
+            self.__misses += 1
+            return default
+
+    def put(self, key, value, generation=None):
+        """Caches a value, evicting the least recently used one if the cache
+        is full.
+
+        :param key: The value key.
+        :param value: The value.
+        :param generation: The cache generation read before computing the
+            value. The value is not cached if the cache was invalidated
+            since then.
+        """
+        with self.__lock:
+            if generation is not None and generation != self.__generation:
+                return
+
+            self.__values[key] = (self.__timer() + self.__ttl_seconds, value)
+            self.__values.move_to_end(key)
+            while len(self.__values) > self.__max_size:
+                self.__values.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """Removes a cached value, or all of them if no key is given.
+
+        :param key: The value key.
+        """
+        with self.__lock:
+            self.__generation += 1
+            if key is None:
+                self.__values.clear()
+            else:
+                self.__values.pop(key, None)
+
+    def stats(self):
+        """Gets the cache usage counters.
+
+        :return: A dict with the hits, misses and size of the cache.
+        """
+        with self.__lock:
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'size': len(self.__values)
+            }
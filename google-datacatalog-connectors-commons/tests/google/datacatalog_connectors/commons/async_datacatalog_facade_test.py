@@ -0,0 +1,443 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+import mock
+from google.api_core import exceptions
+from google.cloud import datacatalog
+from google.datacatalog_connectors.commons_test import utils
+from google.protobuf import timestamp_pb2
+
+from google.datacatalog_connectors import commons
+from google.datacatalog_connectors.commons import state
+
+
+class FakeAsyncPager:
+
+    def __init__(self, results):
+        self.__results = results
+
+    def __aiter__(self):
+        return self.__generate()
+
+    async def __generate(self):
+        for result in self.__results:
+            yield result
+
+
+class AsyncDataCatalogFacadeTestCase(unittest.TestCase):
+    __COMMONS_PACKAGE = 'google.datacatalog_connectors.commons'
+
+    __STRING_TYPE = datacatalog.FieldType.PrimitiveType.STRING
+
+    def setUp(self):
+        client_patcher = mock.patch(
+            '{}.async_datacatalog_facade.datacatalog.DataCatalogAsyncClient'.
+            format(self.__COMMONS_PACKAGE))
+        mock_datacatalog_client = client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+
+        self.__datacatalog_facade = commons \
+            .AsyncDataCatalogFacade('test-project')
+        # Shortcut for the object lazily assigned
+        # to self.__datacatalog_facade.__datacatalog
+        self.__datacatalog_client = mock_datacatalog_client.return_value
+        self.__mock_client_calls(self.__datacatalog_client)
+
+    def test_constructor_should_not_create_client(self):
+        attrs = self.__datacatalog_facade.__dict__
+        self.assertIsNone(attrs['_AsyncDataCatalogFacade__datacatalog'])
+        self.assertEqual('test-project',
+                         attrs['_AsyncDataCatalogFacade__project_id'])
+
+    def test_create_entry_should_succeed(self):
+        entry = self.__create_entry()
+
+        self.__run(
+            self.__datacatalog_facade.create_entry('entry_group_name',
+                                                   'entry_id', entry))
+
+        datacatalog_client = self.__datacatalog_client
+        self.assertEqual(1, datacatalog_client.create_entry.call_count)
+
+    def test_create_entry_should_raise_on_permission_denied(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.create_entry.side_effect = self.__async_raise(
+            exceptions.PermissionDenied('Permission denied'))
+
+        self.assertRaises(
+            exceptions.PermissionDenied, self.__run,
+            self.__datacatalog_facade.create_entry('entry_group_name',
+                                                   'entry_id',
+                                                   self.__create_entry()))
+
+    def test_get_and_lookup_entry_should_return_client_results(self):
+        fake_entry = self.__create_entry()
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = self.__async_return(
+            fake_entry)
+        datacatalog_client.lookup_entry.side_effect = self.__async_return(
+            fake_entry)
+
+        self.assertEqual(
+            fake_entry,
+            self.__run(self.__datacatalog_facade.get_entry('entry_name')))
+        self.assertEqual(
+            fake_entry,
+            self.__run(
+                self.__datacatalog_facade.lookup_entry('linked_resource')))
+
+    def test_upsert_entry_nonexistent_should_create(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = self.__async_raise(
+            exceptions.PermissionDenied('Entry not found'))
+
+        self.__run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'entry_id',
+                                                   self.__create_entry()))
+
+        self.assertEqual(1, datacatalog_client.get_entry.call_count)
+        self.assertEqual(1, datacatalog_client.create_entry.call_count)
+
+    def test_upsert_entry_changed_should_update(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = self.__async_return(
+            self.__create_entry('linked_resource_1'))
+
+        self.__run(
+            self.__datacatalog_facade.upsert_entry(
+                'entry_group_name', 'entry_id',
+                self.__create_entry('linked_resource_2')))
+
+        datacatalog_client.create_entry.assert_not_called()
+        self.assertEqual(1, datacatalog_client.update_entry.call_count)
+        self.assertEqual(['linked_resource'], datacatalog_client.update_entry.
+                         call_args.kwargs['update_mask'].paths)
+
+    def test_upsert_entry_unchanged_should_not_update(self):
+        entry = self.__create_entry()
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = self.__async_return(entry)
+
+        self.__run(
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'entry_id', entry))
+
+        datacatalog_client.create_entry.assert_not_called()
+        datacatalog_client.update_entry.assert_not_called()
+
+    def test_upsert_entry_should_raise_on_failed_precondition(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = self.__async_raise(
+            exceptions.FailedPrecondition('Failed precondition'))
+
+        self.assertRaises(
+            exceptions.FailedPrecondition, self.__run,
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'entry_id',
+                                                   self.__create_entry()))
+
+    def test_delete_entry_error_should_be_ignored(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.delete_entry.side_effect = self.__async_raise(
+            Exception('Error when deleting entry'))
+
+        self.__run(self.__datacatalog_facade.delete_entry('entry_name'))
+        self.__run(self.__datacatalog_facade.delete_entry('entry_name'))
+
+        self.assertEqual(2, datacatalog_client.delete_entry.call_count)
+
+    def test_entry_group_and_tag_template_operations_should_succeed(self):
+        facade = self.__datacatalog_facade
+
+        self.__run(facade.create_entry_group('location-id', 'entry_group_id'))
+        self.__run(facade.delete_entry_group('entry_group_name'))
+        self.__run(
+            facade.create_tag_template('location-id', 'tag_template_id', {}))
+        self.__run(facade.get_tag_template('tag_template_name'))
+        self.__run(facade.delete_tag_template('tag_template_name'))
+
+        datacatalog_client = self.__datacatalog_client
+        self.assertEqual(1, datacatalog_client.create_entry_group.call_count)
+        self.assertEqual(1, datacatalog_client.delete_entry_group.call_count)
+        self.assertEqual(1, datacatalog_client.create_tag_template.call_count)
+        self.assertEqual(1, datacatalog_client.get_tag_template.call_count)
+        self.assertEqual(1, datacatalog_client.delete_tag_template.call_count)
+
+    def test_deleted_resources_should_be_forgotten(self):
+        known_resources = state.KnownResourcesRegistry.shared()
+        known_resources.add('entry_group_name')
+        known_resources.add('tag_template_name')
+
+        facade = self.__datacatalog_facade
+        self.__run(facade.delete_entry_group('entry_group_name'))
+        self.__run(facade.delete_tag_template('tag_template_name'))
+
+        self.assertNotIn('entry_group_name', known_resources)
+        self.assertNotIn('tag_template_name', known_resources)
+
+    def test_tag_operations_should_succeed(self):
+        facade = self.__datacatalog_facade
+        tag = self.__create_tag()
+
+        self.__run(facade.create_tag('entry_name', tag))
+        self.__run(facade.update_tag(tag))
+        self.__run(facade.delete_tag(tag))
+
+        datacatalog_client = self.__datacatalog_client
+        self.assertEqual(1, datacatalog_client.create_tag.call_count)
+        self.assertEqual(1, datacatalog_client.update_tag.call_count)
+        self.assertEqual(1, datacatalog_client.delete_tag.call_count)
+
+    def test_upsert_tags_should_create_update_and_skip(self):
+        persisted_tag = self.__create_tag()
+        persisted_tag.column = 'unchanged'
+
+        changed_tag = self.__create_tag()
+        changed_tag.column = 'changed'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.side_effect = self.__async_return(
+            FakeAsyncPager([persisted_tag, changed_tag]))
+
+        updated_tag = self.__create_tag()
+        updated_tag.column = 'changed'
+        updated_tag.fields['bool-field'].bool_value = False
+
+        unchanged_tag = self.__create_tag()
+        unchanged_tag.column = 'UNCHANGED'
+
+        new_tag = self.__create_tag()
+        new_tag.column = 'new'
+
+        result = self.__run(
+            self.__datacatalog_facade.upsert_tags(
+                self.__create_entry(), [unchanged_tag, updated_tag, new_tag]))
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual([new_tag], result.created_tags)
+        self.assertEqual([updated_tag], result.updated_tags)
+        self.assertEqual(1, datacatalog_client.create_tag.call_count)
+        self.assertEqual(1, datacatalog_client.update_tag.call_count)
+        self.assertEqual([
+            'fields'
+        ], datacatalog_client.update_tag.call_args.kwargs['update_mask'].paths)
+
+    def test_upsert_tags_should_handle_empty_list(self):
+        result = self.__run(
+            self.__datacatalog_facade.upsert_tags(self.__create_entry(), None))
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual([], result.created_tags)
+        self.__datacatalog_client.list_tags.assert_not_called()
+
+    def test_delete_tags_should_delete_obsolete_tags_only(self):
+        obsolete_tag = self.__create_tag()
+        obsolete_tag.column = 'obsolete'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.side_effect = self.__async_return(
+            FakeAsyncPager([self.__create_tag(), obsolete_tag]))
+
+        result = self.__run(
+            self.__datacatalog_facade.delete_tags(self.__create_entry(),
+                                                  [self.__create_tag()],
+                                                  'template'))
+
+        self.assertEqual([obsolete_tag], result.deleted_tags)
+        datacatalog_client.delete_tag.assert_called_once_with(
+            name=obsolete_tag.name)
+
+    def test_reconcile_tags_should_create_update_and_delete(self):
+        changed_tag = self.__create_tag()
+        changed_tag.name = 'changed_tag'
+        changed_tag.column = 'changed'
+
+        obsolete_tag = self.__create_tag()
+        obsolete_tag.name = 'obsolete_tag'
+        obsolete_tag.column = 'obsolete'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.side_effect = self.__async_return(
+            FakeAsyncPager([changed_tag, obsolete_tag]))
+
+        updated_tag = self.__create_tag()
+        updated_tag.column = 'CHANGED'
+        updated_tag.fields['bool-field'].bool_value = False
+
+        new_tag = self.__create_tag()
+        new_tag.column = 'new'
+
+        result = self.__run(
+            self.__datacatalog_facade.reconcile_tags(self.__create_entry(),
+                                                     [updated_tag, new_tag],
+                                                     'template'))
+
+        self.assertEqual([new_tag], result.created_tags)
+        self.assertEqual([updated_tag], result.updated_tags)
+        self.assertEqual([obsolete_tag], result.deleted_tags)
+        self.assertEqual(1, datacatalog_client.list_tags.call_count)
+        self.assertEqual(1, datacatalog_client.create_tag.call_count)
+        self.assertEqual(1, datacatalog_client.update_tag.call_count)
+        datacatalog_client.delete_tag.assert_called_once_with(
+            name='obsolete_tag')
+
+    def test_search_catalog_relative_resource_name_should_return_names(self):
+        expected_resource_names = ['localhost//asset_1', 'localhost//asset_2']
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.search_catalog.side_effect = self.__async_return(
+            FakeAsyncPager([
+                self.__create_search_result(resource_name)
+                for resource_name in expected_resource_names
+            ]))
+
+        resource_names = self.__run(
+            self.__datacatalog_facade.search_catalog_relative_resource_name(
+                'system=bigquery'))
+
+        self.assertEqual(1, datacatalog_client.search_catalog.call_count)
+        self.assertEqual(expected_resource_names, resource_names)
+
+    def test_get_tag_field_values_for_search_results_should_return_values(
+            self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.search_catalog.side_effect = \
+            lambda *args, **kwargs: self.__async_return(FakeAsyncPager([
+                self.__create_search_result('localhost//asset_1'),
+                self.__create_search_result('localhost//asset_2')
+            ]))()
+        datacatalog_client.list_tags.side_effect = \
+            lambda *args, **kwargs: self.__async_return(
+                FakeAsyncPager([self.__create_tag()]))()
+
+        facade = self.__datacatalog_facade
+        values = self.__run(
+            facade.get_tag_field_values_for_search_results(
+                'system=bigquery', 'template', 'string-field',
+                self.__STRING_TYPE))
+
+        self.assertEqual(2, datacatalog_client.list_tags.call_count)
+        self.assertEqual(['Test String Value', 'Test String Value'], values)
+
+        bool_values = self.__run(
+            facade.get_tag_field_values_for_search_results(
+                'system=bigquery', 'template', 'bool-field',
+                datacatalog.FieldType.PrimitiveType.BOOL))
+        double_values = self.__run(
+            facade.get_tag_field_values_for_search_results(
+                'system=bigquery', 'template', 'double-field',
+                datacatalog.FieldType.PrimitiveType.DOUBLE))
+        enum_values = self.__run(
+            facade.get_tag_field_values_for_search_results(
+                'system=bigquery', 'template', 'enum-field', datacatalog.
+                FieldType.PrimitiveType.PRIMITIVE_TYPE_UNSPECIFIED))
+        timestamp_values = self.__run(
+            facade.get_tag_field_values_for_search_results(
+                'system=bigquery', 'template', 'timestamp-field',
+                datacatalog.FieldType.PrimitiveType.TIMESTAMP))
+
+        self.assertEqual([True, True], bool_values)
+        self.assertEqual([1.0, 1.0], double_values)
+        self.assertEqual(['Test ENUM Value', 'Test ENUM Value'], enum_values)
+        self.assertEqual(1567778400, timestamp_values[0].timestamp())
+
+    @classmethod
+    def __mock_client_calls(cls, datacatalog_client):
+        for method_name in ('create_entry', 'get_entry', 'lookup_entry',
+                            'update_entry', 'delete_entry',
+                            'create_entry_group', 'delete_entry_group',
+                            'create_tag_template', 'get_tag_template',
+                            'delete_tag_template', 'create_tag', 'delete_tag',
+                            'update_tag'):
+            getattr(datacatalog_client, method_name).side_effect = \
+                cls.__async_return(mock.MagicMock())
+
+        datacatalog_client.list_tags.side_effect = cls.__async_return(
+            FakeAsyncPager([]))
+        datacatalog_client.search_catalog.side_effect = cls.__async_return(
+            FakeAsyncPager([]))
+
+    @classmethod
+    def __async_return(cls, value):
+
+        async def coroutine(*args, **kwargs):
+            return value
+
+        return coroutine
+
+    @classmethod
+    def __async_raise(cls, error):
+
+        async def coroutine(*args, **kwargs):
+            raise error
+
+        return coroutine
+
+    @classmethod
+    def __run(cls, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    @classmethod
+    def __create_entry(cls, linked_resource='linked_resource'):
+        return utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            linked_resource, 11, 22)
+
+    @classmethod
+    def __create_tag(cls):
+        tag = datacatalog.Tag()
+        tag.name = 'tag_template'
+        tag.template = 'template'
+
+        bool_field = datacatalog.TagField()
+        bool_field.bool_value = True
+        tag.fields['bool-field'] = bool_field
+
+        double_field = datacatalog.TagField()
+        double_field.double_value = 1
+        tag.fields['double-field'] = double_field
+
+        string_field = datacatalog.TagField()
+        string_field.string_value = 'Test String Value'
+        tag.fields['string-field'] = string_field
+
+        timestamp = timestamp_pb2.Timestamp()
+        timestamp.FromJsonString('2019-09-06T11:00:00-03:00')
+        timestamp_field = datacatalog.TagField()
+        timestamp_field.timestamp_value = timestamp
+        tag.fields['timestamp-field'] = timestamp_field
+
+        enum_field = datacatalog.TagField()
+        enum_field.enum_value.display_name = 'Test ENUM Value'
+        tag.fields['enum-field'] = enum_field
+
+        return tag
+
+    @classmethod
+    def __create_search_result(cls, relative_resource_name):
+        search_result = datacatalog.SearchCatalogResult()
+        search_result.relative_resource_name = relative_resource_name
+        return search_result
@@ -14,10 +14,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tempfile
 import unittest
 
 from google.datacatalog_connectors.commons_test import utils
+from google.datacatalog_connectors import commons
 from google.datacatalog_connectors.commons import cleanup
+from google.datacatalog_connectors.commons import state
 import mock
 
 from google.api_core import exceptions
@@ -37,19 +41,32 @@ class DataCatalogMetadataCleanerTestCase(unittest.TestCase):
         # to self.__metadata_cleaner.__datacatalog_facade
         self.__datacatalog_facade = mock_datacatalog_facade.return_value
 
+    @mock.patch(
+        '{}.datacatalog_facade.DataCatalogFacade'.format(__COMMONS_PACKAGE))
+    def test_constructor_should_pass_client_provider_to_facade(
+            self, mock_datacatalog_facade):  # noqa: E125
+
+        client_provider = commons.DataCatalogClientProvider()
+
+        cleanup.DataCatalogMetadataCleaner('project-id', 'location-id',
+                                           'entry_group_id', client_provider)
+
+        mock_datacatalog_facade.assert_called_once_with(
+            'project-id', client_provider=client_provider)
+
     def test_delete_obsolete_no_deleted_entries_should_not_clean_up(self):
         entries = \
             utils.Utils.create_assembled_entries_user_defined_types()
 
         datacatalog_facade = self.__datacatalog_facade
-        datacatalog_facade.search_catalog_relative_resource_name\
+        datacatalog_facade.iter_search_catalog_relative_resource_name\
             .return_value = ['name_1']
 
         self.__metadata_cleaner.delete_obsolete_metadata(
             entries, self.__SEARCH_QUERY)
 
         self.assertEqual(
-            1, datacatalog_facade.search_catalog_relative_resource_name.
+            1, datacatalog_facade.iter_search_catalog_relative_resource_name.
             call_count)
         datacatalog_facade.delete_entry.assert_not_called()
         datacatalog_facade.delete_entry_group.assert_not_called()
@@ -59,14 +76,14 @@ class DataCatalogMetadataCleanerTestCase(unittest.TestCase):
             utils.Utils.create_assembled_entries_user_defined_types()
 
         datacatalog_facade = self.__datacatalog_facade
-        datacatalog_facade.search_catalog_relative_resource_name\
+        datacatalog_facade.iter_search_catalog_relative_resource_name\
             .return_value = ['deleted_entry_name_1', 'deleted_entry_name_2']
 
         self.__metadata_cleaner.delete_obsolete_metadata(
             entries, self.__SEARCH_QUERY)
 
         self.assertEqual(
-            1, datacatalog_facade.search_catalog_relative_resource_name.
+            1, datacatalog_facade.iter_search_catalog_relative_resource_name.
             call_count)
         self.assertEqual(2, datacatalog_facade.delete_entry.call_count)
         datacatalog_facade.delete_entry_group.assert_not_called()
@@ -75,7 +92,7 @@ class DataCatalogMetadataCleanerTestCase(unittest.TestCase):
         entries = []
 
         datacatalog_facade = self.__datacatalog_facade
-        datacatalog_facade.search_catalog_relative_resource_name\
+        datacatalog_facade.iter_search_catalog_relative_resource_name\
             .return_value = [
                 'projects/uat-env-1/locations/us-central1/'
                 'entryGroups/system/entries/database',
@@ -87,11 +104,58 @@ class DataCatalogMetadataCleanerTestCase(unittest.TestCase):
             entries, self.__SEARCH_QUERY)
 
         self.assertEqual(
-            1, datacatalog_facade.search_catalog_relative_resource_name.
+            1, datacatalog_facade.iter_search_catalog_relative_resource_name.
             call_count)
         self.assertEqual(2, datacatalog_facade.delete_entry.call_count)
         self.assertEqual(1, datacatalog_facade.delete_entry_group.call_count)
 
+    def test_delete_obsolete_with_state_store_config_should_forget_entry_group(  # noqa:E501
+            self):
+        entry_group_name = \
+            'projects/uat-env-1/locations/us-central1/entryGroups/system'
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.iter_search_catalog_relative_resource_name\
+            .return_value = ['{}/entries/table'.format(entry_group_name)]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_store_path = os.path.join(temp_dir, 'state.db')
+            state_store = state.IngestionStateStore(state_store_path)
+            state_store.save_resource(entry_group_name)
+            state_store.close()
+
+            self.__metadata_cleaner.delete_obsolete_metadata(
+                [], self.__SEARCH_QUERY,
+                {'state_store': {
+                    'path': state_store_path
+                }})
+
+            state_store = state.IngestionStateStore(state_store_path)
+            self.assertFalse(state_store.is_resource_known(entry_group_name))
+            state_store.close()
+
+    def test_delete_obsolete_should_stream_search_results(self):
+        entries = \
+            utils.Utils.create_assembled_entries_user_defined_types()
+
+        def search_results():
+            for index in range(3):
+                # Entries are only deleted after the search completes.
+                datacatalog_facade.delete_entry.assert_not_called()
+                yield 'projects/uat-env-1/locations/us-central1/' \
+                      'entryGroups/system/entries/table_{}'.format(index)
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.iter_search_catalog_relative_resource_name\
+            .return_value = search_results()
+
+        self.__metadata_cleaner.delete_obsolete_metadata(
+            entries, self.__SEARCH_QUERY)
+
+        self.assertEqual(3, datacatalog_facade.delete_entry.call_count)
+        datacatalog_facade.delete_entry_group.assert_called_once_with(
+            'projects/uat-env-1/locations/us-central1/entryGroups/system')
+
     def test_delete_metadata_should_succeed(self):
         entries = \
             utils.Utils.create_assembled_entries_user_defined_types()
@@ -101,6 +165,55 @@ class DataCatalogMetadataCleanerTestCase(unittest.TestCase):
         datacatalog_facade = self.__datacatalog_facade
         self.assertEqual(2, datacatalog_facade.delete_entry.call_count)
 
+    def test_delete_obsolete_with_state_store_config_should_forget_entries(
+            self):
+        entry_name = 'projects/uat-env-1/locations/us-central1/' \
+                     'entryGroups/system/entries/table'
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.iter_search_catalog_relative_resource_name\
+            .return_value = [entry_name]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_store_path = os.path.join(temp_dir, 'state.db')
+            state_store = state.IngestionStateStore(state_store_path)
+            state_store.save(entry_name, 'fingerprint')
+            state_store.close()
+
+            self.__metadata_cleaner.delete_obsolete_metadata(
+                [], self.__SEARCH_QUERY,
+                {'state_store': {
+                    'path': state_store_path
+                }})
+
+            state_store = state.IngestionStateStore(state_store_path)
+            self.assertFalse(
+                state_store.is_up_to_date(entry_name, 'fingerprint'))
+            state_store.close()
+
+    def test_delete_metadata_with_state_store_config_should_forget_entries(
+            self):
+        entries = \
+            utils.Utils.create_assembled_entries_user_defined_types()
+        entry_name = 'projects/project-id/locations/location-id/' \
+                     'entryGroups/entry_group_id/entries/entry_1'
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_store_path = os.path.join(temp_dir, 'state.db')
+            state_store = state.IngestionStateStore(state_store_path)
+            state_store.save(entry_name, 'fingerprint')
+            state_store.close()
+
+            self.__metadata_cleaner.delete_metadata(
+                entries, {'state_store': {
+                    'path': state_store_path
+                }})
+
+            state_store = state.IngestionStateStore(state_store_path)
+            self.assertFalse(
+                state_store.is_up_to_date(entry_name, 'fingerprint'))
+            state_store.close()
+
     def test_delete_metadata_no_entries_should_succeed(self):
         self.__metadata_cleaner.delete_metadata([])
 
@@ -111,7 +224,7 @@ class DataCatalogMetadataCleanerTestCase(unittest.TestCase):
         entries = []
 
         datacatalog_facade = self.__datacatalog_facade
-        datacatalog_facade.search_catalog_relative_resource_name\
+        datacatalog_facade.iter_search_catalog_relative_resource_name\
             .return_value = [
                 'projects/uat-env-1/locations/us-central1/'
                 'entryGroups/system/entries/database',
@@ -126,7 +239,7 @@ class DataCatalogMetadataCleanerTestCase(unittest.TestCase):
             entries, self.__SEARCH_QUERY)
 
         self.assertEqual(
-            1, datacatalog_facade.search_catalog_relative_resource_name.
+            1, datacatalog_facade.iter_search_catalog_relative_resource_name.
             call_count)
         self.assertEqual(2, datacatalog_facade.delete_entry.call_count)
         self.assertEqual(1, datacatalog_facade.delete_entry_group.call_count)
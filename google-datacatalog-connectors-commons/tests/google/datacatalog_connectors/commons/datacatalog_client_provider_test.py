@@ -0,0 +1,90 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import mock
+
+from google.datacatalog_connectors import commons
+
+
+class DataCatalogClientProviderTestCase(unittest.TestCase):
+
+    def test_get_client_should_create_clients_on_first_use(self):
+        client_factory = mock.MagicMock()
+
+        provider = commons.DataCatalogClientProvider(
+            pool_size=2, client_factory=client_factory)
+        client_factory.assert_not_called()
+
+        provider.get_client()
+        self.assertEqual(2, client_factory.call_count)
+
+    def test_get_client_should_return_clients_in_round_robin(self):
+        clients = ['client_1', 'client_2']
+        provider = commons.DataCatalogClientProvider(
+            pool_size=2, client_factory=mock.MagicMock(side_effect=clients))
+
+        self.assertEqual(['client_1', 'client_2', 'client_1'],
+                         [provider.get_client() for _ in range(3)])
+
+    def test_get_client_should_be_thread_safe(self):
+        client_factory = mock.MagicMock(side_effect=lambda: object())
+        provider = commons.DataCatalogClientProvider(
+            pool_size=4, client_factory=client_factory)
+        clients = []
+
+        def get_clients():
+            for _ in range(100):
+                clients.append(provider.get_client())
+
+        threads = [threading.Thread(target=get_clients) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(4, client_factory.call_count)
+        self.assertEqual(4, len(set(clients)))
+
+    @mock.patch('google.datacatalog_connectors.commons.'
+                'datacatalog_client_provider.datacatalog.DataCatalogClient')
+    def test_shared_should_return_same_provider(self, mock_client):
+        provider = commons.DataCatalogClientProvider.shared()
+
+        self.assertIs(provider, commons.DataCatalogClientProvider.shared())
+
+    @mock.patch('google.datacatalog_connectors.commons.'
+                'datacatalog_client_provider.datacatalog.DataCatalogClient')
+    def test_default_clients_should_use_own_connections(self, mock_client):
+        transport_class = mock_client.get_transport_class.return_value
+        transport_class.create_channel.side_effect = ['channel_1', 'channel_2']
+
+        provider = commons.DataCatalogClientProvider(pool_size=2)
+        provider.get_client()
+
+        mock_client.get_transport_class.assert_called_with('grpc')
+        self.assertEqual(2, transport_class.create_channel.call_count)
+        for create_channel_call in transport_class.create_channel.mock_calls:
+            self.assertIn(('grpc.use_local_subchannel_pool', 1),
+                          create_channel_call.kwargs['options'])
+        transport_class.assert_has_calls(
+            [mock.call(channel='channel_1'),
+             mock.call(channel='channel_2')],
+            any_order=True)
+        self.assertEqual(2, mock_client.call_count)
+        mock_client.assert_called_with(transport=transport_class.return_value)
@@ -14,21 +14,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 import unittest
 
 import mock
 from google.api_core import exceptions
 from google.cloud import datacatalog
 from google.datacatalog_connectors.commons_test import utils
+from google.protobuf import field_mask_pb2
 from google.protobuf import timestamp_pb2
 
 from google.datacatalog_connectors import commons
+from google.datacatalog_connectors.commons import state
 
 
 class DataCatalogFacadeTestCase(unittest.TestCase):
     __COMMONS_PACKAGE = 'google.datacatalog_connectors.commons'
     __SEARCH_CATALOG_METHOD = '{}.DataCatalogFacade.search_catalog'.format(
         __COMMONS_PACKAGE)
+    __ITER_SEARCH_CATALOG_METHOD = \
+        '{}.DataCatalogFacade.iter_search_catalog'.format(__COMMONS_PACKAGE)
 
     __BOOL_TYPE = datacatalog.FieldType.PrimitiveType.BOOL
     __DOUBLE_TYPE = datacatalog.FieldType.PrimitiveType.DOUBLE
@@ -37,21 +42,52 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
     __NON_PRIMITIVE_TYPE = datacatalog.FieldType.PrimitiveType.\
         PRIMITIVE_TYPE_UNSPECIFIED
 
-    @mock.patch('{}.datacatalog_facade.datacatalog.DataCatalogClient'.format(
-        __COMMONS_PACKAGE))
-    def setUp(self, mock_datacatalog_client):
+    def setUp(self):
+        # The client is created on first use, so it is patched for the
+        # whole test.
+        client_patcher = mock.patch(
+            '{}.datacatalog_facade.datacatalog.DataCatalogClient'.format(
+                self.__COMMONS_PACKAGE))
+        self.__mock_datacatalog_client = client_patcher.start()
+        self.addCleanup(client_patcher.stop)
+
         self.__datacatalog_facade = commons \
             .DataCatalogFacade('test-project')
         # Shortcut for the object assigned
         # to self.__datacatalog_facade.__datacatalog
-        self.__datacatalog_client = mock_datacatalog_client.return_value
+        self.__datacatalog_client = \
+            self.__mock_datacatalog_client.return_value
+        self.__set_up_empty_pages(self.__datacatalog_client)
 
     def test_constructor_should_set_instance_attributes(self):
         attrs = self.__datacatalog_facade.__dict__
-        self.assertIsNotNone(attrs['_DataCatalogFacade__datacatalog'])
+        self.assertIsNone(attrs['_DataCatalogFacade__datacatalog'])
         self.assertEqual('test-project',
                          attrs['_DataCatalogFacade__project_id'])
 
+    def test_client_should_be_created_once_on_first_use(self):
+        self.__mock_datacatalog_client.assert_not_called()
+
+        self.__datacatalog_facade.get_entry('entry_name_1')
+        self.__datacatalog_facade.get_entry('entry_name_2')
+
+        self.__mock_datacatalog_client.assert_called_once_with()
+        self.assertEqual(2, self.__datacatalog_client.get_entry.call_count)
+
+    def test_client_provider_should_spread_requests_over_its_clients(self):
+        clients = [mock.MagicMock(), mock.MagicMock()]
+        client_provider = commons.DataCatalogClientProvider(
+            pool_size=2, client_factory=mock.MagicMock(side_effect=clients))
+        facade = commons.DataCatalogFacade('test-project',
+                                           client_provider=client_provider)
+
+        facade.get_entry('entry_name_1')
+        facade.get_entry('entry_name_2')
+
+        clients[0].get_entry.assert_called_once_with(name='entry_name_1')
+        clients[1].get_entry.assert_called_once_with(name='entry_name_2')
+        self.__datacatalog_client.get_entry.assert_not_called()
+
     def test_create_entry_should_succeed(self):
         entry = utils.Utils.create_entry_user_defined_type(
             'type', 'system', 'display_name', 'name', 'description',
@@ -78,6 +114,118 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
 
         self.assertEqual(1, datacatalog_client.create_entry.call_count)
 
+    def test_rate_limiter_should_throttle_requests_by_budget(self):
+        rate_limiter = mock.MagicMock()
+        facade = self.__datacatalog_facade
+        facade.set_rate_limiter(rate_limiter)
+
+        facade.get_entry('entry_name')
+        facade.delete_tag(datacatalog.Tag())
+        facade.search_catalog('query')
+
+        self.assertEqual([
+            mock.call(commons.utils.RateLimiter.READ),
+            mock.call(commons.utils.RateLimiter.WRITE),
+            mock.call(commons.utils.RateLimiter.SEARCH)
+        ], rate_limiter.acquire.call_args_list)
+
+    def test_rate_limiter_should_throttle_every_page(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.side_effect = [
+            datacatalog.ListTagsResponse(tags=[self.__create_tag()],
+                                         next_page_token='page_2'),
+            datacatalog.ListTagsResponse(tags=[self.__create_tag()])
+        ]
+        datacatalog_client.list_entries.side_effect = [
+            datacatalog.ListEntriesResponse(next_page_token='page_2'),
+            datacatalog.ListEntriesResponse(next_page_token='page_3'),
+            datacatalog.ListEntriesResponse()
+        ]
+        rate_limiter = mock.MagicMock()
+        facade = self.__datacatalog_facade
+        facade.set_rate_limiter(rate_limiter)
+
+        tags = facade.list_tags('entry_name')
+        list(facade.list_entries('entry_group_name'))
+
+        self.assertEqual(2, len(tags))
+        self.assertEqual(
+            'page_2', datacatalog_client.list_tags.call_args.kwargs['request'].
+            page_token)
+        self.assertEqual(5, rate_limiter.acquire.call_count)
+        rate_limiter.acquire.assert_called_with(commons.utils.RateLimiter.READ)
+
+    def test_retry_policy_should_retry_transient_errors(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = [
+            exceptions.ServiceUnavailable('Service unavailable'),
+            datacatalog.Entry()
+        ]
+        rate_limiter = mock.MagicMock()
+        facade = self.__datacatalog_facade
+        facade.set_rate_limiter(rate_limiter)
+        facade.set_retry_policy(
+            commons.utils.RetryPolicy(sleep=mock.MagicMock()))
+
+        facade.get_entry('entry_name')
+
+        self.assertEqual(2, datacatalog_client.get_entry.call_count)
+        self.assertEqual(2, rate_limiter.acquire.call_count)
+
+    def test_retry_policy_should_disable_client_retries(self):
+        datacatalog_client = self.__datacatalog_client
+        facade = self.__datacatalog_facade
+        facade.set_retry_policy(
+            commons.utils.RetryPolicy(
+                method_deadlines_seconds={'get_entry': 10}))
+
+        facade.get_entry('entry_name')
+        facade.lookup_entry('linked_resource')
+
+        datacatalog_client.get_entry.assert_called_once_with(name='entry_name',
+                                                             retry=None,
+                                                             timeout=10)
+        lookup_kwargs = datacatalog_client.lookup_entry.call_args.kwargs
+        self.assertIsNone(lookup_kwargs['retry'])
+        self.assertEqual(60, lookup_kwargs['timeout'])
+
+    def test_retry_policy_should_retry_failed_pages_only(self):
+        search_results = [
+            self.__create_search_result('localhost//asset_1'),
+            self.__create_search_result('localhost//asset_2')
+        ]
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.search_catalog.side_effect = [
+            datacatalog.SearchCatalogResponse(results=search_results[:1],
+                                              next_page_token='page_2'),
+            exceptions.ServiceUnavailable('Service unavailable'),
+            datacatalog.SearchCatalogResponse(results=search_results[1:])
+        ]
+        facade = self.__datacatalog_facade
+        facade.set_retry_policy(
+            commons.utils.RetryPolicy(sleep=mock.MagicMock()))
+
+        results = facade.search_catalog('query')
+
+        self.assertEqual(search_results, results)
+        self.assertEqual(3, datacatalog_client.search_catalog.call_count)
+        search_request = \
+            datacatalog_client.search_catalog.call_args.kwargs['request']
+        self.assertEqual('page_2', search_request.page_token)
+
+    def test_retry_policy_should_not_retry_terminal_errors(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = \
+            exceptions.PermissionDenied('Permission denied')
+        facade = self.__datacatalog_facade
+        facade.set_retry_policy(
+            commons.utils.RetryPolicy(sleep=mock.MagicMock()))
+
+        self.assertRaises(exceptions.PermissionDenied, facade.get_entry,
+                          'entry_name')
+        self.assertEqual(1, datacatalog_client.get_entry.call_count)
+
     def test_get_entry_should_succeed(self):
         self.__datacatalog_facade.get_entry('entry_name')
 
@@ -108,7 +256,16 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.__datacatalog_facade.update_entry({})
 
         datacatalog_client = self.__datacatalog_client
-        self.assertEqual(1, datacatalog_client.update_entry.call_count)
+        datacatalog_client.update_entry.assert_called_once_with(
+            entry={}, update_mask=None)
+
+    def test_update_entry_with_update_mask_should_send_field_mask(self):
+        self.__datacatalog_facade.update_entry({}, ['description'])
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.update_entry.assert_called_once_with(
+            entry={},
+            update_mask=field_mask_pb2.FieldMask(paths=['description']))
 
     def test_upsert_entry_nonexistent_should_create(self):
         datacatalog_client = self.__datacatalog_client
@@ -163,8 +320,13 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
 
         self.assertEqual(1, datacatalog_client.get_entry.call_count)
         self.assertEqual(1, datacatalog_client.update_entry.call_count)
-        datacatalog_client.update_entry.assert_called_with(entry=entry_2,
-                                                           update_mask=None)
+        update_entry_kwargs = datacatalog_client.update_entry.call_args.kwargs
+        self.assertEqual(['linked_resource'],
+                         update_entry_kwargs['update_mask'].paths)
+        self.assertEqual('linked_resource_2',
+                         update_entry_kwargs['entry'].linked_resource)
+        # The unchanged fields are not sent.
+        self.assertFalse(update_entry_kwargs['entry'].description)
 
     def test_upsert_entry_columns_equal_should_not_call_api(self):
         col_1 = utils.Utils.create_column_schema('column_1', 'int',
@@ -219,8 +381,9 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(1, datacatalog_client.get_entry.call_count)
         datacatalog_client.create_entry.assert_not_called()
         self.assertEqual(1, datacatalog_client.update_entry.call_count)
-        datacatalog_client.update_entry.assert_called_with(entry=entry_2,
-                                                           update_mask=None)
+        update_entry_kwargs = datacatalog_client.update_entry.call_args.kwargs
+        self.assertEqual(['schema'], update_entry_kwargs['update_mask'].paths)
+        self.assertEqual(entry_2.schema, update_entry_kwargs['entry'].schema)
 
     def test_upsert_entry_column_deleted_should_update(self):
         col_1 = utils.Utils.create_column_schema('column_1', 'int',
@@ -248,8 +411,9 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(1, datacatalog_client.get_entry.call_count)
         datacatalog_client.create_entry.assert_not_called()
         self.assertEqual(1, datacatalog_client.update_entry.call_count)
-        datacatalog_client.update_entry.assert_called_with(entry=entry_2,
-                                                           update_mask=None)
+        update_entry_kwargs = datacatalog_client.update_entry.call_args.kwargs
+        self.assertEqual(['schema'], update_entry_kwargs['update_mask'].paths)
+        self.assertEqual(entry_2.schema, update_entry_kwargs['entry'].schema)
 
     def test_upsert_entry_column_added_should_update(self):
         col_1 = utils.Utils.create_column_schema('column_1', 'int',
@@ -279,8 +443,9 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(1, datacatalog_client.get_entry.call_count)
         datacatalog_client.create_entry.assert_not_called()
         self.assertEqual(1, datacatalog_client.update_entry.call_count)
-        datacatalog_client.update_entry.assert_called_with(entry=entry_2,
-                                                           update_mask=None)
+        update_entry_kwargs = datacatalog_client.update_entry.call_args.kwargs
+        self.assertEqual(['schema'], update_entry_kwargs['update_mask'].paths)
+        self.assertEqual(entry_2.schema, update_entry_kwargs['entry'].schema)
 
     def test_upsert_entry_subcolumn_added_should_update(self):
         col_1 = utils.Utils.create_column_schema('column_1', 'int',
@@ -311,8 +476,9 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(1, datacatalog_client.get_entry.call_count)
         datacatalog_client.create_entry.assert_not_called()
         self.assertEqual(1, datacatalog_client.update_entry.call_count)
-        datacatalog_client.update_entry.assert_called_with(entry=entry_2,
-                                                           update_mask=None)
+        update_entry_kwargs = datacatalog_client.update_entry.call_args.kwargs
+        self.assertEqual(['schema'], update_entry_kwargs['update_mask'].paths)
+        self.assertEqual(entry_2.schema, update_entry_kwargs['entry'].schema)
 
     def test_upsert_entry_subcolumn_deleted_should_update(self):
         col_1 = utils.Utils.create_column_schema('column_1', 'int',
@@ -344,8 +510,9 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(1, datacatalog_client.get_entry.call_count)
         datacatalog_client.create_entry.assert_not_called()
         self.assertEqual(1, datacatalog_client.update_entry.call_count)
-        datacatalog_client.update_entry.assert_called_with(entry=entry_2,
-                                                           update_mask=None)
+        update_entry_kwargs = datacatalog_client.update_entry.call_args.kwargs
+        self.assertEqual(['schema'], update_entry_kwargs['update_mask'].paths)
+        self.assertEqual(entry_2.schema, update_entry_kwargs['entry'].schema)
 
     def test_upsert_entry_should_raise_on_failed_precondition(self):
         entry_1 = utils.Utils.create_entry_user_defined_type(
@@ -382,6 +549,230 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(1, datacatalog_client.get_entry.call_count)
         datacatalog_client.update_entry.assert_not_called()
 
+    def test_upsert_entry_create_first_nonexistent_should_not_get(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                               'entry_id',
+                                               entry,
+                                               strategy='create_first')
+
+        datacatalog_client = self.__datacatalog_client
+        self.assertEqual(1, datacatalog_client.create_entry.call_count)
+        datacatalog_client.get_entry.assert_not_called()
+
+    def test_upsert_entry_create_first_existing_should_update(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.create_entry.side_effect = \
+            exceptions.AlreadyExists('Entry already exists')
+        datacatalog_client.get_entry.return_value = \
+            utils.Utils.create_entry_user_defined_type(
+                'type', 'system', 'display_name', 'name', 'description',
+                'linked_resource_1', 11, 22)
+
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource_2', 11, 22)
+
+        self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                               'entry_id',
+                                               entry,
+                                               strategy='create_first')
+
+        self.assertEqual(1, datacatalog_client.create_entry.call_count)
+        datacatalog_client.get_entry.assert_called_once_with(
+            name='entry_group_name/entries/entry_id')
+        self.assertEqual(1, datacatalog_client.update_entry.call_count)
+
+    def test_upsert_entry_create_first_should_raise_on_failed_precondition(
+            self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.create_entry.side_effect = \
+            exceptions.AlreadyExists('Entry already exists')
+        datacatalog_client.get_entry.return_value = \
+            utils.Utils.create_entry_user_defined_type(
+                'type', 'system', 'display_name', 'name', 'description',
+                'linked_resource_1', 11, 22)
+        datacatalog_client.update_entry.side_effect = \
+            exceptions.FailedPrecondition('Failed precondition')
+
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource_2', 11, 22)
+
+        self.assertRaises(exceptions.FailedPrecondition,
+                          self.__datacatalog_facade.upsert_entry,
+                          'entry_group_name',
+                          'entry_id',
+                          entry,
+                          strategy='create_first')
+
+    def test_upsert_entry_auto_should_switch_strategy_on_new_entries(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.side_effect = \
+            exceptions.PermissionDenied('Entry not found')
+
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        for _ in range(3):
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'entry_id',
+                                                   entry,
+                                                   strategy='auto')
+
+        # Only the first Entry is read, since none of them exist.
+        self.assertEqual(1, datacatalog_client.get_entry.call_count)
+        self.assertEqual(3, datacatalog_client.create_entry.call_count)
+
+    def test_upsert_entry_auto_should_keep_get_first_on_existing_entries(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_entry.return_value = entry
+
+        for _ in range(3):
+            self.__datacatalog_facade.upsert_entry('entry_group_name',
+                                                   'entry_id',
+                                                   entry,
+                                                   strategy='auto')
+
+        self.assertEqual(3, datacatalog_client.get_entry.call_count)
+        datacatalog_client.create_entry.assert_not_called()
+
+    def test_list_entries_should_fulfill_request_fields(self):
+        list(self.__datacatalog_facade.list_entries('entry_group_name'))
+
+        expected_request = datacatalog.ListEntriesRequest()
+        expected_request.parent = 'entry_group_name'
+        expected_request.page_size = 1000
+        self.__datacatalog_client.list_entries.assert_called_once_with(
+            request=expected_request)
+
+    def test_upsert_entry_prefetched_should_not_get(self):
+        existing_entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name',
+            'entry_group_name/entries/existing', 'description',
+            'linked_resource_1', 11, 22)
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_entries.return_value = \
+            datacatalog.ListEntriesResponse(entries=[existing_entry])
+        datacatalog_client.create_entry.side_effect = \
+            lambda parent, entry_id, entry: entry
+
+        prefetched_entries_count = \
+            self.__datacatalog_facade.prefetch_entries('entry_group_name')
+
+        changed_entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name',
+            'entry_group_name/entries/existing', 'description',
+            'linked_resource_2', 11, 22)
+        new_entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'entry_group_name/entries/new',
+            'description', 'linked_resource_3', 11, 22)
+
+        facade = self.__datacatalog_facade
+        facade.upsert_entry('entry_group_name', 'existing', changed_entry)
+        facade.upsert_entry('entry_group_name', 'new', new_entry)
+        # The created Entry is added to the prefetched ones.
+        facade.upsert_entry('entry_group_name', 'new', new_entry)
+
+        self.assertEqual(1, prefetched_entries_count)
+        datacatalog_client.get_entry.assert_not_called()
+        self.assertEqual(1, datacatalog_client.update_entry.call_count)
+        self.assertEqual(1, datacatalog_client.create_entry.call_count)
+
+    def test_upsert_entry_prefetched_created_by_other_writer_should_update(
+            self):  # noqa: E125
+        entry_name = 'entry_group_name/entries/entry_id'
+        persisted_entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', entry_name, 'description',
+            'linked_resource_1', 11, 22)
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', entry_name, 'description',
+            'linked_resource_2', 11, 22)
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.create_entry.side_effect = \
+            exceptions.AlreadyExists('Already exists')
+        datacatalog_client.get_entry.return_value = persisted_entry
+        datacatalog_client.update_entry.return_value = entry
+
+        facade = self.__datacatalog_facade
+        facade.prefetch_entries('entry_group_name')
+
+        self.assertEqual(
+            entry, facade.upsert_entry('entry_group_name', 'entry_id', entry))
+        datacatalog_client.get_entry.assert_called_once_with(name=entry_name)
+        self.assertEqual(1, datacatalog_client.update_entry.call_count)
+        self.assertEqual(entry, facade.get_prefetched_entry(entry_name))
+
+    def test_upsert_entry_prefetched_should_raise_on_failed_precondition(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name',
+            'entry_group_name/entries/entry_id', 'description',
+            'linked_resource_1', 11, 22)
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_entries.return_value = \
+            datacatalog.ListEntriesResponse(entries=[entry])
+        datacatalog_client.update_entry.side_effect = \
+            exceptions.FailedPrecondition('Failed precondition')
+
+        self.__datacatalog_facade.prefetch_entries('entry_group_name')
+
+        changed_entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name',
+            'entry_group_name/entries/entry_id', 'description',
+            'linked_resource_2', 11, 22)
+
+        self.assertRaises(exceptions.FailedPrecondition,
+                          self.__datacatalog_facade.upsert_entry,
+                          'entry_group_name', 'entry_id', changed_entry)
+
+    def test_delete_entry_should_remove_prefetched_entry(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name',
+            'entry_group_name/entries/entry_id', 'description',
+            'linked_resource', 11, 22)
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_entries.return_value = \
+            datacatalog.ListEntriesResponse(entries=[entry])
+
+        facade = self.__datacatalog_facade
+        facade.prefetch_entries('entry_group_name')
+        facade.delete_entry('entry_group_name/entries/entry_id')
+        facade.upsert_entry('entry_group_name', 'entry_id', entry)
+
+        self.assertEqual(1, datacatalog_client.create_entry.call_count)
+
+    def test_get_prefetched_entry_should_return_prefetched_entries_only(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name',
+            'entry_group_name/entries/entry_id', 'description',
+            'linked_resource', 11, 22)
+
+        self.__datacatalog_client.list_entries.return_value = \
+            datacatalog.ListEntriesResponse(entries=[entry])
+
+        facade = self.__datacatalog_facade
+        facade.prefetch_entries('entry_group_name')
+
+        self.assertEqual(
+            entry,
+            facade.get_prefetched_entry('entry_group_name/entries/entry_id'))
+        self.assertIsNone(
+            facade.get_prefetched_entry('entry_group_name/entries/other'))
+        self.assertIsNone(
+            facade.get_prefetched_entry('other_group_name/entries/entry_id'))
+
     def test_delete_entry_should_succeed(self):
         self.__datacatalog_facade.delete_entry('entry_name')
 
@@ -410,6 +801,14 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         datacatalog_client = self.__datacatalog_client
         self.assertEqual(1, datacatalog_client.delete_entry_group.call_count)
 
+    def test_delete_entry_group_should_forget_known_entry_group(self):
+        known_resources = state.KnownResourcesRegistry.shared()
+        known_resources.add('entry_group_name')
+
+        self.__datacatalog_facade.delete_entry_group('entry_group_name')
+
+        self.assertNotIn('entry_group_name', known_resources)
+
     def test_create_tag_template_should_succeed(self):
         self.__datacatalog_facade.create_tag_template('location-id',
                                                       'tag_template_id', {})
@@ -423,12 +822,126 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         datacatalog_client = self.__datacatalog_client
         self.assertEqual(1, datacatalog_client.get_tag_template.call_count)
 
+    def test_get_tag_template_should_not_cache_if_disabled(self):
+        facade = self.__datacatalog_facade
+        facade.get_tag_template('tag_template_name')
+        facade.get_tag_template('tag_template_name')
+
+        datacatalog_client = self.__datacatalog_client
+        self.assertEqual(2, datacatalog_client.get_tag_template.call_count)
+
+    def test_get_tag_template_should_use_cache_if_enabled(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_tag_template.return_value = \
+            self.__create_tag_template('tag_template_name')
+
+        facade = self.__create_facade_with_tag_template_cache()
+        facade.get_tag_template('tag_template_name')
+        facade.get_tag_template('tag_template_name')
+
+        self.assertEqual(1, datacatalog_client.get_tag_template.call_count)
+
+    def test_get_tag_template_should_return_copies_of_cached_templates(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_tag_template.return_value = \
+            self.__create_tag_template('tag_template_name')
+
+        facade = self.__create_facade_with_tag_template_cache()
+        facade.get_tag_template('tag_template_name').display_name = 'changed'
+        cached_tag_template = facade.get_tag_template('tag_template_name')
+        cached_tag_template.display_name = 'changed'
+
+        self.assertEqual(
+            'Template',
+            facade.get_tag_template('tag_template_name').display_name)
+
+    def test_create_tag_template_should_populate_cache(self):
+        datacatalog_client = self.__datacatalog_client
+        created_tag_template = self.__create_tag_template('tag_template_name')
+        datacatalog_client.create_tag_template.return_value = \
+            created_tag_template
+
+        facade = self.__create_facade_with_tag_template_cache()
+        facade.create_tag_template('location-id', 'tag_template_id', {})
+        created_tag_template.display_name = 'changed'
+
+        self.assertEqual(
+            'Template',
+            facade.get_tag_template('tag_template_name').display_name)
+        datacatalog_client.get_tag_template.assert_not_called()
+
+    def test_delete_tag_template_should_invalidate_cache(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.get_tag_template.return_value = \
+            self.__create_tag_template('tag_template_name')
+
+        facade = self.__create_facade_with_tag_template_cache()
+        facade.get_tag_template('tag_template_name')
+        facade.delete_tag_template('tag_template_name')
+        facade.get_tag_template('tag_template_name')
+
+        self.assertEqual(2, datacatalog_client.get_tag_template.call_count)
+
+    def test_prefetch_tag_templates_should_cache_location_templates(self):
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse(results=[
+                self.__create_search_result(
+                    'projects/test-project/locations/'
+                    'location-id/tagTemplates/template_1'),
+                self.__create_search_result(
+                    'projects/test-project/locations/'
+                    'other-location/tagTemplates/template_2')
+            ])
+        datacatalog_client.get_tag_template.return_value = \
+            self.__create_tag_template('template_1')
+
+        facade = self.__create_facade_with_tag_template_cache()
+        prefetched_count = facade.prefetch_tag_templates('location-id')
+        facade.get_tag_template('projects/test-project/locations/location-id/'
+                                'tagTemplates/template_1')
+
+        self.assertEqual(1, prefetched_count)
+        search_request = \
+            datacatalog_client.search_catalog.call_args.kwargs['request']
+        self.assertEqual('type=tag_template', search_request.query)
+        self.assertEqual(1, datacatalog_client.get_tag_template.call_count)
+
+    def test_prefetch_tag_templates_should_do_nothing_if_cache_disabled(self):
+        prefetched_count = \
+            self.__datacatalog_facade.prefetch_tag_templates('location-id')
+
+        datacatalog_client = self.__datacatalog_client
+        self.assertEqual(0, prefetched_count)
+        datacatalog_client.search_catalog.assert_not_called()
+        datacatalog_client.get_tag_template.assert_not_called()
+
+    @classmethod
+    def __create_facade_with_tag_template_cache(cls):
+        return commons.DataCatalogFacade('test-project',
+                                         tag_template_cache_ttl_seconds=60)
+
+    @classmethod
+    def __create_tag_template(cls, name):
+        tag_template = datacatalog.TagTemplate()
+        tag_template.name = name
+        tag_template.display_name = 'Template'
+        return tag_template
+
     def test_delete_tag_template_should_succeed(self):
         self.__datacatalog_facade.delete_tag_template('tag_template_name')
 
         datacatalog_client = self.__datacatalog_client
         self.assertEqual(1, datacatalog_client.delete_tag_template.call_count)
 
+    def test_delete_tag_template_should_forget_known_tag_template(self):
+        known_resources = state.KnownResourcesRegistry.shared()
+        known_resources.add('tag_template_name')
+
+        self.__datacatalog_facade.delete_tag_template('tag_template_name')
+
+        self.assertNotIn('tag_template_name', known_resources)
+
     def test_create_tag_should_succeed(self):
         self.__datacatalog_facade.create_tag('entry_name', {})
 
@@ -455,7 +968,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
 
     def test_upsert_tags_nonexistent_should_succeed(self):
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = []
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[])
 
         entry = utils.Utils.create_entry_user_defined_type(
             'type', 'system', 'display_name', 'name', 'description',
@@ -467,7 +981,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
 
     def test_upsert_tags_changed_should_succeed(self):
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [self.__create_tag()]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[self.__create_tag()])
 
         entry = utils.Utils.create_entry_user_defined_type(
             'type', 'system', 'display_name', 'name', 'description',
@@ -478,6 +993,9 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
 
         datacatalog_client.create_tag.assert_not_called()
         self.assertEqual(1, datacatalog_client.update_tag.call_count)
+        self.assertEqual([
+            'fields'
+        ], datacatalog_client.update_tag.call_args.kwargs['update_mask'].paths)
 
     def test_upsert_tags_changed_column_uppercase_should_succeed(self):
         datacatalog_client = self.__datacatalog_client
@@ -485,7 +1003,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         current_tag = self.__create_tag()
         current_tag.column = 'ABC'
 
-        datacatalog_client.list_tags.return_value = [current_tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[current_tag])
 
         entry = utils.Utils.create_entry_user_defined_type(
             'type', 'system', 'display_name', 'name', 'description',
@@ -509,7 +1028,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         current_tag.column = 'ABC'
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [current_tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[current_tag])
 
         # column name is case insensitive, so it's the same column.
         tag = self.__create_tag()
@@ -528,7 +1048,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[tag])
 
         self.__datacatalog_facade.upsert_tags(entry, [tag])
 
@@ -547,7 +1068,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
 
     def test_delete_tags_nonexistent_should_succeed(self):
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = []
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[])
 
         entry = utils.Utils.create_entry_user_defined_type(
             'type', 'system', 'display_name', 'name', 'description',
@@ -565,7 +1087,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[tag])
 
         self.__datacatalog_facade.delete_tags(entry, [tag],
                                               'nonexistent-template')
@@ -580,7 +1103,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[tag])
 
         self.__datacatalog_facade.delete_tags(entry, [tag], 'template')
 
@@ -594,7 +1118,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         deleted_tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [deleted_tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[deleted_tag])
 
         new_tag = self.__create_tag()
         new_tag.template = 'new_template_2'
@@ -613,6 +1138,197 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         except exceptions.GoogleAPICallError as e:
             super(DataCatalogFacadeTestCase, self).fail(e)
 
+    def test_reconcile_tags_should_create_update_and_delete(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        unchanged_tag = self.__create_tag()
+        unchanged_tag.name = 'unchanged_tag'
+        unchanged_tag.column = 'unchanged'
+
+        changed_tag = self.__create_tag()
+        changed_tag.name = 'changed_tag'
+        changed_tag.column = 'changed'
+
+        obsolete_tag = self.__create_tag()
+        obsolete_tag.name = 'obsolete_tag'
+        obsolete_tag.column = 'obsolete'
+
+        unmanaged_tag = self.__create_tag()
+        unmanaged_tag.name = 'unmanaged_tag'
+        unmanaged_tag.template = 'other'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[
+                unchanged_tag, changed_tag, obsolete_tag, unmanaged_tag
+            ])
+
+        tag_1 = self.__create_tag()
+        tag_1.column = 'unchanged'
+        tag_2 = self.__create_tag()
+        tag_2.column = 'changed'
+        tag_2.fields['bool-field'].bool_value = False
+        tag_3 = self.__create_tag()
+        tag_3.column = 'new'
+
+        self.__datacatalog_facade.reconcile_tags(entry, [tag_1, tag_2, tag_3],
+                                                 'template')
+
+        self.assertEqual(1, datacatalog_client.list_tags.call_count)
+        self.assertEqual(1, datacatalog_client.create_tag.call_count)
+        self.assertEqual(1, datacatalog_client.update_tag.call_count)
+        datacatalog_client.delete_tag.assert_called_once_with(
+            name='obsolete_tag')
+
+    def test_reconcile_tags_column_case_should_not_delete(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        current_tag = self.__create_tag()
+        current_tag.column = 'ABC'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[current_tag])
+
+        tag = self.__create_tag()
+        tag.column = 'abc'
+
+        self.__datacatalog_facade.reconcile_tags(entry, [tag], 'template')
+
+        datacatalog_client.create_tag.assert_not_called()
+        datacatalog_client.update_tag.assert_not_called()
+        datacatalog_client.delete_tag.assert_not_called()
+
+    def test_reconcile_tags_empty_list_should_delete_managed_tags(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[self.__create_tag()])
+
+        self.__datacatalog_facade.reconcile_tags(entry, None, 'template')
+
+        self.assertEqual(1, datacatalog_client.delete_tag.call_count)
+
+    def test_reconcile_tags_should_return_written_tags(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        obsolete_tag = self.__create_tag()
+        obsolete_tag.column = 'obsolete'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[obsolete_tag])
+
+        tag = self.__create_tag()
+
+        result = self.__datacatalog_facade.reconcile_tags(
+            entry, [tag], 'template')
+
+        self.assertTrue(result.succeeded)
+        self.assertEqual([tag], result.created_tags)
+        self.assertEqual([obsolete_tag], result.deleted_tags)
+
+    def test_reconcile_tags_with_max_workers_should_collect_failures(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        changed_tag = self.__create_tag()
+        changed_tag.column = 'changed'
+
+        obsolete_tag = self.__create_tag()
+        obsolete_tag.column = 'obsolete'
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[changed_tag, obsolete_tag])
+        datacatalog_client.create_tag.side_effect = \
+            exceptions.PermissionDenied('Permission denied')
+
+        tag_1 = self.__create_tag()
+        tag_1.column = 'changed'
+        tag_1.fields['bool-field'].bool_value = False
+        tag_2 = self.__create_tag()
+        tag_2.column = 'new_1'
+        tag_3 = self.__create_tag()
+        tag_3.column = 'new_2'
+
+        result = self.__datacatalog_facade.reconcile_tags(
+            entry, [tag_1, tag_2, tag_3], 'template', max_workers=4)
+
+        self.assertEqual(2, datacatalog_client.create_tag.call_count)
+        self.assertEqual(1, datacatalog_client.update_tag.call_count)
+        self.assertEqual(1, datacatalog_client.delete_tag.call_count)
+
+        self.assertFalse(result.succeeded)
+        self.assertEqual([tag_1], result.updated_tags)
+        self.assertEqual([obsolete_tag], result.deleted_tags)
+        self.assertEqual(2, len(result.failures))
+        self.assertEqual({'create'},
+                         {failure.operation for failure in result.failures})
+        self.assertIsInstance(result.failures[0].error,
+                              exceptions.PermissionDenied)
+
+    def test_upsert_tags_with_max_workers_unexpected_error_should_raise(self):
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[])
+        datacatalog_client.create_tag.side_effect = ValueError('Bug')
+
+        self.assertRaises(ValueError,
+                          self.__datacatalog_facade.upsert_tags,
+                          entry, [self.__create_tag()],
+                          max_workers=2)
+
+    def test_reconcile_tags_many_column_tags_should_run_in_linear_time(self):
+        # Microbenchmark: matching 1,500 column Tags took about 20 seconds
+        # when each Tag was compared against every persisted Tag.
+        columns_count = 1500
+
+        persisted_tags = []
+        tags = []
+        for index in range(columns_count):
+            string_field = datacatalog.TagField(string_value=str(index))
+            persisted_tags.append(
+                datacatalog.Tag(name='tag_{}'.format(index),
+                                template='template',
+                                column='COLUMN_{}'.format(index),
+                                fields={'string-field': string_field}))
+            tags.append(
+                datacatalog.Tag(template='template',
+                                column='column_{}'.format(index),
+                                fields={'string-field': string_field}))
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=persisted_tags)
+
+        entry = utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+        start_time = time.perf_counter()
+        self.__datacatalog_facade.reconcile_tags(entry, tags, 'template')
+        elapsed_time = time.perf_counter() - start_time
+
+        datacatalog_client.create_tag.assert_not_called()
+        datacatalog_client.update_tag.assert_not_called()
+        datacatalog_client.delete_tag.assert_not_called()
+        self.assertLess(elapsed_time, 5)
+
     def test_search_results_should_return_values(self):
         expected_return_value = [
             self.__create_search_result('localhost//asset_1'),
@@ -620,13 +1336,189 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         ]
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.search_catalog.return_value = expected_return_value
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse(results=expected_return_value)
 
         return_value = self.__datacatalog_facade.search_catalog('query')
 
         self.assertEqual(1, datacatalog_client.search_catalog.call_count)
         self.assertEqual(expected_return_value, return_value)
 
+    def test_iter_search_catalog_should_fetch_results_lazily(self):
+        expected_return_value = [
+            self.__create_search_result('localhost//asset_1'),
+            self.__create_search_result('localhost//asset_2')
+        ]
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse(results=expected_return_value)
+
+        results = self.__datacatalog_facade.iter_search_catalog('query')
+
+        datacatalog_client.search_catalog.assert_not_called()
+        self.assertEqual(expected_return_value[0], next(results))
+        self.assertEqual(expected_return_value[1], next(results))
+        self.assertEqual(1, datacatalog_client.search_catalog.call_count)
+        search_request = \
+            datacatalog_client.search_catalog.call_args.kwargs['request']
+        self.assertEqual('query', search_request.query)
+
+    def test_iter_search_catalog_should_fetch_pages_lazily(self):
+        search_results = [
+            self.__create_search_result('localhost//asset_1'),
+            self.__create_search_result('localhost//asset_2')
+        ]
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.search_catalog.side_effect = [
+            datacatalog.SearchCatalogResponse(results=search_results[:1],
+                                              next_page_token='page_2'),
+            datacatalog.SearchCatalogResponse(results=search_results[1:])
+        ]
+
+        results = self.__datacatalog_facade.iter_search_catalog('query')
+
+        self.assertEqual(search_results[0], next(results))
+        self.assertEqual(1, datacatalog_client.search_catalog.call_count)
+        self.assertEqual(search_results[1], next(results))
+        self.assertEqual(2, datacatalog_client.search_catalog.call_count)
+
+    @mock.patch('{}.datacatalog_facade.datacatalog.DataCatalogClient'.format(
+        __COMMONS_PACKAGE))
+    def test_search_catalog_should_use_cache_if_enabled(
+            self, mock_datacatalog_client):  # noqa: E125
+
+        facade = commons.DataCatalogFacade('test-project',
+                                           search_cache_ttl_seconds=60)
+        datacatalog_client = mock_datacatalog_client.return_value
+        search_results = [self.__create_search_result('localhost//asset_1')]
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse(results=search_results)
+
+        self.assertEqual(search_results, facade.search_catalog('query'))
+        self.assertEqual(search_results, facade.search_catalog('query'))
+        facade.search_catalog('other query')
+
+        self.assertEqual(2, datacatalog_client.search_catalog.call_count)
+        self.assertEqual({
+            'hits': 1,
+            'misses': 2,
+            'size': 2
+        }, facade.get_search_cache_stats())
+
+    @mock.patch('{}.datacatalog_facade.datacatalog.DataCatalogClient'.format(
+        __COMMONS_PACKAGE))
+    def test_search_catalog_should_not_cache_partially_consumed_results(
+            self, mock_datacatalog_client):  # noqa: E125
+
+        facade = commons.DataCatalogFacade('test-project',
+                                           search_cache_ttl_seconds=60)
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse(results=[
+                self.__create_search_result('localhost//asset_1'),
+                self.__create_search_result('localhost//asset_2')
+            ])
+
+        next(facade.iter_search_catalog('query'))
+        facade.search_catalog('query')
+
+        self.assertEqual(2, datacatalog_client.search_catalog.call_count)
+
+    @mock.patch('{}.datacatalog_facade.datacatalog.DataCatalogClient'.format(
+        __COMMONS_PACKAGE))
+    def test_entry_writes_should_invalidate_search_cache(
+            self, mock_datacatalog_client):  # noqa: E125
+
+        facade = commons.DataCatalogFacade('test-project',
+                                           search_cache_ttl_seconds=60)
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse(results=[])
+
+        facade.search_catalog('query')
+        facade.create_entry('entry_group_name', 'entry_id',
+                            datacatalog.Entry())
+        facade.search_catalog('query')
+        facade.delete_entry('entry_group_name/entries/entry_id')
+        facade.search_catalog('query')
+
+        self.assertEqual(3, datacatalog_client.search_catalog.call_count)
+
+    @mock.patch('{}.datacatalog_facade.datacatalog.DataCatalogClient'.format(
+        __COMMONS_PACKAGE))
+    def test_other_writes_should_invalidate_search_cache(
+            self, mock_datacatalog_client):  # noqa: E125
+
+        facade = commons.DataCatalogFacade('test-project',
+                                           search_cache_ttl_seconds=60)
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse(results=[])
+
+        writes = [
+            lambda: facade.update_entry(datacatalog.Entry()),
+            lambda: facade.delete_entry_group('entry_group_name'),
+            lambda: facade.create_tag_template('location-id', 'template_id',
+                                               datacatalog.TagTemplate()),
+            lambda: facade.delete_tag_template('template_name'),
+            lambda: facade.create_tag('entry_name', datacatalog.Tag()),
+            lambda: facade.update_tag(datacatalog.Tag()),
+            lambda: facade.delete_tag(datacatalog.Tag()),
+        ]
+        facade.search_catalog('query')
+        for write in writes:
+            write()
+            facade.search_catalog('query')
+
+        self.assertEqual(
+            len(writes) + 1, datacatalog_client.search_catalog.call_count)
+
+    @mock.patch('{}.datacatalog_facade.datacatalog.DataCatalogClient'.format(
+        __COMMONS_PACKAGE))
+    def test_search_catalog_should_not_cache_results_written_while_iterated(
+            self, mock_datacatalog_client):  # noqa: E125
+
+        facade = commons.DataCatalogFacade('test-project',
+                                           search_cache_ttl_seconds=60)
+        datacatalog_client = mock_datacatalog_client.return_value
+        datacatalog_client.search_catalog.side_effect = [
+            datacatalog.SearchCatalogResponse(results=[
+                self.__create_search_result('localhost//asset_1'),
+                self.__create_search_result('localhost//asset_2')
+            ]),
+            datacatalog.SearchCatalogResponse(results=[])
+        ]
+
+        for entry_name in facade.iter_search_catalog_relative_resource_name(
+                'query'):
+            facade.delete_entry(entry_name)
+
+        self.assertEqual([],
+                         facade.search_catalog_relative_resource_name('query'))
+        self.assertEqual(2, datacatalog_client.search_catalog.call_count)
+
+    def test_get_search_cache_stats_should_return_none_if_disabled(self):
+        self.assertIsNone(self.__datacatalog_facade.get_search_cache_stats())
+
+    def test_iter_search_catalog_relative_resource_name_should_yield_names(
+            self):
+
+        expected_resource_names = ['localhost//asset_1', 'localhost//asset_2']
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse(results=[
+                self.__create_search_result(resource_name)
+                for resource_name in expected_resource_names
+            ])
+
+        resource_names = self.__datacatalog_facade \
+            .iter_search_catalog_relative_resource_name('system=bigquery')
+
+        self.assertEqual(expected_resource_names, list(resource_names))
+
     @mock.patch(__SEARCH_CATALOG_METHOD)
     def test_search_catalog_relative_resource_name_should_return_names(
             self, mock_search_catalog):  # noqa: E125
@@ -647,7 +1539,7 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(1, mock_search_catalog.call_count)
         self.assertEqual(expected_resource_names, resource_names)
 
-    @mock.patch(__SEARCH_CATALOG_METHOD)
+    @mock.patch(__ITER_SEARCH_CATALOG_METHOD)
     def test_get_tag_field_values_for_search_results_string_field_should_return_values(  # noqa: E501
             self, mock_search_catalog):  # noqa: E125
 
@@ -663,7 +1555,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[tag])
 
         string_value = self.__datacatalog_facade \
             .get_tag_field_values_for_search_results(
@@ -675,7 +1568,7 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(string_value,
                          ['Test String Value', 'Test String Value'])
 
-    @mock.patch(__SEARCH_CATALOG_METHOD)
+    @mock.patch(__ITER_SEARCH_CATALOG_METHOD)
     def test_get_tag_field_values_for_search_results_double_field_should_return_values(  # noqa: E501
             self, mock_search_catalog):  # noqa: E125
 
@@ -691,7 +1584,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[tag])
 
         double_value = self.__datacatalog_facade \
             .get_tag_field_values_for_search_results(
@@ -702,7 +1596,7 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(2, datacatalog_client.list_tags.call_count)
         self.assertEqual(double_value, [1.0, 1.0])
 
-    @mock.patch(__SEARCH_CATALOG_METHOD)
+    @mock.patch(__ITER_SEARCH_CATALOG_METHOD)
     def test_get_tag_field_values_for_search_results_bool_field_should_return_values(  # noqa: E501
             self, mock_search_catalog):  # noqa: E125
 
@@ -718,7 +1612,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[tag])
 
         bool_value = self.__datacatalog_facade \
             .get_tag_field_values_for_search_results(
@@ -729,7 +1624,7 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(2, datacatalog_client.list_tags.call_count)
         self.assertEqual(bool_value, [True, True])
 
-    @mock.patch(__SEARCH_CATALOG_METHOD)
+    @mock.patch(__ITER_SEARCH_CATALOG_METHOD)
     def test_get_tag_field_values_for_search_results_timestamp_field_should_return_values(  # noqa: E501
             self, mock_search_catalog):  # noqa: E125
 
@@ -745,7 +1640,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[tag])
 
         timestamp_value = self.__datacatalog_facade \
             .get_tag_field_values_for_search_results(
@@ -757,7 +1653,7 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(timestamp_value[0].timestamp(), 1567778400)
         self.assertEqual(timestamp_value[1].timestamp(), 1567778400)
 
-    @mock.patch(__SEARCH_CATALOG_METHOD)
+    @mock.patch(__ITER_SEARCH_CATALOG_METHOD)
     def test_get_tag_field_values_for_search_results_enum_field_should_return_values(  # noqa: E501
             self, mock_search_catalog):  # noqa: E125
 
@@ -773,7 +1669,8 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         tag = self.__create_tag()
 
         datacatalog_client = self.__datacatalog_client
-        datacatalog_client.list_tags.return_value = [tag]
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[tag])
 
         bool_value = self.__datacatalog_facade \
             .get_tag_field_values_for_search_results(
@@ -784,6 +1681,65 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
         self.assertEqual(2, datacatalog_client.list_tags.call_count)
         self.assertEqual(bool_value, ['Test ENUM Value', 'Test ENUM Value'])
 
+    @mock.patch(__ITER_SEARCH_CATALOG_METHOD)
+    def test_get_tag_field_values_for_search_results_with_max_workers_should_keep_order(  # noqa: E501
+            self, mock_search_catalog):  # noqa: E125
+
+        resource_names = ['asset_{}'.format(index) for index in range(10)]
+        mock_search_catalog.return_value = [
+            self.__create_search_result(resource_name)
+            for resource_name in resource_names
+        ]
+
+        def list_tags(request):
+            tag = self.__create_tag()
+            tag.fields['string-field'].string_value = request.parent
+            return datacatalog.ListTagsResponse(tags=[tag])
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.side_effect = list_tags
+
+        string_values = self.__datacatalog_facade \
+            .get_tag_field_values_for_search_results(
+                'system=bigquery', 'template', 'string-field',
+                self.__STRING_TYPE, max_workers=3)
+
+        self.assertEqual(10, datacatalog_client.list_tags.call_count)
+        self.assertEqual(resource_names, string_values)
+
+    @mock.patch(__ITER_SEARCH_CATALOG_METHOD)
+    def test_iter_tag_field_values_for_search_results_should_stream_values(
+            self, mock_search_catalog):
+
+        def search_results():
+            for index in range(10):
+                yield self.__create_search_result('asset_{}'.format(index))
+
+        mock_search_catalog.return_value = search_results()
+
+        datacatalog_client = self.__datacatalog_client
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse(tags=[self.__create_tag()])
+
+        tag_field_values = self.__datacatalog_facade \
+            .iter_tag_field_values_for_search_results(
+                'system=bigquery', 'template', 'bool-field',
+                self.__BOOL_TYPE)
+
+        self.assertTrue(next(tag_field_values))
+        self.assertEqual(1, datacatalog_client.list_tags.call_count)
+
+    def test_get_tag_field_value_getter_should_read_non_primitive_as_enum(
+            self):
+
+        tag = self.__create_tag()
+
+        get_value = commons.DataCatalogFacade.get_tag_field_value_getter(
+            self.__NON_PRIMITIVE_TYPE)
+
+        self.assertEqual('Test ENUM Value',
+                         get_value(tag.fields['enum-field']))
+
     @classmethod
     def __create_tag(cls):
         tag = datacatalog.Tag()
@@ -814,6 +1770,15 @@ class DataCatalogFacadeTestCase(unittest.TestCase):
 
         return tag
 
+    @classmethod
+    def __set_up_empty_pages(cls, datacatalog_client):
+        datacatalog_client.list_entries.return_value = \
+            datacatalog.ListEntriesResponse()
+        datacatalog_client.list_tags.return_value = \
+            datacatalog.ListTagsResponse()
+        datacatalog_client.search_catalog.return_value = \
+            datacatalog.SearchCatalogResponse()
+
     @classmethod
     def __create_search_result(cls, relative_resource_name):
         search_result = datacatalog.SearchCatalogResult()
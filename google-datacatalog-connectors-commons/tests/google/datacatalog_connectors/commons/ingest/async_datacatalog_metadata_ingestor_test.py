@@ -0,0 +1,230 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import unittest
+
+import mock
+from google.api_core import exceptions
+from google.datacatalog_connectors.commons_test import utils
+
+from google.datacatalog_connectors.commons import ingest
+from google.datacatalog_connectors.commons import state
+
+
+class AsyncDataCatalogMetadataIngestorTestCase(unittest.TestCase):
+    __COMMONS_PACKAGE = 'google.datacatalog_connectors.commons'
+
+    @mock.patch('{}.async_datacatalog_facade.AsyncDataCatalogFacade'.format(
+        __COMMONS_PACKAGE))
+    def setUp(self, mock_datacatalog_facade):
+        state.KnownResourcesRegistry.shared().clear()
+        self.__metadata_ingestor = ingest \
+            .AsyncDataCatalogMetadataIngestor(
+                'project-id', 'location-id', 'entry_group_id')
+        # Shortcut for the object assigned
+        # to self.__metadata_ingestor.__datacatalog_facade
+        self.__datacatalog_facade = mock_datacatalog_facade.return_value
+        self.__in_flight = 0
+        self.__max_in_flight = 0
+
+        for method_name in ('create_entry_group', 'create_tag_template',
+                            'upsert_tags', 'reconcile_tags'):
+            getattr(self.__datacatalog_facade, method_name).side_effect = \
+                self.__async_return(mock.MagicMock())
+        self.__datacatalog_facade.upsert_entry.side_effect = \
+            self.__track_upsert_entry
+
+    def test_ingest_metadata_should_succeed(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        self.__run(
+            self.__metadata_ingestor.ingest_metadata(entries, {'template': {}},
+                                                     {'delete_tags': {}}))
+
+        datacatalog_facade = self.__datacatalog_facade
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(1, datacatalog_facade.create_tag_template.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+        datacatalog_facade.upsert_tags.assert_not_called()
+        self.assertEqual(2, datacatalog_facade.reconcile_tags.call_count)
+        self.assertEqual('entry_group_id',
+                         datacatalog_facade.reconcile_tags.call_args[0][2])
+
+    def test_ingest_metadata_should_limit_concurrency(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types() * 5
+
+        self.__run(
+            self.__metadata_ingestor.ingest_metadata(entries, {},
+                                                     {'max_workers': 3}))
+
+        self.assertEqual(10, self.__datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(3, self.__max_in_flight)
+
+    def test_existing_resources_should_not_raise(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.create_entry_group.side_effect = \
+            self.__async_raise(
+                exceptions.AlreadyExists('Entry Group already exists'))
+        datacatalog_facade.create_tag_template.side_effect = \
+            self.__async_raise(
+                exceptions.AlreadyExists('Tag Template already exists'))
+
+        self.__run(
+            self.__metadata_ingestor.ingest_metadata(entries,
+                                                     {'template': {}}))
+
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_tags.call_count)
+
+    def test_ingest_metadata_should_skip_known_resources(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        for _ in range(2):
+            self.__run(
+                self.__metadata_ingestor.ingest_metadata(
+                    entries, {'template': {}}))
+
+        datacatalog_facade = self.__datacatalog_facade
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(1, datacatalog_facade.create_tag_template.call_count)
+        self.assertEqual(4, datacatalog_facade.upsert_entry.call_count)
+
+    def test_ingest_metadata_on_permission_denied_should_not_raise(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = self.__async_raise(
+            exceptions.PermissionDenied('Permission denied'))
+
+        self.__run(self.__metadata_ingestor.ingest_metadata(entries))
+
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+        datacatalog_facade.upsert_tags.assert_not_called()
+
+    def test_ingest_metadata_known_entry_group_deleted_should_create_it_again(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        entry_group_name = 'projects/project-id/locations/location-id/' \
+                           'entryGroups/entry_group_id'
+        known_resources = state.KnownResourcesRegistry.shared()
+        known_resources.add(entry_group_name)
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = self.__async_results([
+            exceptions.NotFound('Entry Group not found'),
+            mock.MagicMock(),
+            mock.MagicMock()
+        ])
+
+        self.__run(self.__metadata_ingestor.ingest_metadata(entries))
+
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_tags.call_count)
+        self.assertIn(entry_group_name, known_resources)
+
+    def test_ingest_metadata_known_tag_template_deleted_should_create_it_again(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        tag_template_name = 'projects/project-id/locations/location-id/' \
+                            'tagTemplates/template'
+        known_resources = state.KnownResourcesRegistry.shared()
+        known_resources.add(tag_template_name)
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_tags.side_effect = self.__async_results([
+            exceptions.FailedPrecondition('Tag Template not found'),
+            mock.MagicMock(),
+            mock.MagicMock()
+        ])
+
+        self.__run(
+            self.__metadata_ingestor.ingest_metadata(entries,
+                                                     {'template': {}}))
+
+        self.assertEqual(1, datacatalog_facade.create_tag_template.call_count)
+        self.assertEqual(3, datacatalog_facade.upsert_tags.call_count)
+        self.assertIn(tag_template_name, known_resources)
+
+    def test_ingest_metadata_verified_resources_should_not_create_them_again(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_tags.side_effect = self.__async_raise(
+            exceptions.FailedPrecondition('Failed precondition'))
+
+        self.__run(
+            self.__metadata_ingestor.ingest_metadata(entries,
+                                                     {'template': {}}))
+
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(1, datacatalog_facade.create_tag_template.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_tags.call_count)
+
+    async def __track_upsert_entry(self, *args, **kwargs):
+        self.__in_flight += 1
+        self.__max_in_flight = max(self.__max_in_flight, self.__in_flight)
+        await asyncio.sleep(0.01)
+        self.__in_flight -= 1
+        return mock.MagicMock()
+
+    @classmethod
+    def __async_return(cls, value):
+
+        async def coroutine(*args, **kwargs):
+            return value
+
+        return coroutine
+
+    @classmethod
+    def __async_raise(cls, error):
+
+        async def coroutine(*args, **kwargs):
+            raise error
+
+        return coroutine
+
+    @classmethod
+    def __async_results(cls, results):
+        results = list(results)
+
+        async def coroutine(*args, **kwargs):
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return coroutine
+
+    @classmethod
+    def __run(cls, coroutine):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
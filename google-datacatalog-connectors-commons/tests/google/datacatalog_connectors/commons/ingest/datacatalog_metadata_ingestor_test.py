@@ -14,6 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import tempfile
 import unittest
 
 import mock
@@ -21,7 +23,9 @@ from google.api_core import exceptions
 from google.cloud import datacatalog
 from google.datacatalog_connectors.commons_test import utils
 
+from google.datacatalog_connectors import commons
 from google.datacatalog_connectors.commons import ingest
+from google.datacatalog_connectors.commons import state
 
 
 class DataCatalogMetadataIngestorTestCase(unittest.TestCase):
@@ -31,10 +35,13 @@ class DataCatalogMetadataIngestorTestCase(unittest.TestCase):
     __TIMESTAMP_TYPE = datacatalog.FieldType.PrimitiveType.TIMESTAMP
 
     __COMMONS_PACKAGE = 'google.datacatalog_connectors.commons'
+    __INGESTOR_MODULE = '{}.ingest.datacatalog_metadata_ingestor'.format(
+        __COMMONS_PACKAGE)
 
     @mock.patch(
         '{}.datacatalog_facade.DataCatalogFacade'.format(__COMMONS_PACKAGE))
     def setUp(self, mock_datacatalog_facade):
+        state.KnownResourcesRegistry.shared().clear()
         self.__metadata_ingestor = ingest \
             .DataCatalogMetadataIngestor(
                 'project-id', 'location-id', 'entry_group_id')
@@ -42,6 +49,19 @@ class DataCatalogMetadataIngestorTestCase(unittest.TestCase):
         # to self.__metadata_ingestor.__datacatalog_facade
         self.__datacatalog_facade = mock_datacatalog_facade.return_value
 
+    @mock.patch(
+        '{}.datacatalog_facade.DataCatalogFacade'.format(__COMMONS_PACKAGE))
+    def test_constructor_should_pass_client_provider_to_facade(
+            self, mock_datacatalog_facade):  # noqa: E125
+
+        client_provider = commons.DataCatalogClientProvider()
+
+        ingest.DataCatalogMetadataIngestor('project-id', 'location-id',
+                                           'entry_group_id', client_provider)
+
+        mock_datacatalog_facade.assert_called_once_with(
+            'project-id', client_provider=client_provider)
+
     def test_ingest_metadata_should_succeed(self):
         entries = utils \
             .Utils.create_assembled_entries_user_defined_types()
@@ -97,11 +117,12 @@ class DataCatalogMetadataIngestorTestCase(unittest.TestCase):
 
         self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
         self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
-        self.assertEqual(2, datacatalog_facade.delete_tags.call_count)
+        datacatalog_facade.upsert_tags.assert_not_called()
+        self.assertEqual(2, datacatalog_facade.reconcile_tags.call_count)
 
-        delete_tag_args = datacatalog_facade.delete_tags.call_args_list
-        managed_tag_template_0 = delete_tag_args[0].args[2]
-        managed_tag_template_1 = delete_tag_args[1].args[2]
+        reconcile_tags_args = datacatalog_facade.reconcile_tags.call_args_list
+        managed_tag_template_0 = reconcile_tags_args[0].args[2]
+        managed_tag_template_1 = reconcile_tags_args[1].args[2]
 
         self.assertEqual(expected_tag_template_arg, managed_tag_template_0)
         self.assertEqual(expected_tag_template_arg, managed_tag_template_1)
@@ -123,15 +144,788 @@ class DataCatalogMetadataIngestorTestCase(unittest.TestCase):
 
         self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
         self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
-        self.assertEqual(2, datacatalog_facade.delete_tags.call_count)
+        datacatalog_facade.upsert_tags.assert_not_called()
+        self.assertEqual(2, datacatalog_facade.reconcile_tags.call_count)
 
-        delete_tag_args = datacatalog_facade.delete_tags.call_args_list
-        managed_tag_template_0 = delete_tag_args[0].args[2]
-        managed_tag_template_1 = delete_tag_args[1].args[2]
+        reconcile_tags_args = datacatalog_facade.reconcile_tags.call_args_list
+        managed_tag_template_0 = reconcile_tags_args[0].args[2]
+        managed_tag_template_1 = reconcile_tags_args[1].args[2]
 
         self.assertEqual(expected_tag_template_arg, managed_tag_template_0)
         self.assertEqual(expected_tag_template_arg, managed_tag_template_1)
 
+    def test_ingest_metadata_with_max_workers_config_should_succeed(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        with self.assertLogs(level='INFO') as logs:
+            self.__metadata_ingestor.ingest_metadata(entries, {}, {
+                'max_workers': 4,
+                'delete_tags': {}
+            })
+
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(2, datacatalog_facade.reconcile_tags.call_count)
+
+        progress_messages = [
+            record.getMessage()
+            for record in logs.records
+            if record.getMessage() in ('1/2', '2/2')
+        ]
+        self.assertEqual(['1/2', '2/2'], progress_messages)
+
+    def test_ingest_metadata_with_max_workers_config_should_bound_pending_work(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types() * 5
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        self.__metadata_ingestor.ingest_metadata(entries, {},
+                                                 {'max_workers': 2})
+
+        self.assertEqual(10, datacatalog_facade.upsert_entry.call_count)
+
+    def test_ingest_metadata_with_max_workers_on_permission_denied_should_not_raise(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = \
+            exceptions.PermissionDenied('Permission denied')
+
+        self.__metadata_ingestor.ingest_metadata(entries, {},
+                                                 {'max_workers': 2})
+
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+        datacatalog_facade.upsert_tags.assert_not_called()
+
+    def test_ingest_metadata_with_max_workers_on_unexpected_error_should_raise(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = \
+            exceptions.InternalServerError('Internal error')
+
+        self.assertRaises(exceptions.InternalServerError,
+                          self.__metadata_ingestor.ingest_metadata, entries,
+                          {}, {'max_workers': 2})
+
+    @mock.patch('{}.time.sleep'.format(__INGESTOR_MODULE))
+    def test_ingest_metadata_with_adaptive_concurrency_should_retry_throttled_entries(  # noqa:E501
+            self, mock_sleep):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = [
+            exceptions.ResourceExhausted('Quota exceeded'),
+            mock.MagicMock(),
+            mock.MagicMock()
+        ]
+
+        self.__metadata_ingestor.ingest_metadata(entries, {}, {
+            'max_workers': 4,
+            'adaptive_concurrency': True
+        })
+
+        stats = self.__metadata_ingestor.get_concurrency_stats()
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(2, stats['completed_count'])
+        self.assertEqual(1, stats['throttled_count'])
+        self.assertEqual(0, stats['in_flight'])
+        self.assertEqual(1, mock_sleep.call_count)
+
+    @mock.patch('{}.time.sleep'.format(__INGESTOR_MODULE))
+    def test_ingest_metadata_with_adaptive_concurrency_should_give_up_on_throttled_entries(  # noqa:E501
+            self, mock_sleep):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()[:1]
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = \
+            exceptions.DeadlineExceeded('Deadline exceeded')
+
+        self.assertRaises(exceptions.DeadlineExceeded,
+                          self.__metadata_ingestor.ingest_metadata, entries,
+                          {}, {
+                              'max_workers': 2,
+                              'adaptive_concurrency': True
+                          })
+
+        self.assertEqual(5, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(4, mock_sleep.call_count)
+
+    @mock.patch('{}.random.uniform'.format(__INGESTOR_MODULE))
+    @mock.patch('{}.time.sleep'.format(__INGESTOR_MODULE))
+    def test_ingest_metadata_with_adaptive_concurrency_should_back_off_throttled_entries(  # noqa:E501
+            self, mock_sleep, mock_uniform):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()[:1]
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = \
+            exceptions.ResourceExhausted('Quota exceeded')
+        mock_uniform.side_effect = lambda low, high: high / 2
+
+        self.assertRaises(exceptions.ResourceExhausted,
+                          self.__metadata_ingestor.ingest_metadata, entries,
+                          {}, {
+                              'max_workers': 2,
+                              'adaptive_concurrency': True
+                          })
+
+        mock_uniform.assert_has_calls([
+            mock.call(0, 1),
+            mock.call(0, 2),
+            mock.call(0, 4),
+            mock.call(0, 8)
+        ])
+        mock_sleep.assert_has_calls(
+            [mock.call(0.5),
+             mock.call(1),
+             mock.call(2),
+             mock.call(4)])
+
+    def test_get_concurrency_stats_should_return_none_if_disabled(self):
+        self.__metadata_ingestor.ingest_metadata([], {}, {'max_workers': 2})
+
+        self.assertIsNone(self.__metadata_ingestor.get_concurrency_stats())
+
+    def test_ingest_metadata_with_upsert_strategy_config_should_succeed(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        self.__metadata_ingestor.ingest_metadata(
+            entries, {}, {'upsert_entry_strategy': 'create_first'})
+
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(
+            'create_first',
+            datacatalog_facade.upsert_entry.call_args.kwargs['strategy'])
+
+    def test_ingest_metadata_with_prefetch_entries_config_should_succeed(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        self.__metadata_ingestor.ingest_metadata(entries, {},
+                                                 {'prefetch_entries': True})
+
+        datacatalog_facade.prefetch_entries.assert_called_once_with(
+            'projects/project-id/locations/location-id/'
+            'entryGroups/entry_group_id')
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+
+    def test_ingest_metadata_with_state_store_config_should_skip_unchanged_entries(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        # The fake entries share the same id.
+        entries[1].entry_id = 'entry_2'
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'state_store': {
+                    'path': os.path.join(temp_dir, 'state.db')
+                }
+            }
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_tags.call_count)
+
+    def test_ingest_metadata_should_skip_known_resources(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        self.__metadata_ingestor.ingest_metadata(entries, {'template': {}})
+        self.__metadata_ingestor.ingest_metadata(entries, {'template': {}})
+
+        datacatalog_facade = self.__datacatalog_facade
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(1, datacatalog_facade.create_tag_template.call_count)
+        self.assertEqual(4, datacatalog_facade.upsert_entry.call_count)
+
+    @mock.patch(
+        '{}.datacatalog_facade.DataCatalogFacade'.format(__COMMONS_PACKAGE))
+    def test_ingestors_sharing_entry_group_should_create_it_once(
+            self, mock_datacatalog_facade):  # noqa: E125
+
+        other_metadata_ingestor = ingest.DataCatalogMetadataIngestor(
+            'project-id', 'location-id', 'entry_group_id')
+        other_datacatalog_facade = mock_datacatalog_facade.return_value
+
+        self.__metadata_ingestor.ingest_metadata([], {})
+        other_metadata_ingestor.ingest_metadata([], {})
+
+        self.assertEqual(
+            1, self.__datacatalog_facade.create_entry_group.call_count)
+        other_datacatalog_facade.create_entry_group.assert_not_called()
+
+    def test_ingest_metadata_with_state_store_config_should_skip_known_resources(  # noqa:E501
+            self):
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.create_entry_group.side_effect = \
+            exceptions.AlreadyExists('Entry Group already exists')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'state_store': {
+                    'path': os.path.join(temp_dir, 'state.db')
+                }
+            }
+            self.__metadata_ingestor.ingest_metadata([], {'template': {}},
+                                                     config)
+            # Simulates a new process.
+            state.KnownResourcesRegistry.shared().clear()
+            self.__metadata_ingestor.ingest_metadata([], {'template': {}},
+                                                     config)
+
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(1, datacatalog_facade.create_tag_template.call_count)
+
+    def test_ingest_metadata_known_entry_group_deleted_should_create_it_again(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        entry_group_name = 'projects/project-id/locations/location-id/' \
+                           'entryGroups/entry_group_id'
+        known_resources = state.KnownResourcesRegistry.shared()
+        known_resources.add(entry_group_name)
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = [
+            exceptions.NotFound('Entry Group not found'),
+            datacatalog.Entry(),
+            datacatalog.Entry()
+        ]
+
+        self.__metadata_ingestor.ingest_metadata(entries, {})
+
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_tags.call_count)
+        self.assertIn(entry_group_name, known_resources)
+
+    def test_ingest_metadata_known_entry_group_deleted_with_prefetch_should_create_it_again(  # noqa:E501
+            self):
+        state.KnownResourcesRegistry.shared().add(
+            'projects/project-id/locations/location-id/'
+            'entryGroups/entry_group_id')
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.prefetch_entries.side_effect = [
+            exceptions.PermissionDenied('Entry Group not found'), 0
+        ]
+
+        self.__metadata_ingestor.ingest_metadata([], {},
+                                                 {'prefetch_entries': True})
+
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(2, datacatalog_facade.prefetch_entries.call_count)
+
+    def test_ingest_metadata_known_tag_template_deleted_should_create_it_again(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        tag_template_name = 'projects/project-id/locations/location-id/' \
+                            'tagTemplates/template'
+        known_resources = state.KnownResourcesRegistry.shared()
+        known_resources.add(tag_template_name)
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_tags.side_effect = [
+            exceptions.NotFound('Tag Template not found'),
+            commons.TagWritesResult(),
+            commons.TagWritesResult()
+        ]
+
+        self.__metadata_ingestor.ingest_metadata(entries, {'template': {}})
+
+        datacatalog_facade.create_tag_template.assert_called_once_with(
+            location_id='location-id',
+            tag_template_id='template',
+            tag_template={})
+        self.assertEqual(3, datacatalog_facade.upsert_tags.call_count)
+        self.assertIn(tag_template_name, known_resources)
+
+    def test_ingest_metadata_known_tag_template_deleted_with_tag_writes_max_workers_should_create_it_again(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        state.KnownResourcesRegistry.shared().add(
+            'projects/project-id/locations/location-id/tagTemplates/template')
+
+        failed_tag_writes_result = commons.TagWritesResult()
+        failed_tag_writes_result.add_failure(
+            commons.TagWritesResult.CREATE, datacatalog.Tag(),
+            exceptions.FailedPrecondition('Tag Template not found'))
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.reconcile_tags.side_effect = [
+            failed_tag_writes_result,
+            commons.TagWritesResult(), failed_tag_writes_result
+        ]
+
+        self.__metadata_ingestor.ingest_metadata(entries, {'template': {}}, {
+            'delete_tags': {},
+            'tag_writes_max_workers': 2
+        })
+
+        # The Tag Template is created again only once.
+        self.assertEqual(1, datacatalog_facade.create_tag_template.call_count)
+        self.assertEqual(3, datacatalog_facade.reconcile_tags.call_count)
+
+    def test_ingest_metadata_verified_tag_template_should_not_create_it_again(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_tags.side_effect = \
+            exceptions.FailedPrecondition('Failed precondition')
+
+        self.__metadata_ingestor.ingest_metadata(entries, {'template': {}})
+
+        self.assertEqual(1, datacatalog_facade.create_tag_template.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_tags.call_count)
+
+    def test_ingest_metadata_verified_entry_group_should_not_create_it_again(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = \
+            exceptions.PermissionDenied('Permission denied')
+
+        self.__metadata_ingestor.ingest_metadata(entries, {})
+
+        self.assertEqual(1, datacatalog_facade.create_entry_group.call_count)
+        self.assertEqual(2, datacatalog_facade.upsert_entry.call_count)
+
+    def test_ingest_metadata_with_rate_limits_config_should_set_rate_limiter(
+            self):
+        datacatalog_facade = self.__datacatalog_facade
+
+        self.__metadata_ingestor.ingest_metadata(
+            [], {}, {'rate_limits': {
+                'writes_per_minute': 600
+            }})
+
+        rate_limiter = datacatalog_facade.set_rate_limiter.call_args[0][0]
+        self.assertIsInstance(rate_limiter, commons.utils.RateLimiter)
+
+    def test_ingest_metadata_with_shared_rate_limiter_should_set_it(self):
+        datacatalog_facade = self.__datacatalog_facade
+        rate_limiter = commons.utils.RateLimiter(writes_per_minute=600)
+
+        self.__metadata_ingestor.ingest_metadata([], {},
+                                                 {'rate_limits': rate_limiter})
+
+        datacatalog_facade.set_rate_limiter.assert_called_once_with(
+            rate_limiter)
+
+    def test_ingest_metadata_with_retry_policy_config_should_set_retry_policy(
+            self):
+        datacatalog_facade = self.__datacatalog_facade
+
+        self.__metadata_ingestor.ingest_metadata(
+            [], {}, {'retry_policy': {
+                'max_attempts': 3
+            }})
+
+        retry_policy = datacatalog_facade.set_retry_policy.call_args[0][0]
+        self.assertIsInstance(retry_policy, commons.utils.RetryPolicy)
+        self.assertEqual(
+            0,
+            self.__metadata_ingestor.get_retry_stats()['retry_count'])
+
+    def test_ingest_metadata_with_shared_retry_policy_should_set_it(self):
+        datacatalog_facade = self.__datacatalog_facade
+        retry_policy = commons.utils.RetryPolicy()
+
+        self.__metadata_ingestor.ingest_metadata(
+            [], {}, {'retry_policy': retry_policy})
+
+        datacatalog_facade.set_retry_policy.assert_called_once_with(
+            retry_policy)
+
+    def test_get_retry_stats_should_return_none_if_disabled(self):
+        self.assertIsNone(self.__metadata_ingestor.get_retry_stats())
+
+    def test_ingest_metadata_with_state_store_config_should_ingest_changed_entries(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        # The fake entries share the same id.
+        entries[1].entry_id = 'entry_2'
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'state_store': {
+                    'path': os.path.join(temp_dir, 'state.db')
+                }
+            }
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+            entries[0].entry.description = 'changed description'
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+
+    def test_ingest_metadata_with_state_store_full_verification_should_ingest_unchanged_entries(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        # The fake entries share the same id.
+        entries[1].entry_id = 'entry_2'
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'state_store': {
+                    'path': os.path.join(temp_dir, 'state.db'),
+                    'full_verification_interval_hours': 0
+                }
+            }
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+        self.assertEqual(4, datacatalog_facade.upsert_entry.call_count)
+
+    def test_ingest_metadata_with_state_store_on_permission_denied_should_not_save_state(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        entries[1].entry_id = 'entry_2'
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = \
+            exceptions.PermissionDenied('Permission denied')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'state_store': {
+                    'path': os.path.join(temp_dir, 'state.db')
+                }
+            }
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+        # The second run also creates the Entry Group known to exist again,
+        # and retries the first Entry.
+        self.assertEqual(5, datacatalog_facade.upsert_entry.call_count)
+
+    def test_ingest_metadata_with_state_store_on_failed_update_should_forget_entry(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        entries[1].entry_id = 'entry_2'
+        original_description = entries[0].entry.description
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'state_store': {
+                    'path': os.path.join(temp_dir, 'state.db')
+                }
+            }
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+            entries[0].entry.description = 'changed description'
+            datacatalog_facade.upsert_entry.side_effect = \
+                exceptions.PermissionDenied('Permission denied')
+            self.__metadata_ingestor.ingest_metadata(entries[:1], {}, config)
+
+            # The Entry is verified again even if it is changed back.
+            entries[0].entry.description = original_description
+            datacatalog_facade.upsert_entry.side_effect = None
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+        # The failed update is retried once the Entry Group known to exist
+        # is created again.
+        self.assertEqual(5, datacatalog_facade.upsert_entry.call_count)
+
+    def test_ingest_metadata_with_state_store_and_prefetch_should_ingest_missing_entries(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        entries[1].entry_id = 'entry_2'
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'state_store': {
+                    'path': os.path.join(temp_dir, 'state.db')
+                },
+                'prefetch_entries': True
+            }
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+            # The first Entry was deleted by another client.
+            datacatalog_facade.get_prefetched_entry.side_effect = \
+                lambda name: None if name.endswith('/entry_1') \
+                else datacatalog.Entry()
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual('entry_1',
+                         datacatalog_facade.upsert_entry.call_args.args[1])
+
+    def test_ingest_metadata_with_checkpoint_resume_should_skip_completed_entries(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        entries[1].entry_id = 'entry_2'
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = \
+            [datacatalog.Entry(), Exception('Interrupted')]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'checkpoint.jsonl')
+            self.assertRaises(Exception,
+                              self.__metadata_ingestor.ingest_metadata,
+                              entries, {}, {'checkpoint': {
+                                  'path': path
+                              }})
+            self.assertTrue(os.path.exists(path))
+
+            datacatalog_facade.upsert_entry.side_effect = None
+            self.__metadata_ingestor.ingest_metadata(
+                entries, {}, {'checkpoint': {
+                    'path': path,
+                    'resume': True
+                }})
+            self.assertFalse(os.path.exists(path))
+
+        self.assertEqual(3, datacatalog_facade.upsert_entry.call_count)
+        self.assertEqual('entry_2',
+                         datacatalog_facade.upsert_entry.call_args[0][1])
+
+    def test_ingest_metadata_with_checkpoint_no_resume_should_ingest_all_entries(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        entries[1].entry_id = 'entry_2'
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_entry.side_effect = \
+            [datacatalog.Entry(), Exception('Interrupted')]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'checkpoint': {
+                    'path': os.path.join(temp_dir, 'checkpoint.jsonl')
+                }
+            }
+            self.assertRaises(Exception,
+                              self.__metadata_ingestor.ingest_metadata,
+                              entries, {}, config)
+
+            datacatalog_facade.upsert_entry.side_effect = None
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+        self.assertEqual(4, datacatalog_facade.upsert_entry.call_count)
+
+    def test_apply_plan_should_send_planned_operations(self):
+        entry_group_name = 'projects/project-id/locations/location-id/' \
+                           'entryGroups/entry_group_id'
+        entry_name = '{}/entries/entry_1'.format(entry_group_name)
+
+        plan = ingest.IngestionPlan()
+        plan.add_operation(plan.CREATE_ENTRY,
+                           entry_name,
+                           entry_id='entry_1',
+                           entry=datacatalog.Entry(description='description'))
+        plan.add_operation(plan.UPDATE_ENTRY,
+                           entry_name,
+                           entry=datacatalog.Entry(name=entry_name),
+                           update_mask=['description'])
+        plan.add_operation(plan.DELETE_ENTRY, entry_name)
+        plan.add_operation(plan.CREATE_TAG,
+                           entry_name,
+                           tag=datacatalog.Tag(template='template'))
+        plan.add_operation(plan.UPDATE_TAG,
+                           entry_name,
+                           tag=datacatalog.Tag(name='tag_name'),
+                           update_mask=['fields'])
+        plan.add_operation(plan.DELETE_TAG,
+                           entry_name,
+                           tag=datacatalog.Tag(name='tag_name'))
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        applied_operations_count = self.__metadata_ingestor.apply_plan(
+            ingest.IngestionPlan.from_json(plan.to_json()))
+
+        self.assertEqual(6, applied_operations_count)
+        datacatalog_facade.create_entry.assert_called_once_with(
+            entry_group_name=entry_group_name,
+            entry_id='entry_1',
+            entry=datacatalog.Entry(description='description'))
+        datacatalog_facade.update_entry.assert_called_once_with(
+            datacatalog.Entry(name=entry_name), update_mask=['description'])
+        datacatalog_facade.delete_entry.assert_called_once_with(entry_name)
+        datacatalog_facade.create_tag.assert_called_once_with(
+            entry_name, datacatalog.Tag(template='template'))
+        datacatalog_facade.update_tag.assert_called_once_with(
+            datacatalog.Tag(name='tag_name'), update_mask=['fields'])
+        datacatalog_facade.delete_tag.assert_called_once_with(
+            datacatalog.Tag(name='tag_name'))
+        datacatalog_facade.create_entry_group.assert_not_called()
+        datacatalog_facade.upsert_entry.assert_not_called()
+
+    def test_apply_plan_on_permission_denied_should_not_raise(self):
+        plan = ingest.IngestionPlan()
+        plan.add_operation(plan.DELETE_ENTRY, 'entry_1')
+        plan.add_operation(plan.DELETE_ENTRY, 'entry_2')
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.delete_entry.side_effect = \
+            [exceptions.PermissionDenied('Permission denied'), None]
+
+        applied_operations_count = self.__metadata_ingestor.apply_plan(
+            plan, {'rate_limits': {
+                'writes_per_minute': 600
+            }})
+
+        self.assertEqual(1, applied_operations_count)
+        self.assertEqual(2, datacatalog_facade.delete_entry.call_count)
+        datacatalog_facade.set_rate_limiter.assert_called_once()
+
+    def test_apply_plan_stale_operations_should_be_skipped(self):
+        plan = ingest.IngestionPlan()
+        plan.add_operation(plan.CREATE_ENTRY,
+                           'entry_1',
+                           entry_id='entry_1',
+                           entry=datacatalog.Entry())
+        plan.add_operation(plan.DELETE_ENTRY, 'entry_2')
+        plan.add_operation(plan.DELETE_ENTRY, 'entry_3')
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.create_entry.side_effect = \
+            exceptions.AlreadyExists('Already exists')
+        datacatalog_facade.delete_entry.side_effect = \
+            [exceptions.NotFound('Not found'), None]
+
+        applied_operations_count = self.__metadata_ingestor.apply_plan(plan)
+
+        self.assertEqual(1, applied_operations_count)
+        datacatalog_facade.create_entry.assert_called_once()
+        self.assertEqual(2, datacatalog_facade.delete_entry.call_count)
+
+    def test_ingest_metadata_with_tag_writes_max_workers_config_should_succeed(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        datacatalog_facade = self.__datacatalog_facade
+
+        self.__metadata_ingestor.ingest_metadata(entries, {},
+                                                 {'tag_writes_max_workers': 8})
+
+        self.assertEqual(2, datacatalog_facade.upsert_tags.call_count)
+        self.assertEqual(
+            8, datacatalog_facade.upsert_tags.call_args.kwargs['max_workers'])
+
+    def test_ingest_metadata_with_state_store_on_tag_write_failure_should_not_save_state(  # noqa:E501
+            self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        entries[1].entry_id = 'entry_2'
+
+        tag_writes_result = commons.TagWritesResult()
+        tag_writes_result.add_failure(
+            commons.TagWritesResult.CREATE, datacatalog.Tag(),
+            exceptions.PermissionDenied('Permission denied'))
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_tags.return_value = tag_writes_result
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                'state_store': {
+                    'path': os.path.join(temp_dir, 'state.db')
+                },
+                'tag_writes_max_workers': 2
+            }
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+            self.__metadata_ingestor.ingest_metadata(entries, {}, config)
+
+        self.assertEqual(4, datacatalog_facade.upsert_entry.call_count)
+
+    @mock.patch('{}.time.sleep'.format(__INGESTOR_MODULE))
+    def test_ingest_metadata_with_adaptive_concurrency_should_retry_throttled_tag_writes(  # noqa:E501
+            self, mock_sleep):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+        entries[1].entry_id = 'entry_2'
+
+        throttled_result = commons.TagWritesResult()
+        throttled_result.add_failure(
+            commons.TagWritesResult.CREATE, datacatalog.Tag(),
+            exceptions.ResourceExhausted('Quota exceeded'))
+
+        datacatalog_facade = self.__datacatalog_facade
+        datacatalog_facade.upsert_tags.side_effect = [
+            throttled_result,
+            commons.TagWritesResult(),
+            commons.TagWritesResult()
+        ]
+
+        self.__metadata_ingestor.ingest_metadata(entries, {}, {
+            'max_workers': 2,
+            'adaptive_concurrency': True,
+            'tag_writes_max_workers': 4
+        })
+
+        self.assertEqual(3, datacatalog_facade.upsert_tags.call_count)
+        self.assertEqual(
+            1,
+            self.__metadata_ingestor.get_concurrency_stats()
+            ['throttled_count'])
+
+    def test_ingest_metadata_on_throttled_tag_writes_should_raise(self):
+        entries = utils \
+            .Utils.create_assembled_entries_user_defined_types()
+
+        throttled_result = commons.TagWritesResult()
+        throttled_result.add_failure(
+            commons.TagWritesResult.CREATE, datacatalog.Tag(),
+            exceptions.PermissionDenied('Permission denied'))
+        throttled_result.add_failure(
+            commons.TagWritesResult.UPDATE, datacatalog.Tag(),
+            exceptions.ResourceExhausted('Quota exceeded'))
+
+        self.__datacatalog_facade.upsert_tags.return_value = throttled_result
+
+        self.assertRaises(exceptions.ResourceExhausted,
+                          self.__metadata_ingestor.ingest_metadata, entries,
+                          {}, {'tag_writes_max_workers': 4})
+
     def test_ingest_metadata_nonexistent_tag_template_should_succeed(self):
         entries = utils \
             .Utils.create_assembled_entries_user_defined_types()
@@ -0,0 +1,73 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors.commons import ingest
+
+
+class IngestionPlanTestCase(unittest.TestCase):
+
+    def test_add_operation_unknown_operation_should_raise(self):
+        plan = ingest.IngestionPlan()
+
+        self.assertRaises(ValueError, plan.add_operation, 'rename_entry',
+                          'entry_name')
+
+    def test_counts_should_count_each_operation(self):
+        plan = ingest.IngestionPlan()
+        plan.add_operation(plan.CREATE_ENTRY, 'entry_1')
+        plan.add_operation(plan.CREATE_TAG, 'entry_1')
+        plan.add_operation(plan.CREATE_TAG, 'entry_1')
+        plan.add_unchanged_entry()
+
+        counts = plan.counts()
+
+        self.assertEqual(1, counts[plan.CREATE_ENTRY])
+        self.assertEqual(2, counts[plan.CREATE_TAG])
+        self.assertEqual(0, counts[plan.DELETE_ENTRY])
+        self.assertEqual(1, counts['unchanged_entries'])
+        self.assertEqual(3, plan.estimated_rpc_cost())
+
+    def test_from_json_should_read_serialized_plan(self):
+        plan = ingest.IngestionPlan()
+        plan.add_operation(plan.UPDATE_ENTRY,
+                           'entry_name',
+                           entry=datacatalog.Entry(name='entry_name',
+                                                   description='description'),
+                           update_mask=['description'])
+        plan.add_operation(plan.UPDATE_TAG,
+                           'entry_name',
+                           tag=datacatalog.Tag(name='tag_name',
+                                               template='template'),
+                           update_mask=['fields'])
+        plan.add_unchanged_entry()
+
+        plan_json = plan.to_json()
+        read_plan = ingest.IngestionPlan.from_json(plan_json)
+
+        self.assertEqual(2, json.loads(plan_json)['estimated_rpc_cost'])
+        self.assertEqual(list(plan), list(read_plan))
+        self.assertEqual(1, read_plan.unchanged_entries_count)
+
+        update_entry, update_tag = list(read_plan)
+        self.assertEqual('description',
+                         read_plan.get_entry(update_entry).description)
+        self.assertEqual(['description'], update_entry['update_mask'])
+        self.assertEqual('tag_name', read_plan.get_tag(update_tag).name)
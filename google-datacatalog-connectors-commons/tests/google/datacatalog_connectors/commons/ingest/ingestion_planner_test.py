@@ -0,0 +1,193 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import mock
+from google.cloud import datacatalog
+from google.datacatalog_connectors.commons_test import utils
+
+from google.datacatalog_connectors.commons import ingest
+from google.datacatalog_connectors.commons import state
+
+
+class IngestionPlannerTestCase(unittest.TestCase):
+    __COMMONS_PACKAGE = 'google.datacatalog_connectors.commons'
+    __ENTRY_GROUP_NAME = \
+        'projects/project-id/locations/location-id/entryGroups/entry_group_id'
+
+    @mock.patch(
+        '{}.datacatalog_facade.DataCatalogFacade'.format(__COMMONS_PACKAGE))
+    def setUp(self, mock_datacatalog_facade):
+        self.__planner = ingest.IngestionPlanner('project-id', 'location-id',
+                                                 'entry_group_id')
+        # Shortcut for the object assigned to self.__planner.__facade
+        self.__datacatalog_facade = mock_datacatalog_facade.return_value
+
+        self.__entries = utils.Utils \
+            .create_assembled_entries_user_defined_types()
+        # The fake entries share the same id.
+        self.__entries[1].entry_id = 'entry_2'
+
+    def test_capture_snapshot_should_read_entries_and_tags(self):
+        entry = datacatalog.Entry(name='entry_name')
+        tag = self.__create_tag(name='tag_name')
+        self.__datacatalog_facade.list_entries.return_value = [entry]
+        self.__datacatalog_facade.list_tags.return_value = iter([tag])
+
+        snapshot = self.__planner.capture_snapshot()
+
+        self.__datacatalog_facade.list_entries.assert_called_once_with(
+            self.__ENTRY_GROUP_NAME)
+        self.assertEqual(entry, snapshot.get_entry('entry_name'))
+        self.assertEqual([tag], snapshot.get_tags('entry_name'))
+
+    def test_plan_nonexistent_entries_should_create_them(self):
+        plan = self.__planner.plan(self.__entries, state.CatalogSnapshot())
+
+        operations = list(plan)
+        self.assertEqual(2, plan.estimated_rpc_cost())
+        self.assertEqual(plan.CREATE_ENTRY, operations[0]['operation'])
+        self.assertEqual('{}/entries/entry_1'.format(self.__ENTRY_GROUP_NAME),
+                         operations[0]['entry_name'])
+        self.assertEqual('entry_2', operations[1]['entry_id'])
+        self.assertEqual('linked_resource_2',
+                         plan.get_entry(operations[1]).linked_resource)
+
+    def test_plan_unchanged_entries_should_not_write_them(self):
+        snapshot = self.__create_snapshot()
+
+        plan = self.__planner.plan(self.__entries, snapshot)
+
+        self.assertEqual(0, len(plan))
+        self.assertEqual(2, plan.counts()['unchanged_entries'])
+
+    def test_plan_changed_entry_should_update_changed_fields(self):
+        snapshot = self.__create_snapshot()
+        self.__entries[0].entry.description = 'new description'
+
+        plan = self.__planner.plan(self.__entries, snapshot)
+
+        operation = list(plan)[0]
+        self.assertEqual(1, len(plan))
+        self.assertEqual(plan.UPDATE_ENTRY, operation['operation'])
+        self.assertEqual(['description'], operation['update_mask'])
+        self.assertEqual('new description',
+                         plan.get_entry(operation).description)
+        self.assertEqual(1, plan.counts()['unchanged_entries'])
+
+    def test_plan_new_tag_should_create_it(self):
+        snapshot = self.__create_snapshot()
+        tag = self.__create_tag()
+        self.__entries[0].tags = [tag]
+
+        plan = self.__planner.plan(self.__entries, snapshot)
+
+        operation = list(plan)[0]
+        self.assertEqual(plan.CREATE_TAG, operation['operation'])
+        self.assertEqual('test-template', plan.get_tag(operation).template)
+
+    def test_plan_changed_tag_should_update_it(self):
+        persisted_tag = self.__create_tag()
+        persisted_tag.name = 'persisted_tag_name'
+        snapshot = self.__create_snapshot([persisted_tag])
+
+        tag = self.__create_tag('new value')
+        self.__entries[0].tags = [tag]
+
+        plan = self.__planner.plan(self.__entries, snapshot)
+
+        operation = list(plan)[0]
+        self.assertEqual(1, len(plan))
+        self.assertEqual(plan.UPDATE_TAG, operation['operation'])
+        self.assertEqual(['fields'], operation['update_mask'])
+        self.assertEqual('persisted_tag_name', plan.get_tag(operation).name)
+
+    def test_plan_unchanged_tag_should_not_write_it(self):
+        snapshot = self.__create_snapshot([self.__create_tag(name='tag_name')])
+        self.__entries[0].tags = [self.__create_tag(name='tag_name')]
+
+        plan = self.__planner.plan(self.__entries, snapshot)
+
+        self.assertEqual(0, len(plan))
+
+    def test_plan_with_delete_tags_config_should_delete_obsolete_tags(self):
+        snapshot = self.__create_snapshot([self.__create_tag(name='tag_name')])
+
+        plan = self.__planner.plan(
+            self.__entries, snapshot,
+            {'delete_tags': {
+                'managed_tag_template': 'test-template'
+            }})
+
+        operations = list(plan)
+        self.assertEqual(1, len(operations))
+        self.assertEqual(plan.DELETE_TAG, operations[0]['operation'])
+        self.assertEqual('tag_name', plan.get_tag(operations[0]).name)
+
+    def test_plan_with_delete_obsolete_entries_config_should_delete_them(self):
+        snapshot = self.__create_snapshot()
+        obsolete_entry_name = '{}/entries/entry_3'.format(
+            self.__ENTRY_GROUP_NAME)
+        snapshot.add(datacatalog.Entry(name=obsolete_entry_name))
+
+        plan = self.__planner.plan(self.__entries, snapshot,
+                                   {'delete_obsolete_entries': True})
+
+        self.assertEqual([{
+            'operation': plan.DELETE_ENTRY,
+            'entry_name': obsolete_entry_name
+        }], list(plan))
+
+    def test_plan_with_snapshot_file_should_compare_persisted_entries(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'snapshot.bin')
+            with state.CatalogSnapshotWriter(path) as writer:
+                snapshot = self.__create_snapshot()
+                for entry_name in snapshot:
+                    writer.add(snapshot.get_entry(entry_name))
+
+            self.__entries[0].entry.description = 'new description'
+            with state.CatalogSnapshotReader(path) as reader:
+                plan = self.__planner.plan(self.__entries, reader)
+
+        self.assertEqual(1, plan.counts()[plan.UPDATE_ENTRY])
+        self.assertEqual(1, plan.counts()['unchanged_entries'])
+
+    def __create_snapshot(self, first_entry_tags=None):
+        snapshot = state.CatalogSnapshot()
+        for assembled_entry_data in self.__entries:
+            persisted_entry = datacatalog.Entry(assembled_entry_data.entry)
+            persisted_entry.name = '{}/entries/{}'.format(
+                self.__ENTRY_GROUP_NAME, assembled_entry_data.entry_id)
+            tags = first_entry_tags if not len(snapshot) else None
+            snapshot.add(persisted_entry, tags)
+        return snapshot
+
+    @classmethod
+    def __create_tag(cls, value='value', name=None):
+        tag = datacatalog.Tag()
+        tag.template = 'test-template'
+        if name:
+            tag.name = name
+
+        string_field = datacatalog.TagField()
+        string_field.string_value = value
+        tag.fields['string-field'] = string_field
+
+        return tag
@@ -0,0 +1,58 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+import unittest
+
+from google.datacatalog_connectors import commons
+from google.datacatalog_connectors.commons import monitoring
+
+
+class LazyImportsTestCase(unittest.TestCase):
+    __CHECK_MODULES_SCRIPT = '''
+import sys
+import google.datacatalog_connectors.commons
+from google.datacatalog_connectors.commons import monitoring
+print(','.join(module for module in ('google.cloud.datacatalog',
+                                     'google.cloud.monitoring_v3')
+               if module in sys.modules))
+'''
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'requires PEP 562')
+    def test_import_should_not_load_api_client_libraries(self):
+        # Runs in a fresh process, since other tests load the libraries.
+        output = subprocess.check_output(
+            [sys.executable, '-c', self.__CHECK_MODULES_SCRIPT])
+
+        self.assertEqual('', output.decode().strip())
+
+    def test_lazy_attributes_should_be_loaded_on_first_use(self):
+        from google.datacatalog_connectors.commons import datacatalog_facade
+
+        self.assertIs(datacatalog_facade.DataCatalogFacade,
+                      commons.DataCatalogFacade)
+        self.assertIsNotNone(commons.utils.TTLCache)
+        self.assertIsNotNone(monitoring.MetricsProcessor)
+
+    def test_unknown_attribute_should_raise_attribute_error(self):
+        self.assertRaises(AttributeError, getattr, commons, 'UnknownClass')
+        self.assertRaises(AttributeError, getattr, monitoring, 'UnknownClass')
+
+    def test_dir_should_list_lazy_attributes(self):
+        self.assertIn('DataCatalogFacade', dir(commons))
+        self.assertIn('ingest', dir(commons))
+        self.assertIn('MonitoringFacade', dir(monitoring))
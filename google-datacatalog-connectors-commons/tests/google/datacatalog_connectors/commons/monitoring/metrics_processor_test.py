@@ -90,6 +90,45 @@ class MetricsProcessorTestCase(unittest.TestCase):
             0,
             monitoring_facade.write_metadata_payload_bytes_metric.call_count)
 
+    def test_process_concurrency_metrics_should_succeed(self):
+        monitoring_facade = self.__monitoring_facade
+
+        self.__metrics_processor.process_concurrency_metrics({
+            'window': 8,
+            'throughput': 12.5
+        })
+
+        monitoring_facade.write_concurrency_window_metric.assert_called_once_with(  # noqa: E501
+            8)
+        monitoring_facade.write_entries_throughput_metric.assert_called_once_with(  # noqa: E501
+            12.5)
+
+    def test_disabled_process_concurrency_metrics_should_not_call_facade(
+            self):  # noqa: E125
+        monitoring_facade = self.__monitoring_facade
+
+        self.__metrics_processor_disabled.process_concurrency_metrics({
+            'window': 8,
+            'throughput': 12.5
+        })
+
+        monitoring_facade.write_concurrency_window_metric.assert_not_called()
+
+    def test_process_retry_metrics_should_succeed(self):
+        monitoring_facade = self.__monitoring_facade
+
+        self.__metrics_processor.process_retry_metrics({'retry_count': 3})
+
+        monitoring_facade.write_retry_count_metric.assert_called_once_with(3)
+
+    def test_disabled_process_retry_metrics_should_not_call_facade(self):
+        monitoring_facade = self.__monitoring_facade
+
+        self.__metrics_processor_disabled.process_retry_metrics(
+            {'retry_count': 3})
+
+        monitoring_facade.write_retry_count_metric.assert_not_called()
+
     def test_reset_start_time_should_change_start_time(self):
         metrics_processor = self.__metrics_processor
 
@@ -44,7 +44,7 @@ class MonitoringFacadeTestCase(unittest.TestCase):
         self.__monitoring_facade.create_metrics()
 
         monitoring_client = self.__monitoring_client
-        self.assertEqual(3,
+        self.assertEqual(6,
                          monitoring_client.create_metric_descriptor.call_count)
 
     def test_create_metrics_on_exception_should_not_raise_error(self):
@@ -54,16 +54,16 @@ class MonitoringFacadeTestCase(unittest.TestCase):
 
         self.__monitoring_facade.create_metrics()
 
-        self.assertEqual(3,
+        self.assertEqual(6,
                          monitoring_client.create_metric_descriptor.call_count)
 
     def test_delete_metrics_should_succeed(self):
         self.__monitoring_facade.delete_metrics()
 
         monitoring_client = self.__monitoring_client
-        self.assertEqual(3,
+        self.assertEqual(6,
                          monitoring_client.metric_descriptor_path.call_count)
-        self.assertEqual(3,
+        self.assertEqual(6,
                          monitoring_client.delete_metric_descriptor.call_count)
 
     def test_delete_metrics_on_exception_should_not_raise_error(self):
@@ -73,7 +73,7 @@ class MonitoringFacadeTestCase(unittest.TestCase):
 
         self.__monitoring_facade.delete_metrics()
 
-        self.assertEqual(3,
+        self.assertEqual(6,
                          monitoring_client.delete_metric_descriptor.call_count)
 
     def test_write_metadata_payload_bytes_metric_should_succeed(self):
@@ -94,6 +94,24 @@ class MonitoringFacadeTestCase(unittest.TestCase):
         monitoring_client = self.__monitoring_client
         self.assertEqual(1, monitoring_client.create_time_series.call_count)
 
+    def test_write_concurrency_window_metric_should_succeed(self):
+        self.__monitoring_facade.write_concurrency_window_metric(10)
+
+        monitoring_client = self.__monitoring_client
+        self.assertEqual(1, monitoring_client.create_time_series.call_count)
+
+    def test_write_entries_throughput_metric_should_succeed(self):
+        self.__monitoring_facade.write_entries_throughput_metric(12.5)
+
+        monitoring_client = self.__monitoring_client
+        self.assertEqual(1, monitoring_client.create_time_series.call_count)
+
+    def test_write_retry_count_metric_should_succeed(self):
+        self.__monitoring_facade.write_retry_count_metric(3)
+
+        monitoring_client = self.__monitoring_client
+        self.assertEqual(1, monitoring_client.create_time_series.call_count)
+
     def test_list_metrics_should_succeed(self):
         start_datetime_str = '12/16/19 16:00:00'
         start_datetime = datetime.strptime(start_datetime_str,
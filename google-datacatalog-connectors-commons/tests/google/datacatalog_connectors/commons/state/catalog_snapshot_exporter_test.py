@@ -0,0 +1,51 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import mock
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors.commons import state
+
+
+class CatalogSnapshotExporterTestCase(unittest.TestCase):
+
+    def test_export_should_write_entries_and_tags(self):
+        entry_1 = datacatalog.Entry(name='entry_1')
+        entry_2 = datacatalog.Entry(name='entry_2')
+        tag = datacatalog.Tag(name='tag_1', template='template')
+
+        datacatalog_facade = mock.MagicMock()
+        datacatalog_facade.list_entries.return_value = iter([entry_1, entry_2])
+        datacatalog_facade.list_tags.side_effect = [iter([tag]), iter([])]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'snapshot.bin')
+            exported_entries_count = state.CatalogSnapshotExporter(
+                datacatalog_facade).export('entry_group_name', path)
+
+            with state.CatalogSnapshotReader(path) as reader:
+                self.assertEqual(entry_1, reader.get_entry('entry_1'))
+                self.assertEqual([tag], reader.get_tags('entry_1'))
+                self.assertEqual([], reader.get_tags('entry_2'))
+
+        self.assertEqual(2, exported_entries_count)
+        datacatalog_facade.list_entries.assert_called_once_with(
+            'entry_group_name')
+        self.assertEqual(2, datacatalog_facade.list_tags.call_count)
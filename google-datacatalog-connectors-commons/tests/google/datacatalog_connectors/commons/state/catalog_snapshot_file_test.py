@@ -0,0 +1,117 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors.commons import state
+
+
+class CatalogSnapshotFileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__path = os.path.join(self.__temp_dir.name, 'snapshot.bin')
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    def test_reader_should_read_written_entries_and_tags(self):
+        entry_1 = self.__create_entry('entry_1', 'description')
+        entry_2 = self.__create_entry('entry_2', 'long description ' * 1000)
+        tag_1 = self.__create_tag('template_1')
+        tag_2 = self.__create_tag('template_2')
+
+        with state.CatalogSnapshotWriter(self.__path) as writer:
+            writer.add(entry_1, [tag_1, tag_2])
+            writer.add(entry_2)
+
+        with state.CatalogSnapshotReader(self.__path) as reader:
+            self.assertEqual(2, len(reader))
+            self.assertEqual(['entry_1', 'entry_2'], list(reader))
+            self.assertIn('entry_2', reader)
+            self.assertEqual(entry_2, reader.get_entry('entry_2'))
+            self.assertEqual(entry_1, reader.get_entry('entry_1'))
+            self.assertEqual([tag_1, tag_2], reader.get_tags('entry_1'))
+            self.assertEqual([], reader.get_tags('entry_2'))
+
+    def test_reader_unknown_entry_should_return_none(self):
+        with state.CatalogSnapshotWriter(self.__path):
+            pass
+
+        with state.CatalogSnapshotReader(self.__path) as reader:
+            self.assertEqual(0, len(reader))
+            self.assertIsNone(reader.get_entry('entry_1'))
+            self.assertEqual([], reader.get_tags('entry_1'))
+
+    def test_reader_incomplete_file_should_raise(self):
+        writer = state.CatalogSnapshotWriter(self.__path)
+        writer.add(self.__create_entry('entry_1', 'description'))
+        # Simulates an interrupted export, which does not write the index.
+        writer._CatalogSnapshotWriter__file.close()
+
+        self.assertFalse(os.path.exists(self.__path))
+        self.assertRaises(ValueError, state.CatalogSnapshotReader,
+                          '{}.tmp'.format(self.__path))
+
+    def test_writer_on_error_should_not_write_snapshot(self):
+        with state.CatalogSnapshotWriter(self.__path) as writer:
+            writer.add(self.__create_entry('entry_1', 'description'))
+
+        with self.assertRaises(RuntimeError):
+            with state.CatalogSnapshotWriter(self.__path) as writer:
+                writer.add(self.__create_entry('entry_2', 'description'))
+                raise RuntimeError('Export interrupted')
+        writer.abort()
+
+        self.assertEqual([], [
+            file_name for file_name in os.listdir(self.__temp_dir.name)
+            if file_name.endswith('.tmp')
+        ])
+        # The previous snapshot is kept.
+        with state.CatalogSnapshotReader(self.__path) as reader:
+            self.assertEqual(['entry_1'], list(reader))
+
+    def test_writer_close_twice_should_write_index_once(self):
+        writer = state.CatalogSnapshotWriter(self.__path)
+        writer.close()
+        file_size = os.path.getsize(self.__path)
+        writer.close()
+
+        self.assertEqual(file_size, os.path.getsize(self.__path))
+
+    @classmethod
+    def __create_entry(cls, name, description):
+        entry = datacatalog.Entry()
+        entry.name = name
+        entry.description = description
+        entry.schema.columns.append(
+            datacatalog.ColumnSchema(column='column', type='string'))
+        return entry
+
+    @classmethod
+    def __create_tag(cls, template):
+        tag = datacatalog.Tag()
+        tag.template = template
+
+        string_field = datacatalog.TagField()
+        string_field.string_value = 'test'
+        tag.fields['string-field'] = string_field
+
+        return tag
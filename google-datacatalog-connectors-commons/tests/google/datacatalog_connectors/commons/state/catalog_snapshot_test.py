@@ -0,0 +1,43 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors.commons import state
+
+
+class CatalogSnapshotTestCase(unittest.TestCase):
+
+    def test_add_should_index_entry_and_tags(self):
+        snapshot = state.CatalogSnapshot()
+        entry = datacatalog.Entry(name='entry_name')
+        tag = datacatalog.Tag(template='template')
+
+        snapshot.add(entry, [tag])
+
+        self.assertIn('entry_name', snapshot)
+        self.assertEqual(['entry_name'], list(snapshot))
+        self.assertEqual(1, len(snapshot))
+        self.assertEqual(entry, snapshot.get_entry('entry_name'))
+        self.assertEqual([tag], snapshot.get_tags('entry_name'))
+
+    def test_get_unknown_entry_should_return_none(self):
+        snapshot = state.CatalogSnapshot()
+
+        self.assertIsNone(snapshot.get_entry('entry_name'))
+        self.assertEqual([], snapshot.get_tags('entry_name'))
@@ -0,0 +1,129 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+from google.datacatalog_connectors.commons import state
+
+
+class IngestionCheckpointTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__path = os.path.join(self.__temp_dir.name, 'checkpoint.jsonl')
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    def test_is_completed_unknown_entry_should_return_false(self):
+        checkpoint = state.IngestionCheckpoint(self.__path)
+        checkpoint.close()
+
+        self.assertFalse(checkpoint.is_completed('entry_name', 'fingerprint'))
+
+    def test_record_should_write_full_batches_only(self):
+        checkpoint = state.IngestionCheckpoint(self.__path, batch_size=2)
+        checkpoint.record('entry_1', 'fingerprint_1')
+        checkpoint.record('entry_2', 'fingerprint_2')
+        checkpoint.record('entry_3', 'fingerprint_3')
+
+        self.assertEqual([{
+            'entries': {
+                'entry_1': 'fingerprint_1',
+                'entry_2': 'fingerprint_2'
+            }
+        }], self.__read_lines())
+
+        checkpoint.close()
+
+        self.assertEqual(2, len(self.__read_lines()))
+
+    def test_resume_should_load_recorded_entries(self):
+        checkpoint = state.IngestionCheckpoint(self.__path)
+        checkpoint.record('entry_1', 'fingerprint_1')
+        checkpoint.close()
+
+        checkpoint = state.IngestionCheckpoint(self.__path, resume=True)
+        checkpoint.record('entry_2', 'fingerprint_2')
+        checkpoint.close()
+
+        self.assertTrue(checkpoint.is_completed('entry_1', 'fingerprint_1'))
+        self.assertFalse(checkpoint.is_completed('entry_1', 'fingerprint_2'))
+        self.assertEqual(2, len(self.__read_lines()))
+
+    def test_resume_nonexistent_file_should_start_empty(self):
+        checkpoint = state.IngestionCheckpoint(self.__path, resume=True)
+        checkpoint.close()
+
+        self.assertFalse(checkpoint.is_completed('entry_1', 'fingerprint_1'))
+
+    def test_resume_should_ignore_incomplete_line(self):
+        with open(self.__path, 'w') as checkpoint_file:
+            checkpoint_file.write(
+                json.dumps({'entries': {
+                    'entry_1': 'fingerprint_1'
+                }}) + '\n')
+            checkpoint_file.write('{"entries": {"entry_2": "fing')
+
+        checkpoint = state.IngestionCheckpoint(self.__path, resume=True)
+        checkpoint.close()
+
+        self.assertTrue(checkpoint.is_completed('entry_1', 'fingerprint_1'))
+        self.assertFalse(checkpoint.is_completed('entry_2', 'fingerprint_2'))
+
+    def test_resume_should_discard_incomplete_line(self):
+        with open(self.__path, 'w') as checkpoint_file:
+            checkpoint_file.write(
+                json.dumps({'entries': {
+                    'entry_1': 'fingerprint_1'
+                }}) + '\n')
+            checkpoint_file.write('{"entries": {"entry_2": "fing')
+
+        checkpoint = state.IngestionCheckpoint(self.__path, resume=True)
+        checkpoint.record('entry_3', 'fingerprint_3')
+        checkpoint.close()
+
+        checkpoint = state.IngestionCheckpoint(self.__path, resume=True)
+        checkpoint.close()
+
+        self.assertTrue(checkpoint.is_completed('entry_1', 'fingerprint_1'))
+        self.assertTrue(checkpoint.is_completed('entry_3', 'fingerprint_3'))
+        self.assertEqual(2, len(self.__read_lines()))
+
+    def test_no_resume_should_truncate_file(self):
+        checkpoint = state.IngestionCheckpoint(self.__path)
+        checkpoint.record('entry_1', 'fingerprint_1')
+        checkpoint.close()
+
+        checkpoint = state.IngestionCheckpoint(self.__path)
+        checkpoint.close()
+
+        self.assertFalse(checkpoint.is_completed('entry_1', 'fingerprint_1'))
+        self.assertEqual([], self.__read_lines())
+
+    def test_complete_should_delete_file(self):
+        checkpoint = state.IngestionCheckpoint(self.__path)
+        checkpoint.record('entry_1', 'fingerprint_1')
+        checkpoint.complete()
+
+        self.assertFalse(os.path.exists(self.__path))
+
+    def __read_lines(self):
+        with open(self.__path) as checkpoint_file:
+            return [json.loads(line) for line in checkpoint_file]
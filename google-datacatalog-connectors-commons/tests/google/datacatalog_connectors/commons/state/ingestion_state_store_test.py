@@ -0,0 +1,202 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import mock
+from google.cloud import datacatalog
+
+from google.datacatalog_connectors.commons import state
+
+
+class IngestionStateStoreTestCase(unittest.TestCase):
+    __STATE_PACKAGE = 'google.datacatalog_connectors.commons.state'
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__path = os.path.join(self.__temp_dir.name, 'state.db')
+        self.__state_store = state.IngestionStateStore(self.__path)
+
+    def tearDown(self):
+        self.__state_store.close()
+        self.__temp_dir.cleanup()
+
+    def test_compute_fingerprint_should_be_stable(self):
+        entry = self.__create_entry('description')
+        tag_1 = self.__create_tag('template_1', 'column_1')
+        tag_2 = self.__create_tag('template_2', None)
+
+        fingerprint_1 = state.IngestionStateStore.compute_fingerprint(
+            entry, [tag_1, tag_2])
+        fingerprint_2 = state.IngestionStateStore.compute_fingerprint(
+            self.__create_entry('description'), [tag_2, tag_1])
+
+        self.assertEqual(fingerprint_1, fingerprint_2)
+
+    def test_compute_fingerprint_changed_entry_should_differ(self):
+        fingerprint_1 = state.IngestionStateStore.compute_fingerprint(
+            self.__create_entry('description'))
+        fingerprint_2 = state.IngestionStateStore.compute_fingerprint(
+            self.__create_entry('new description'))
+
+        self.assertNotEqual(fingerprint_1, fingerprint_2)
+
+    def test_compute_fingerprint_changed_tags_should_differ(self):
+        entry = self.__create_entry('description')
+
+        fingerprint_1 = state.IngestionStateStore.compute_fingerprint(
+            entry, [self.__create_tag('template_1', 'column_1')])
+        fingerprint_2 = state.IngestionStateStore.compute_fingerprint(
+            entry, [self.__create_tag('template_1', 'column_2')])
+
+        self.assertNotEqual(fingerprint_1, fingerprint_2)
+
+    def test_is_up_to_date_unknown_entry_should_return_false(self):
+        self.assertFalse(
+            self.__state_store.is_up_to_date('entry_name', 'fingerprint'))
+
+    def test_is_up_to_date_saved_entry_should_return_true(self):
+        self.__state_store.save('entry_name', 'fingerprint')
+
+        self.assertTrue(
+            self.__state_store.is_up_to_date('entry_name', 'fingerprint'))
+
+    def test_is_up_to_date_changed_fingerprint_should_return_false(self):
+        self.__state_store.save('entry_name', 'fingerprint')
+
+        self.assertFalse(
+            self.__state_store.is_up_to_date('entry_name', 'new_fingerprint'))
+
+    @mock.patch('{}.ingestion_state_store.time.time'.format(__STATE_PACKAGE))
+    def test_is_up_to_date_expired_fingerprint_should_return_false(
+            self, mock_time):
+
+        state_store = state.IngestionStateStore(
+            self.__path, full_verification_interval_hours=24)
+
+        mock_time.return_value = 0
+        state_store.save('entry_name', 'fingerprint')
+
+        mock_time.return_value = 23 * 3600
+        self.assertTrue(state_store.is_up_to_date('entry_name', 'fingerprint'))
+
+        mock_time.return_value = 24 * 3600
+        self.assertFalse(state_store.is_up_to_date('entry_name',
+                                                   'fingerprint'))
+
+        state_store.close()
+
+    def test_is_resource_known_saved_resource_should_return_true(self):
+        self.assertFalse(self.__state_store.is_resource_known('resource'))
+
+        self.__state_store.save_resource('resource')
+
+        self.assertTrue(self.__state_store.is_resource_known('resource'))
+
+    def test_delete_resource_should_forget_resource(self):
+        self.__state_store.save_resource('resource')
+        self.__state_store.delete_resource('resource')
+
+        self.assertFalse(self.__state_store.is_resource_known('resource'))
+
+    @mock.patch('{}.ingestion_state_store.time.time'.format(__STATE_PACKAGE))
+    def test_is_resource_known_expired_resource_should_return_false(
+            self, mock_time):
+
+        state_store = state.IngestionStateStore(
+            self.__path, full_verification_interval_hours=24)
+
+        mock_time.return_value = 0
+        state_store.save_resource('resource')
+
+        mock_time.return_value = 24 * 3600
+        self.assertFalse(state_store.is_resource_known('resource'))
+
+        state_store.close()
+
+    def test_delete_should_forget_entry(self):
+        self.__state_store.save('entry_name', 'fingerprint')
+        self.__state_store.delete('entry_name')
+
+        self.assertFalse(
+            self.__state_store.is_up_to_date('entry_name', 'fingerprint'))
+
+    def test_close_should_persist_pending_writes(self):
+        self.__state_store.save('entry_name', 'fingerprint')
+        self.__state_store.close()
+
+        self.__state_store = state.IngestionStateStore(self.__path)
+
+        self.assertTrue(
+            self.__state_store.is_up_to_date('entry_name', 'fingerprint'))
+
+    def test_save_should_commit_writes_in_batches(self):
+        for index in range(150):
+            self.__state_store.save('entry_name_{}'.format(index),
+                                    'fingerprint')
+
+        # A second connection only sees the committed writes.
+        state_store = state.IngestionStateStore(self.__path)
+
+        self.assertTrue(
+            state_store.is_up_to_date('entry_name_99', 'fingerprint'))
+        self.assertFalse(
+            state_store.is_up_to_date('entry_name_100', 'fingerprint'))
+
+        state_store.close()
+
+    def test_delete_should_commit_writes_in_batches(self):
+        for index in range(150):
+            self.__state_store.save('entry_name_{}'.format(index),
+                                    'fingerprint')
+        self.__state_store.close()
+
+        self.__state_store = state.IngestionStateStore(self.__path)
+        for index in range(150):
+            self.__state_store.delete('entry_name_{}'.format(index))
+
+        # A second connection only sees the committed writes.
+        state_store = state.IngestionStateStore(self.__path)
+
+        self.assertFalse(
+            state_store.is_up_to_date('entry_name_99', 'fingerprint'))
+        self.assertTrue(
+            state_store.is_up_to_date('entry_name_100', 'fingerprint'))
+
+        state_store.close()
+
+    @classmethod
+    def __create_entry(cls, description):
+        entry = datacatalog.Entry()
+        entry.user_specified_system = 'test_system'
+        entry.user_specified_type = 'test_type'
+        entry.description = description
+        return entry
+
+    @classmethod
+    def __create_tag(cls, template, column):
+        tag = datacatalog.Tag()
+        tag.template = template
+        if column:
+            tag.column = column
+
+        string_field = datacatalog.TagField()
+        string_field.string_value = 'test'
+        tag.fields['string-field'] = string_field
+
+        return tag
@@ -0,0 +1,53 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from google.datacatalog_connectors.commons import state
+
+
+class KnownResourcesRegistryTestCase(unittest.TestCase):
+
+    def test_shared_should_return_same_registry(self):
+        self.assertIs(state.KnownResourcesRegistry.shared(),
+                      state.KnownResourcesRegistry.shared())
+
+    def test_add_should_record_resource(self):
+        registry = state.KnownResourcesRegistry()
+
+        registry.add('resource')
+
+        self.assertIn('resource', registry)
+        self.assertNotIn('other_resource', registry)
+
+    def test_discard_should_forget_resource(self):
+        registry = state.KnownResourcesRegistry()
+        registry.add('resource')
+
+        registry.discard('resource')
+        registry.discard('unknown_resource')
+
+        self.assertNotIn('resource', registry)
+
+    def test_clear_should_forget_all_resources(self):
+        registry = state.KnownResourcesRegistry()
+        registry.add('resource_1')
+        registry.add('resource_2')
+
+        registry.clear()
+
+        self.assertNotIn('resource_1', registry)
+        self.assertNotIn('resource_2', registry)
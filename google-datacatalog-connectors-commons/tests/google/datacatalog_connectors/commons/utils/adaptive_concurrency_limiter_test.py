@@ -0,0 +1,121 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+from google.datacatalog_connectors.commons import utils
+
+
+class AdaptiveConcurrencyLimiterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.__now = 0
+        self.__limiter = utils.AdaptiveConcurrencyLimiter(
+            10, initial_window=2, clock=lambda: self.__now)
+
+    def test_stable_latency_should_grow_window(self):
+        for _ in range(20):
+            self.__limiter.acquire()
+            self.__limiter.release(0.1)
+
+        self.assertGreater(self.__limiter.window, 2)
+
+    def test_window_should_not_exceed_max_window(self):
+        for _ in range(1000):
+            self.__limiter.acquire()
+            self.__limiter.release(0.1)
+
+        self.assertEqual(10, self.__limiter.window)
+
+    def test_growing_latency_should_stop_window_growth(self):
+        self.__limiter.acquire()
+        self.__limiter.release(0.1)
+        window = self.__limiter.window
+
+        for _ in range(20):
+            self.__limiter.acquire()
+            self.__limiter.release(10)
+
+        self.assertEqual(window, self.__limiter.window)
+
+    def test_throttled_request_should_halve_window(self):
+        limiter = utils.AdaptiveConcurrencyLimiter(10,
+                                                   initial_window=8,
+                                                   clock=lambda: self.__now)
+
+        limiter.acquire()
+        limiter.release(0.1, throttled=True)
+
+        self.assertEqual(4, limiter.window)
+
+    def test_throttled_requests_should_halve_window_once_per_round_trip(
+            self):  # noqa: E125
+        limiter = utils.AdaptiveConcurrencyLimiter(10,
+                                                   initial_window=8,
+                                                   clock=lambda: self.__now)
+        limiter.acquire()
+        limiter.release(1)
+
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(1, throttled=True)
+        window = limiter.window
+
+        self.__now = 2
+        limiter.acquire()
+        limiter.release(1, throttled=True)
+
+        self.assertEqual(window // 2, limiter.window)
+        self.assertEqual(4, limiter.stats()['throttled_count'])
+
+    def test_window_should_not_go_below_min_window(self):
+        for _ in range(10):
+            self.__now += 1
+            self.__limiter.acquire()
+            self.__limiter.release(0.1, throttled=True)
+
+        self.assertEqual(1, self.__limiter.window)
+
+    def test_acquire_should_wait_for_room_in_window(self):
+        self.__limiter.acquire()
+        self.__limiter.acquire()
+
+        acquired = threading.Event()
+
+        def acquire():
+            self.__limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+
+        self.assertFalse(acquired.wait(0.1))
+        self.__limiter.release(0.1)
+        self.assertTrue(acquired.wait(5))
+        thread.join()
+
+    def test_stats_should_return_throughput(self):
+        for _ in range(10):
+            self.__limiter.acquire()
+            self.__limiter.release(0.1)
+        self.__now = 5
+
+        stats = self.__limiter.stats()
+
+        self.assertEqual(10, stats['completed_count'])
+        self.assertEqual(2, stats['throughput'])
+        self.assertEqual(0, stats['in_flight'])
@@ -0,0 +1,248 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from google.cloud import datacatalog
+from google.datacatalog_connectors.commons_test import utils as test_utils
+
+from google.datacatalog_connectors.commons import utils
+
+
+class DataCatalogComparisonHelperTestCase(unittest.TestCase):
+
+    def test_entry_was_updated_same_entry_should_return_false(self):
+        entry = self.__create_entry()
+
+        self.assertFalse(
+            utils.DataCatalogComparisonHelper.entry_was_updated(
+                entry, self.__create_entry()))
+
+    def test_entry_was_updated_new_update_time_should_return_true(self):
+        new_entry = test_utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 33)
+
+        self.assertTrue(
+            utils.DataCatalogComparisonHelper.entry_was_updated(
+                self.__create_entry(), new_entry))
+
+    def test_entry_was_updated_changed_column_should_return_true(self):
+        column = test_utils.Utils.create_column_schema('column_1', 'string',
+                                                       'description')
+        new_entry = self.__create_entry()
+        new_entry.schema.columns.append(column)
+
+        self.assertTrue(
+            utils.DataCatalogComparisonHelper.entry_was_updated(
+                self.__create_entry(), new_entry))
+
+    def test_get_entry_changed_fields_should_return_changed_paths(self):
+        column = test_utils.Utils.create_column_schema('column_1', 'string',
+                                                       'description')
+        new_entry = test_utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'new description',
+            'linked_resource', 11, 33)
+        new_entry.schema.columns.append(column)
+
+        self.assertEqual(
+            ['description', 'schema', 'source_system_timestamps'],
+            utils.DataCatalogComparisonHelper.get_entry_changed_fields(
+                self.__create_entry(), new_entry))
+
+    def test_get_entry_changed_fields_same_entry_should_return_empty(self):
+        self.assertEqual(
+            [],
+            utils.DataCatalogComparisonHelper.get_entry_changed_fields(
+                self.__create_entry(), self.__create_entry()))
+
+    def test_diff_schemas_should_return_column_level_diff(self):
+        current_schema = datacatalog.Schema(columns=[
+            self.__create_column('unchanged', 'string'),
+            self.__create_column('changed', 'string'),
+            self.__create_column('deleted', 'string'),
+        ])
+        new_schema = datacatalog.Schema(columns=[
+            self.__create_column('added', 'string'),
+            self.__create_column('changed', 'int'),
+            self.__create_column('unchanged', 'string'),
+        ])
+
+        diff = utils.DataCatalogComparisonHelper.diff_schemas(
+            current_schema, new_schema)
+
+        self.assertTrue(diff.has_changes)
+        self.assertEqual(['added'], diff.added_columns)
+        self.assertEqual(['changed'], diff.changed_columns)
+        self.assertEqual(['deleted'], diff.deleted_columns)
+        self.assertEqual(['type'], diff.column_diffs[1].changed_fields)
+
+    def test_diff_schemas_should_recurse_into_subcolumns(self):
+        current_column = self.__create_column('parent', 'record')
+        current_column.subcolumns = [
+            self.__create_column('child_1', 'string'),
+            self.__create_column('child_2', 'string')
+        ]
+
+        new_column = self.__create_column('parent', 'record')
+        new_column.subcolumns = [
+            self.__create_column('child_1', 'string', 'new description'),
+            self.__create_column('child_3', 'string')
+        ]
+
+        diff = utils.DataCatalogComparisonHelper.diff_schemas(
+            datacatalog.Schema(columns=[current_column]),
+            datacatalog.Schema(columns=[new_column]))
+
+        self.assertEqual([
+            utils.ColumnDiff('parent.child_1', utils.ColumnDiff.CHANGED,
+                             ['description']),
+            utils.ColumnDiff('parent.child_3', utils.ColumnDiff.ADDED),
+            utils.ColumnDiff('parent.child_2', utils.ColumnDiff.DELETED),
+        ], diff.column_diffs)
+
+    def test_diff_schemas_default_mode_should_not_differ_nor_be_set(self):
+        current_schema = datacatalog.Schema(columns=[
+            self.__create_column('column', 'string', mode='NULLABLE')
+        ])
+        new_schema = datacatalog.Schema(
+            columns=[self.__create_column('column', 'string')])
+
+        diff = utils.DataCatalogComparisonHelper.diff_schemas(
+            current_schema, new_schema)
+
+        self.assertFalse(diff.has_changes)
+        self.assertFalse(new_schema.columns[0].mode)
+
+    def test_diff_schemas_repeated_column_names_should_match_by_order(self):
+        current_schema = datacatalog.Schema(columns=[
+            self.__create_column('column', 'string'),
+            self.__create_column('column', 'int')
+        ])
+        new_schema = datacatalog.Schema(columns=[
+            self.__create_column('column', 'string'),
+            self.__create_column('column', 'string')
+        ])
+
+        diff = utils.DataCatalogComparisonHelper.diff_schemas(
+            current_schema, new_schema)
+
+        self.assertEqual(['column'], diff.changed_columns)
+
+    def test_diff_schemas_wide_reordered_schema_should_match_columns(self):
+        columns = [
+            self.__create_column('column_{}'.format(index), 'string')
+            for index in range(5000)
+        ]
+        current_schema = datacatalog.Schema(columns=columns)
+        new_schema = datacatalog.Schema(columns=list(reversed(columns)))
+        new_schema.columns[0].description = 'new description'
+
+        diff = utils.DataCatalogComparisonHelper.diff_schemas(
+            current_schema, new_schema)
+
+        self.assertEqual(['column_4999'], diff.changed_columns)
+        self.assertFalse(diff.added_columns)
+        self.assertFalse(diff.deleted_columns)
+
+    def test_index_tags_should_ignore_column_case(self):
+        tag = self.__create_tag('template', 'abc')
+        persisted_tag = self.__create_tag('template', 'ABC')
+
+        helper = utils.DataCatalogComparisonHelper
+        persisted_tags_index = helper.index_tags(
+            [self.__create_tag('template', 'def'), persisted_tag])
+
+        self.assertEqual(persisted_tag,
+                         persisted_tags_index.get(helper.get_tag_key(tag)))
+
+    def test_index_tags_no_match_should_return_none(self):
+        tag = self.__create_tag('template', 'abc')
+
+        helper = utils.DataCatalogComparisonHelper
+        persisted_tags_index = helper.index_tags(
+            [self.__create_tag('other-template', 'abc')])
+
+        self.assertIsNone(persisted_tags_index.get(helper.get_tag_key(tag)))
+
+    def test_index_tags_repeated_key_should_keep_first_tag(self):
+        tag_1 = self.__create_tag('template', 'abc')
+        tag_2 = self.__create_tag('template', 'ABC')
+
+        self.assertEqual({('template', 'abc'): tag_1},
+                         utils.DataCatalogComparisonHelper.index_tags(
+                             [tag_1, tag_2]))
+
+    def test_tag_is_obsolete_should_check_managed_templates_only(self):
+        persisted_tag = self.__create_tag('projects/p/template', 'abc')
+
+        helper = utils.DataCatalogComparisonHelper
+        self.assertTrue(helper.tag_is_obsolete(persisted_tag, {}, 'template'))
+        self.assertFalse(
+            helper.tag_is_obsolete(persisted_tag, {}, 'other-template'))
+        self.assertFalse(
+            helper.tag_is_obsolete(
+                persisted_tag,
+                helper.index_tags(
+                    [self.__create_tag('projects/p/template', 'ABC')]),
+                'template'))
+
+    def test_tag_fields_are_equal_missing_field_should_return_false(self):
+        tag_1 = self.__create_tag('template', 'abc')
+        tag_1.fields['string-field'] = datacatalog.TagField(
+            string_value='value')
+
+        self.assertFalse(
+            utils.DataCatalogComparisonHelper.tag_fields_are_equal(
+                tag_1, self.__create_tag('template', 'abc')))
+
+    def test_get_tag_changed_fields_should_return_changed_field_ids(self):
+        tag_1 = self.__create_tag('template', 'abc')
+        tag_1.fields['unchanged-field'] = datacatalog.TagField(
+            string_value='value')
+        tag_1.fields['changed-field'] = datacatalog.TagField(
+            string_value='new value')
+        tag_1.fields['new-field'] = datacatalog.TagField(bool_value=True)
+
+        tag_2 = self.__create_tag('template', 'abc')
+        tag_2.fields['unchanged-field'] = datacatalog.TagField(
+            string_value='value')
+        tag_2.fields['changed-field'] = datacatalog.TagField(
+            string_value='value')
+
+        self.assertEqual(
+            ['changed-field', 'new-field'],
+            sorted(
+                utils.DataCatalogComparisonHelper.get_tag_changed_fields(
+                    tag_1, tag_2)))
+
+    @classmethod
+    def __create_entry(cls):
+        return test_utils.Utils.create_entry_user_defined_type(
+            'type', 'system', 'display_name', 'name', 'description',
+            'linked_resource', 11, 22)
+
+    @classmethod
+    def __create_column(cls, name, column_type, description=None, mode=None):
+        return test_utils.Utils.create_column_schema(name, column_type,
+                                                     description, mode)
+
+    @classmethod
+    def __create_tag(cls, template, column):
+        tag = datacatalog.Tag()
+        tag.template = template
+        tag.column = column
+        return tag
@@ -0,0 +1,98 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import mock
+
+from google.datacatalog_connectors.commons import utils
+from google.datacatalog_connectors.commons.utils import rate_limiter
+
+
+class TokenBucketTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.__now = 0
+        self.__sleep = mock.MagicMock()
+        self.__bucket = rate_limiter.TokenBucket(2,
+                                                 2,
+                                                 clock=lambda: self.__now,
+                                                 sleep=self.__sleep)
+
+    def test_acquire_available_token_should_not_wait(self):
+        self.assertEqual(0, self.__bucket.acquire())
+        self.assertEqual(0, self.__bucket.acquire())
+        self.__sleep.assert_not_called()
+
+    def test_acquire_without_tokens_should_wait_for_refill(self):
+        self.__bucket.acquire()
+        self.__bucket.acquire()
+
+        self.assertEqual(0.5, self.__bucket.acquire())
+        self.assertEqual(1, self.__bucket.acquire())
+        self.assertEqual([mock.call(0.5), mock.call(1)],
+                         self.__sleep.call_args_list)
+
+    def test_acquire_should_refill_tokens_over_time(self):
+        self.__bucket.acquire()
+        self.__bucket.acquire()
+        self.__now = 10
+
+        self.assertEqual(0, self.__bucket.acquire())
+        self.assertEqual(0, self.__bucket.acquire())
+        self.assertEqual(0.5, self.__bucket.acquire())
+
+
+class RateLimiterTestCase(unittest.TestCase):
+
+    def test_acquire_unlimited_budget_should_not_wait(self):
+        limiter = utils.RateLimiter(writes_per_minute=60)
+
+        for _ in range(100):
+            self.assertEqual(0, limiter.acquire(utils.RateLimiter.READ))
+
+    @mock.patch('{}.time.sleep'.format(rate_limiter.__name__))
+    def test_acquire_should_throttle_each_budget_separately(self, mock_sleep):
+        limiter = utils.RateLimiter.from_config({
+            'reads_per_minute': 60,
+            'searches_per_minute': 60
+        })
+
+        self.assertEqual(0, limiter.acquire(utils.RateLimiter.READ))
+        self.assertEqual(0, limiter.acquire(utils.RateLimiter.SEARCH))
+        self.assertGreater(limiter.acquire(utils.RateLimiter.READ), 0)
+        self.assertEqual(1, mock_sleep.call_count)
+
+    @mock.patch('{}.time.sleep'.format(rate_limiter.__name__))
+    def test_acquire_should_be_shared_by_threads(self, mock_sleep):
+        limiter = utils.RateLimiter(writes_per_minute=600)
+
+        threads = [
+            threading.Thread(target=limiter.acquire,
+                             args=(utils.RateLimiter.WRITE,))
+            for _ in range(30)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 10 tokens are available upfront, the other requests wait in line.
+        self.assertEqual(20, mock_sleep.call_count)
+        max_wait_seconds = max(
+            call[0][0] for call in mock_sleep.call_args_list)
+        self.assertTrue(1.5 < max_wait_seconds <= 2)
@@ -0,0 +1,218 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import mock
+from google.api_core import exceptions
+
+from google.datacatalog_connectors.commons import utils
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    __RETRY_POLICY_MODULE = \
+        'google.datacatalog_connectors.commons.utils.retry_policy'
+
+    def setUp(self):
+        self.__now = 0
+        self.__sleep = mock.MagicMock(side_effect=self.__advance_clock)
+        self.__function = mock.MagicMock()
+
+    def test_execute_should_return_function_result(self):
+        self.__function.return_value = 'result'
+
+        result = self.__create_policy().execute('get_entry', self.__function,
+                                                'entry_name')
+
+        self.assertEqual('result', result)
+        self.__function.assert_called_once_with('entry_name')
+        self.__sleep.assert_not_called()
+
+    def test_execute_should_retry_transient_errors(self):
+        self.__function.side_effect = [
+            exceptions.ResourceExhausted('Quota exceeded'),
+            exceptions.ServiceUnavailable('Service unavailable'), 'result'
+        ]
+        policy = self.__create_policy()
+
+        result = policy.execute('get_entry', self.__function)
+
+        self.assertEqual('result', result)
+        self.assertEqual(3, self.__function.call_count)
+        self.assertEqual(2, policy.stats()['retry_count'])
+
+    def test_execute_should_not_retry_terminal_errors(self):
+        self.__function.side_effect = exceptions.FailedPrecondition(
+            'Failed precondition')
+
+        self.assertRaises(exceptions.FailedPrecondition,
+                          self.__create_policy().execute, 'get_entry',
+                          self.__function)
+        self.assertEqual(1, self.__function.call_count)
+
+    def test_execute_should_not_retry_ambiguous_create_errors(self):
+        for error in (exceptions.Aborted('Aborted'),
+                      exceptions.DeadlineExceeded('Deadline exceeded')):
+            self.__function.reset_mock()
+            self.__function.side_effect = error
+
+            self.assertRaises(type(error),
+                              self.__create_policy().execute, 'create_tag',
+                              self.__function)
+            self.assertEqual(1, self.__function.call_count)
+
+    def test_execute_should_retry_unprocessed_create_errors(self):
+        self.__function.side_effect = [
+            exceptions.ResourceExhausted('Quota exceeded'),
+            exceptions.ServiceUnavailable('Service unavailable'), 'result'
+        ]
+
+        result = self.__create_policy().execute('create_entry',
+                                                self.__function)
+
+        self.assertEqual('result', result)
+        self.assertEqual(3, self.__function.call_count)
+
+    def test_execute_retried_delete_of_missing_resource_should_succeed(
+            self):  # noqa: E125
+        for method_name in utils.RetryPolicy.DELETE_METHODS:
+            for error in (exceptions.NotFound('Not found'),
+                          exceptions.PermissionDenied('Permission denied')):
+                self.__function.reset_mock()
+                self.__function.side_effect = [
+                    exceptions.DeadlineExceeded('Deadline exceeded'),
+                    exceptions.ServiceUnavailable('Service unavailable'), error
+                ]
+
+                result = self.__create_policy().execute(
+                    method_name, self.__function)
+
+                self.assertIsNone(result)
+                self.assertEqual(3, self.__function.call_count)
+
+    def test_execute_delete_of_missing_resource_should_raise(self):
+        for method_name in utils.RetryPolicy.DELETE_METHODS:
+            # Not found on the first attempt, or on a retry after an error
+            # returned before the request was processed.
+            for side_effect in ([exceptions.NotFound('Not found')], [
+                    exceptions.ServiceUnavailable('Service unavailable'),
+                    exceptions.NotFound('Not found')
+            ]):
+                self.__function.reset_mock()
+                self.__function.side_effect = side_effect
+
+                self.assertRaises(exceptions.NotFound,
+                                  self.__create_policy().execute, method_name,
+                                  self.__function)
+                self.assertEqual(len(side_effect), self.__function.call_count)
+
+    def test_execute_should_stop_after_max_attempts(self):
+        self.__function.side_effect = exceptions.ServiceUnavailable(
+            'Service unavailable')
+
+        self.assertRaises(exceptions.ServiceUnavailable,
+                          self.__create_policy(max_attempts=3).execute,
+                          'get_entry', self.__function)
+        self.assertEqual(3, self.__function.call_count)
+
+    @mock.patch('{}.random.uniform'.format(__RETRY_POLICY_MODULE))
+    def test_execute_should_use_capped_exponential_backoff_with_jitter(
+            self, mock_uniform):  # noqa: E125
+
+        mock_uniform.side_effect = lambda low, high: high
+        self.__function.side_effect = exceptions.ServiceUnavailable(
+            'Service unavailable')
+
+        policy = self.__create_policy(max_attempts=6,
+                                      initial_backoff_seconds=1,
+                                      max_backoff_seconds=4,
+                                      deadline_seconds=None)
+        self.assertRaises(exceptions.ServiceUnavailable, policy.execute,
+                          'get_entry', self.__function)
+
+        self.assertEqual([
+            mock.call(0, 1),
+            mock.call(0, 2),
+            mock.call(0, 4),
+            mock.call(0, 4),
+            mock.call(0, 4)
+        ], mock_uniform.call_args_list)
+
+    @mock.patch('{}.random.uniform'.format(__RETRY_POLICY_MODULE))
+    def test_execute_should_respect_method_deadline(self, mock_uniform):
+        mock_uniform.side_effect = lambda low, high: high
+        self.__function.side_effect = exceptions.DeadlineExceeded(
+            'Deadline exceeded')
+
+        policy = self.__create_policy(
+            max_attempts=10,
+            initial_backoff_seconds=1,
+            deadline_seconds=100,
+            method_deadlines_seconds={'search_catalog': 5})
+        self.assertRaises(exceptions.DeadlineExceeded, policy.execute,
+                          'search_catalog', self.__function)
+
+        # Waits 1 and 2 seconds, the next 4 seconds wait exceeds 5 seconds.
+        self.assertEqual(3, self.__function.call_count)
+
+    def test_execute_should_stop_retrying_when_budget_is_exhausted(self):
+        self.__function.side_effect = exceptions.ServiceUnavailable(
+            'Service unavailable')
+        policy = self.__create_policy(max_attempts=3,
+                                      retry_budget_ratio=0,
+                                      min_retry_budget=3)
+
+        for _ in range(3):
+            self.assertRaises(exceptions.ServiceUnavailable, policy.execute,
+                              'get_entry', self.__function)
+
+        stats = policy.stats()
+        self.assertEqual(3, stats['retry_count'])
+        self.assertEqual(2, stats['retry_budget_exhausted_count'])
+        self.assertEqual(6, self.__function.call_count)
+
+    def test_execute_should_refill_budget_with_requests(self):
+        policy = self.__create_policy(retry_budget_ratio=0.5,
+                                      min_retry_budget=2)
+        self.__function.side_effect = [
+            exceptions.ServiceUnavailable('Service unavailable'), 'result',
+            exceptions.ServiceUnavailable('Service unavailable'), 'result'
+        ]
+
+        policy.execute('get_entry', self.__function)
+        policy.execute('get_entry', self.__function)
+
+        # The budget is full on the first request: 2 - 1 + 0.5 - 1.
+        self.assertEqual(0.5, policy.stats()['retry_budget'])
+
+    def test_from_config_should_create_policy(self):
+        policy = utils.RetryPolicy.from_config({'max_attempts': 2})
+        self.__function.side_effect = exceptions.ServiceUnavailable(
+            'Service unavailable')
+
+        with mock.patch('{}.time.sleep'.format(self.__RETRY_POLICY_MODULE)):
+            self.assertRaises(exceptions.ServiceUnavailable, policy.execute,
+                              'get_entry', self.__function)
+
+        self.assertEqual(2, self.__function.call_count)
+
+    def __create_policy(self, **kwargs):
+        return utils.RetryPolicy(clock=lambda: self.__now,
+                                 sleep=self.__sleep,
+                                 **kwargs)
+
+    def __advance_clock(self, seconds):
+        self.__now += seconds
@@ -0,0 +1,46 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from google.datacatalog_connectors.commons import utils
+
+
+class SchemaDiffTestCase(unittest.TestCase):
+
+    def test_empty_diff_should_have_no_changes(self):
+        diff = utils.SchemaDiff()
+
+        self.assertFalse(diff.has_changes)
+        self.assertEqual([], diff.added_columns)
+
+    def test_diff_should_group_columns_by_change_type(self):
+        diff = utils.SchemaDiff([
+            utils.ColumnDiff('a', utils.ColumnDiff.ADDED),
+            utils.ColumnDiff('b', utils.ColumnDiff.CHANGED, ['type']),
+            utils.ColumnDiff('c.d', utils.ColumnDiff.DELETED),
+            utils.ColumnDiff('e', utils.ColumnDiff.ADDED),
+        ])
+
+        self.assertTrue(diff.has_changes)
+        self.assertEqual(['a', 'e'], diff.added_columns)
+        self.assertEqual(['b'], diff.changed_columns)
+        self.assertEqual(['c.d'], diff.deleted_columns)
+
+    def test_column_diff_repr_should_show_values(self):
+        self.assertEqual(
+            "ColumnDiff('b', 'changed', ['type'])",
+            repr(utils.ColumnDiff('b', utils.ColumnDiff.CHANGED, ['type'])))
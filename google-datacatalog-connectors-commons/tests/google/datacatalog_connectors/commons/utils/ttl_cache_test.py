@@ -0,0 +1,97 @@
+#!/usr/bin/python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from google.datacatalog_connectors.commons import utils
+
+
+class TTLCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.__now = 0
+        self.__cache = utils.TTLCache(max_size=2,
+                                      ttl_seconds=10,
+                                      timer=lambda: self.__now)
+
+    def test_get_should_return_cached_value(self):
+        self.__cache.put('key', 'value')
+
+        self.assertEqual('value', self.__cache.get('key'))
+        self.assertEqual(1, self.__cache.hits)
+        self.assertEqual(0, self.__cache.misses)
+
+    def test_get_missing_key_should_return_default(self):
+        self.assertEqual('default', self.__cache.get('key', 'default'))
+        self.assertEqual(0, self.__cache.hits)
+        self.assertEqual(1, self.__cache.misses)
+
+    def test_get_expired_value_should_return_default(self):
+        self.__cache.put('key', 'value')
+        self.__now = 10
+
+        self.assertIsNone(self.__cache.get('key'))
+        self.assertEqual(1, self.__cache.misses)
+        self.assertEqual(0, len(self.__cache))
+
+    def test_put_should_evict_least_recently_used_value(self):
+        self.__cache.put('key_1', 'value_1')
+        self.__cache.put('key_2', 'value_2')
+        self.__cache.get('key_1')
+        self.__cache.put('key_3', 'value_3')
+
+        self.assertEqual(2, len(self.__cache))
+        self.assertEqual('value_1', self.__cache.get('key_1'))
+        self.assertIsNone(self.__cache.get('key_2'))
+        self.assertEqual('value_3', self.__cache.get('key_3'))
+
+    def test_invalidate_should_remove_given_key(self):
+        self.__cache.put('key_1', 'value_1')
+        self.__cache.put('key_2', 'value_2')
+
+        self.__cache.invalidate('key_1')
+
+        self.assertIsNone(self.__cache.get('key_1'))
+        self.assertEqual('value_2', self.__cache.get('key_2'))
+
+    def test_invalidate_without_key_should_remove_all_values(self):
+        self.__cache.put('key_1', 'value_1')
+        self.__cache.put('key_2', 'value_2')
+
+        self.__cache.invalidate()
+
+        self.assertEqual(0, len(self.__cache))
+
+    def test_put_after_invalidate_should_skip_stale_value(self):
+        generation = self.__cache.generation
+        self.__cache.invalidate('other_key')
+
+        self.__cache.put('key', 'stale_value', generation)
+        self.assertIsNone(self.__cache.get('key'))
+
+        self.__cache.put('key', 'value', self.__cache.generation)
+        self.assertEqual('value', self.__cache.get('key'))
+
+    def test_stats_should_return_counters(self):
+        self.__cache.put('key', 'value')
+        self.__cache.get('key')
+        self.__cache.get('missing_key')
+
+        self.assertEqual({
+            'hits': 1,
+            'misses': 1,
+            'size': 1
+        }, self.__cache.stats())
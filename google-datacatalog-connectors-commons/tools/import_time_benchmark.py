@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+#
+# Copyright 2021 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures how long the commons package takes to import.
+
+Each scenario runs in fresh Python processes, so nothing is cached in
+sys.modules, and the median of the runs is printed as JSON. The eager
+scenario imports the API client libraries upfront, as the package did
+before its imports became lazy.
+
+Usage: python tools/import_time_benchmark.py [--runs 10]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_SCENARIOS = {
+    'import_commons':
+        'import google.datacatalog_connectors.commons',
+    'create_facade':
+        'from google.datacatalog_connectors import commons\n'
+        'commons.DataCatalogFacade("project-id")',
+    'import_prepare':
+        'from google.datacatalog_connectors.commons import prepare',
+    'import_commons_eager':
+        'import google.datacatalog_connectors.commons\n'
+        'import google.cloud.datacatalog\n'
+        'import google.cloud.monitoring_v3',
+}
+
+_TIMED_SCRIPT = '''
+import time
+started_at = time.perf_counter()
+{}
+print(time.perf_counter() - started_at)
+'''
+
+
+def measure(statement, runs):
+    """Runs a statement in fresh processes.
+
+    :param statement: The Python code to measure.
+    :param runs: How many processes to run.
+    :return: The median duration in milliseconds.
+    """
+    durations = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, '-c',
+             _TIMED_SCRIPT.format(statement)])
+        durations.append(float(output) * 1000)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs',
+                        type=int,
+                        default=10,
+                        help='processes per scenario')
+    args = parser.parse_args()
+
+    results = {
+        name: round(measure(statement, args.runs), 1)
+        for name, statement in _SCENARIOS.items()
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()